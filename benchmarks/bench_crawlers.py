@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+크롤러 end-to-end 처리량 벤치마크 (로컬 stand-in 서버, 외부 접속 없음)
+------------------------------------------------
+- standin_server 가 out_sample 기반 픽스처를 지연 · 오류 주입과 함께 응답
+- 각 크롤러를 base URL override 로 서버에 연결해 실제 수집 함수 그대로 실행
+  · naver      : 목록 스트리밍 수집(list) → 기사 본문(articles)   (NAVER_BASE_URL / NAVER_ARTICLE_BASE_URL)
+  · riseetf    : ETF 목록(list) → 구성내역(holdings)                (RISE_BASE_URL)
+  · bigfinance : 로그인 → header+companies(meta) → chart 전체(charts) (BASE_URL)
+- 동시성 설정마다 구간별 req/s · 지연 p50/p90/p99 · 오류/재시도 · 행 수 (perf.StageMetrics 로 측정)
+- 산출물은 임시 폴더에만 기록, 기사 캐시 · chart JSON 내보내기 · 공용 속도 제한은 끔
+  (--rate-limit 지정 시 임시 파일의 HostRateLimiter 사용)
+ex) python benchmarks/bench_crawlers.py --concurrency 1,4,8 --latency 0.03
+    python benchmarks/bench_crawlers.py --stages naver --error-rate 0.05 --jitter 0.05
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from benchmarks.standin_server import StandInServer
+
+STAGES = ("naver", "riseetf", "bigfinance")
+DATE = "20251110"
+
+
+def configure_env(server: StandInServer, tmp: Path, rate_limit: bool):
+    """파이프라인 모듈 import 전에 호출 (모듈 상수가 import 시점에 환경변수를 읽음)"""
+    os.environ.update({
+        "NAVER_BASE_URL": server.base_url, "NAVER_ARTICLE_BASE_URL": server.base_url,
+        "RISE_BASE_URL": server.base_url,
+        "BASE_URL": server.base_url, "USERNAME": server.bigfinance.username,
+        "PASSWORD": server.bigfinance.password, "BIGFINANCE_LOGIN": "requests",
+        "SESSION_CACHE_PATH": str(tmp / "cache" / "bigfinance_session.json"),
+        "CHART_STORE_PATH": str(tmp / "chart_store.sqlite"), "CHART_EXPORT": "false",
+        "ARTICLE_CACHE": "false", "OUTPUT_FORMAT": "csv", "METRICS_DIR": str(tmp / "metrics"),
+        "RATE_LIMIT": "true" if rate_limit else "false",
+        "RATE_LIMIT_PATH": str(tmp / "rate_limit.sqlite"),
+    })
+
+
+# =====================================================
+# 크롤러별 실행 (동시성 c)
+# =====================================================
+def bench_naver(c: int, tmp: Path, args):
+    from pipelines.bigrise import naver_news as nv
+    from pipelines.common.http_client import HttpClient
+    from pipelines.common.perf import StageMetrics
+
+    nv.NAVER_RATE = args.naver_rate
+    nv.CLIENT = HttpClient(pool_size=c, headers=nv.HEADERS, rate=nv.NAVER_RATE)
+    nv.NAVER_CONCURRENCY = nv.LIST_WORKERS = nv.ARTICLE_WORKERS = c
+    engine = nv.make_engine() if args.naver_engine == "async" else None
+
+    perf = StageMetrics("naver", DATE, client=nv.CLIENT, parse=nv.PARSE_TIMER)
+    with perf.phase("list") as p:
+        rows = nv.stream_news_rows(DATE, list(nv.SECTION3_MAP), engine=engine)
+        rows = list({(r["url"], r["title"]): r for r in rows}.values())
+        p["rows"] = len(rows)
+    with perf.phase("articles") as p:
+        nv.fetch_contents(rows, engine=engine)
+        p["rows"] = sum(1 for r in rows if r["contents"])
+    return perf
+
+
+def bench_riseetf(c: int, tmp: Path, args):
+    from pipelines.bigrise import riseetf as rf
+    from pipelines.common.http_client import HttpClient
+    from pipelines.common.perf import StageMetrics
+    from pipelines.common.storage import count_rows
+
+    rf.CLIENT = HttpClient(pool_size=c, headers=rf.HEADERS)
+    rf.OUT_DIR = tmp / "riseETF"
+    rf.OUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    perf = StageMetrics("riseetf", DATE, client=rf.CLIENT, parse=rf.PARSE_TIMER)
+    with perf.phase("list") as p:
+        csv_path = rf.scrape_rise_finder(DATE)
+        p["rows"] = count_rows(csv_path)
+    with perf.phase("holdings") as p:
+        enriched = rf.enrich_with_holdings_threaded(csv_path, max_workers=c)
+        p["rows"] = count_rows(rf.flatten_holdings(enriched))
+    return perf
+
+
+def bench_bigfinance(c: int, tmp: Path, args):
+    from pipelines.bigrise import bigfinance as bf
+    from pipelines.common.perf import StageMetrics
+    from pipelines.common.storage import count_rows
+
+    # 산출물 경로를 임시 폴더로 (chart_rel_path 는 BASE_DIR 기준 상대경로)
+    bf.BASE_DIR = tmp
+    bf.OUT_DIR = tmp / "out" / "bigfinance"
+    bf.CHART_META_DIR = bf.OUT_DIR / "chart"
+    bf.CHART_INDEX_FILE = bf.CHART_META_DIR / "chart_index.csv"
+    bf.CHART_JOURNAL_FILE = bf.CHART_META_DIR / "chart_index.journal.jsonl"
+    bf.CHART_META_DIR.mkdir(parents=True, exist_ok=True)
+    bf.META_WORKERS = bf.CHART_WORKERS = c
+    if bf.SESSION_CACHE_PATH.exists():
+        bf.SESSION_CACHE_PATH.unlink()      # 매 설정마다 requests 로그인부터
+
+    perf = StageMetrics("bigfinance", DATE, parse=bf.PARSE_TIMER)
+    with perf.phase("login"):
+        sess, checked = bf.login_session()
+    perf.client = sess
+    csv_file = bf.OUT_DIR / f"industry_categories_{DATE}.csv"
+    out_file = bf.OUT_DIR / f"industry_categories_{DATE}_with_meta_companies.csv"
+    with perf.phase("meta") as p:
+        bf.save_to_csv(bf.flatten_categories(checked), csv_file)
+        bf.enrich_with_meta(sess, csv_file, out_file, bf.OUT_DIR / f"industry_companies_{DATE}.csv")
+        p["rows"] = count_rows(out_file)
+    with perf.phase("charts") as p:
+        p["rows"] = bf.download_all_charts(sess, out_file, max_workers=c, sync_mode="full")
+    sess.close()
+    return perf
+
+
+BENCHES = {"naver": bench_naver, "riseetf": bench_riseetf, "bigfinance": bench_bigfinance}
+
+
+# =====================================================
+# 출력
+# =====================================================
+def print_header():
+    print(f"| {'stage':<10} | {'phase':<8} | {'conc':>4} | {'rows':>5} | {'reqs':>5} | {'wall(s)':>7} | "
+          f"{'req/s':>7} | {'p50(ms)':>7} | {'p90(ms)':>7} | {'p99(ms)':>7} | {'err':>4} | {'retry':>5} |")
+    print("| " + " | ".join("-" * w for w in (10, 8, 4, 5, 5, 7, 7, 7, 7, 7, 4, 5)) + " |")
+
+
+def print_rows(stage: str, c: int, perf):
+    def ms(v):
+        return f"{v * 1000:.1f}" if v is not None else "-"
+
+    for p in perf.phases:
+        http = p.get("http") or {}
+        reqs = http.get("requests", 0)
+        rps = reqs / p["wall"] if p["wall"] else 0.0
+        print(f"| {stage:<10} | {p['phase']:<8} | {c:>4} | {p.get('rows', '-')!s:>5} | {reqs:>5} | "
+              f"{p['wall']:>7.2f} | {rps:>7.1f} | {ms(http.get('latency_p50')):>7} | "
+              f"{ms(http.get('latency_p90')):>7} | {ms(http.get('latency_p99')):>7} | "
+              f"{http.get('errors', 0):>4} | {http.get('retries', 0):>5} |")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--stages", default=",".join(STAGES), help="naver,riseetf,bigfinance 중 선택")
+    ap.add_argument("--concurrency", default="1,4,8", help="동시성 설정 목록 (쉼표 구분)")
+    ap.add_argument("--latency", type=float, default=0.03, help="서버 기본 응답 지연(초)")
+    ap.add_argument("--jitter", type=float, default=0.0, help="추가 지연 0~jitter 초 (균등분포)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="오류 응답 확률")
+    ap.add_argument("--error-status", type=int, default=503)
+    ap.add_argument("--bf-subs", type=int, default=60, help="BigFinance 모의 서브 카테고리 수")
+    ap.add_argument("--naver-engine", choices=["async", "threaded"], default="async")
+    ap.add_argument("--naver-rate", type=float, default=0,
+                    help="async 엔진 초당 요청 상한 (0=무제한, 운영 기본 NAVER_RATE=5)")
+    ap.add_argument("--rate-limit", action="store_true", help="공용 HostRateLimiter 사용 (임시 파일)")
+    args = ap.parse_args()
+
+    stages = [s for s in args.stages.split(",") if s]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        ap.error(f"알 수 없는 stage: {', '.join(sorted(unknown))}")
+    levels = [int(c) for c in args.concurrency.split(",")]
+
+    server = StandInServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                           error_status=args.error_status, bf_subs=args.bf_subs).start()
+    tmp = Path(tempfile.mkdtemp())
+    configure_env(server, tmp, args.rate_limit)
+
+    print(f"stand-in {server.base_url} latency={args.latency}s jitter={args.jitter}s "
+          f"error_rate={args.error_rate} ({args.error_status}) "
+          f"naver_engine={args.naver_engine} naver_rate={args.naver_rate or '∞'} "
+          f"rate_limit={'on' if args.rate_limit else 'off'}")
+    print_header()
+    t0 = time.perf_counter()
+    for stage in stages:
+        for c in levels:
+            server.reset_stats()
+            perf = BENCHES[stage](c, tmp, args)
+            print_rows(stage, c, perf)
+            if server.stats.get("injected_errors"):
+                print(f"|   └ 서버 주입 오류 {server.stats['injected_errors']}건 "
+                      f"(요청 {sum(v for k, v in server.stats.items() if k != 'injected_errors')}건)")
+    print(f"total {time.perf_counter() - t0:.1f}s")
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ETF × 종목 비중 행렬 질의 벤치마크 (합성 데이터, 외부 접속 없음)
+------------------------------------------------
+- out_sample RISE 구성내역을 1× / 10× / 30× 로 늘린 합성 데이터 (bench_matching.scale_holdings)
+- 같은 질의를 두 방식으로 계산해 소요시간(best of N)과 결과 일치 여부 비교
+  · pandas : 문자열 컬럼 groupby · self-merge (기존 ad-hoc 분석 방식)
+  · sparse : holdings_matrix.HoldingsMatrix (CSR 행렬 연산)
+- 질의: exposure(종목별 합산) · overlap cosine / weighted (ETF 전 쌍) · common(두 ETF 공통 보유 상위 10,
+  음수 비중 ETF 가 낀 쌍은 공통 보유종목 전체)
+- build: flatten DataFrame → 행렬 생성 / load: 저장한 .npz 로드 (재사용 경로)
+ex) python benchmarks/bench_holdings_matrix.py --scales 1,10,30 --repeat 3
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from benchmarks.bench_matching import scale_holdings
+from benchmarks.synthetic import load_rise_sample
+from pipelines.bigrise.holdings_matrix import HoldingsMatrix, to_number
+
+
+# =====================================================
+# pandas 기준 구현
+# =====================================================
+def long_frame(df: pd.DataFrame) -> pd.DataFrame:
+    out = pd.DataFrame({"name": df["name"].astype(str), "item_code": df["item_code"].astype(str),
+                        "ratio": to_number(df["ratio"]), "value": to_number(df["value"])})
+    return out[out["item_code"] != ""]
+
+
+def pd_exposure(df: pd.DataFrame) -> pd.DataFrame:
+    w = df[df["ratio"].notna() & (df["ratio"] != 0)]
+    g = w.groupby("item_code")
+    out = pd.DataFrame({"n_etfs": g["name"].nunique(), "weight_sum": g["ratio"].sum()})
+    out["value_sum"] = df.groupby("item_code")["value"].sum(min_count=1).reindex(out.index).fillna(0)
+    return out.sort_index()
+
+
+def pd_pairs(df: pd.DataFrame) -> pd.DataFrame:
+    w = df[df["ratio"].notna() & (df["ratio"] != 0)].groupby(["name", "item_code"], as_index=False)["ratio"].sum()
+    return w.merge(w, on="item_code", suffixes=("_a", "_b"))
+
+
+def pd_weighted(df: pd.DataFrame) -> pd.Series:
+    p = pd_pairs(df)
+    p["m"] = np.minimum(p["ratio_a"], p["ratio_b"])
+    return p.groupby(["name_a", "name_b"])["m"].sum()
+
+
+def pd_cosine(df: pd.DataFrame) -> pd.Series:
+    p = pd_pairs(df)
+    dot = (p["ratio_a"] * p["ratio_b"]).groupby([p["name_a"], p["name_b"]]).sum()
+    w = df[df["ratio"].notna()].groupby(["name", "item_code"])["ratio"].sum()
+    norm = np.sqrt((w ** 2).groupby(level="name").sum())
+    a, b = dot.index.get_level_values(0), dot.index.get_level_values(1)
+    return dot / (norm.reindex(a).to_numpy() * norm.reindex(b).to_numpy())
+
+
+def pd_common(df: pd.DataFrame, a: str, b: str, n: int = 10) -> pd.DataFrame:
+    w = df[df["ratio"].notna() & (df["ratio"] != 0)].groupby(["name", "item_code"], as_index=False)["ratio"].sum()
+    m = w[w["name"] == a].merge(w[w["name"] == b], on="item_code", suffixes=("_a", "_b"))
+    m["overlap"] = np.minimum(m["ratio_a"], m["ratio_b"])
+    return m.sort_values(["overlap", "item_code"], ascending=[False, True]).head(n)
+
+
+# =====================================================
+# 비교
+# =====================================================
+def pairs_series(hm: HoldingsMatrix, method: str) -> pd.Series:
+    m = hm.overlap(method).tocoo()
+    keep = m.data != 0
+    idx = pd.MultiIndex.from_arrays([hm.etfs[m.row[keep]], hm.etfs[m.col[keep]]], names=["name_a", "name_b"])
+    return pd.Series(m.data[keep], index=idx).sort_index()
+
+
+def same_series(a: pd.Series, b: pd.Series) -> bool:
+    """쌍 합집합 기준 비교 (음수 비중이 상쇄된 쌍은 합산 순서에 따라 0 또는 1e-16 수준)"""
+    idx = a.index.union(b.index)
+    return np.allclose(a.reindex(idx, fill_value=0).to_numpy(), b.reindex(idx, fill_value=0).to_numpy())
+
+
+def same_common(a: pd.DataFrame, b: pd.DataFrame) -> bool:
+    return (list(a["item_code"]) == list(b["item_code"])
+            and all(np.allclose(a[x], b[y]) for x, y in (("ratio_a", "weight_a"), ("ratio_b", "weight_b"),
+                                                           ("overlap", "overlap"))))
+
+
+def best(fn, repeat: int):
+    times, out = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times) * 1000, out
+
+
+def run_scale(raw: pd.DataFrame, scale: int, repeat: int, tmp: Path):
+    df = long_frame(raw)
+    build_ms, hm = best(lambda: HoldingsMatrix.from_frame(raw), repeat)
+    path = hm.save(tmp / f"matrix_{scale}.npz")
+    load_ms, _ = best(lambda: HoldingsMatrix.load(path), repeat)
+    # common 비교 대상: 가장 많은 ETF 가 담은 종목의 보유 ETF 중 두 개
+    code = pd_exposure(df)["n_etfs"].idxmax()
+    holders = sorted(df.loc[df["item_code"] == code, "name"].unique())
+    etf_a, etf_b = holders[:2]
+    # + 음수 비중(선물 매도 · 콜옵션 매도 등)을 담은 ETF 와 위 보유 ETF 한 개 (한쪽에만 있는 음수 종목이 빠지는지)
+    neg_etf = df.loc[df["ratio"].idxmin(), "name"] if (df["ratio"] < 0).any() else None
+    neg_pair = (neg_etf, next(e for e in holders if e != neg_etf)) if neg_etf else None
+
+    rows = [("build", build_ms, None, None), ("load", load_ms, None, None)]
+
+    t_pd, e_pd = best(lambda: pd_exposure(df), repeat)
+    t_sp, e_sp = best(lambda: hm.exposure(), repeat)
+    e_sp = e_sp.set_index("item_code")[["n_etfs", "weight_sum", "value_sum"]]
+    e_sp = e_sp[e_sp["n_etfs"] > 0].sort_index()
+    ok = e_pd.index.equals(e_sp.index) and all(np.allclose(e_pd[c], e_sp[c]) for c in e_pd.columns)
+    rows.append(("exposure", t_pd, t_sp, ok))
+
+    for method, fn in (("cosine", pd_cosine), ("weighted", pd_weighted)):
+        t_pd, s_pd = best(lambda: fn(df), repeat)
+        t_sp, _ = best(lambda: hm.overlap(method), repeat)
+        rows.append((f"overlap {method}", t_pd, t_sp, same_series(s_pd, pairs_series(hm, method))))
+
+    t_pd, c_pd = best(lambda: pd_common(df, etf_a, etf_b), repeat)
+    t_sp, c_sp = best(lambda: hm.common(etf_a, etf_b), repeat)
+    rows.append(("common top10", t_pd, t_sp, same_common(c_pd, c_sp)))
+    if neg_pair:
+        n = len(hm.codes)      # 상위 n 이 아니라 공통 보유종목 전체 비교
+        t_pd, c_pd = best(lambda: pd_common(df, *neg_pair, n=n), repeat)
+        t_sp, c_sp = best(lambda: hm.common(*neg_pair, n=n), repeat)
+        rows.append(("common neg all", t_pd, t_sp, same_common(c_pd, c_sp)))
+    return hm, rows
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--scales", default="1,10", help="구성내역 배수 목록 (쉼표 구분)")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    sample = load_rise_sample()
+    tmp = Path(tempfile.mkdtemp())
+    print(f"| {'scale':>5} | {'etfs':>5} | {'stocks':>6} | {'nnz':>7} | {'query':<16} | {'pandas(ms)':>10} | "
+          f"{'sparse(ms)':>10} | {'speedup':>7} | {'result':<6} |")
+    print("| " + " | ".join("-" * w for w in (5, 5, 6, 7, 16, 10, 10, 7, 6)) + " |")
+    for scale in [int(s) for s in args.scales.split(",")]:
+        raw = scale_holdings(sample, scale).astype(str)
+        hm, rows = run_scale(raw, scale, args.repeat, tmp)
+        for query, t_pd, t_sp, ok in rows:
+            head = f"| {scale:>5} | {len(hm.etfs):>5} | {len(hm.codes):>6} | {hm.weights.nnz:>7} | {query:<16} |"
+            if t_sp is None:
+                print(f"{head} {'-':>10} | {t_pd:>10.1f} | {'-':>7} | {'-':<6} |")
+            else:
+                print(f"{head} {t_pd:>10.1f} | {t_sp:>10.1f} | {t_pd / t_sp:>6.1f}x | "
+                      f"{'same' if ok else 'DIFF':<6} |")
+
+
+if __name__ == "__main__":
+    main()
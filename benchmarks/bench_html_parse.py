@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTML 추출 벤치마크: BeautifulSoup(기존) vs lxml xpath(html_extract)
+------------------------------------------------
+- 대상: naver parse_max_page / fetch_article_text 본문 추출 / riseetf fetch_holdings 구성내역
+- 픽스처: benchmarks/fixtures.py 로 생성한 페이지 (없으면 자동 생성)
+  --naver-list-dir 로 실제 수집한 목록 HTML(예: naver_news.py --dump-html 결과)도 검증 가능
+- 모든 페이지에서 기존 결과와 동일한지 먼저 검증한 뒤 시간 측정
+ex) python benchmarks/bench_html_parse.py --repeat 3
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from benchmarks.fixtures import FIXTURE_DIR, write_fixtures
+from pipelines.common.html_extract import first_node, max_link_number, node_text, parse_html, table_rows
+
+HOLDINGS_TBODY = "//tbody[@data-class='tab3PdfList']"
+
+
+# =====================================================
+# 기존 구현 (BeautifulSoup)
+# =====================================================
+def legacy_max_page(html_text: str) -> int:
+    soup = BeautifulSoup(html_text, "lxml")
+    nums = [int(m.group(1)) for a in soup.find_all("a", href=re.compile(r"page=\d+"))
+            if (m := re.search(r"page=(\d+)", a.get("href", "")))]
+    return max(set(nums)) if nums else 1
+
+
+def legacy_article(text: str) -> str:
+    soup = BeautifulSoup(text, "lxml")
+    dic = soup.select_one("div#dic_area") or soup.find("article")
+    return dic.get_text(" ", strip=True) if dic else ""
+
+
+def legacy_holdings(text: str) -> list:
+    soup = BeautifulSoup(text, "html.parser")
+    tbody = soup.select_one('tbody[data-class="tab3PdfList"]')
+    if not tbody:
+        return []
+    rows = []
+    for tr in tbody.select("tr"):
+        th = tr.select_one("th")
+        tds = tr.select("td")
+        if len(tds) == 5:
+            rows.append([th.get_text(strip=True) if th else ""] + [td.get_text(strip=True) for td in tds])
+    return rows
+
+
+# =====================================================
+# 신규 구현 (html_extract)
+# =====================================================
+def fast_max_page(html_text: str) -> int:
+    return max_link_number(html_text, r"page=(\d+)")
+
+
+def fast_article(text: str) -> str:
+    return node_text(first_node(parse_html(text), "//div[@id='dic_area']", "//article"), sep=" ")
+
+
+def fast_holdings(text: str) -> list:
+    return [[th] + tds for th, tds in table_rows(text, HOLDINGS_TBODY) if len(tds) == 5]
+
+
+CASES = [
+    # name, 하위 폴더, 인코딩, legacy, fast
+    ("parse_max_page", "naver_list", "cp949", legacy_max_page, fast_max_page),
+    ("article_text", "naver_article", "utf-8", legacy_article, fast_article),
+    ("fetch_holdings", "rise_detail", "utf-8", legacy_holdings, fast_holdings),
+]
+
+
+# =====================================================
+# 측정
+# =====================================================
+def best_of(fn, pages, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for p in pages:
+            fn(p)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--fixtures", type=Path, default=FIXTURE_DIR)
+    ap.add_argument("--naver-list-dir", type=Path, default=None, help="실제 수집한 목록 HTML 폴더")
+    args = ap.parse_args()
+
+    if not args.fixtures.exists():
+        write_fixtures(args.fixtures)
+
+    print(f"| {'stage':<16} | {'pages':>6} | {'KB/page':>7} | {'bs4(ms)':>9} | {'lxml(ms)':>9} | {'speedup':>7} |")
+    print(f"| {'-' * 16} | {'-' * 6} | {'-' * 7} | {'-' * 9} | {'-' * 9} | {'-' * 7} |")
+    for name, sub, enc, legacy, fast in CASES:
+        folder = args.naver_list_dir if (sub == "naver_list" and args.naver_list_dir) else args.fixtures / sub
+        pages = [p.read_bytes().decode(enc, errors="replace") for p in sorted(folder.glob("*.html"))]
+        if not pages:
+            print(f"⚠️ {folder} 에 페이지 없음")
+            continue
+
+        for i, p in enumerate(pages):
+            a, b = legacy(p), fast(p)
+            assert a == b, f"{name} 결과 불일치 (page #{i}): {a!r} != {b!r}"
+
+        kb = sum(len(p.encode("utf-8")) for p in pages) / len(pages) / 1024
+        t_old = best_of(legacy, pages, args.repeat)
+        t_new = best_of(fast, pages, args.repeat)
+        print(f"| {name:<16} | {len(pages):>6} | {kb:>7.1f} | {t_old:>9.1f} | {t_new:>9.1f} | {t_old / t_new:>6.1f}x |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BigFinance 로그인 경로 검증 + 소요시간 (mock_bigfinance 로컬 서버 사용)
+------------------------------------------------
+시나리오 (각 단계의 로그인/API 호출 수를 검증):
+  1) 캐시 없음          → requests 폼 로그인 1회 + 검증 1회, 캐시 파일 0600 저장
+  2) 캐시 유효          → 로그인 없이 검증 1회
+  3) 서버측 세션 만료   → 검증 실패 → requests 재로그인
+  4) 캐시 권한 열림     → 캐시 무시 → 재로그인
+  5) 잘못된 비밀번호    → BIGFINANCE_LOGIN=requests 에서 LoginError
+  --selenium 지정 시 Chrome fallback 로그인 시간도 측정 (chromedriver 필요)
+ex) python benchmarks/bench_login.py
+"""
+
+import argparse
+import os
+import stat
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from benchmarks.mock_bigfinance import MockBigFinance
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--selenium", action="store_true", help="Selenium fallback 로그인도 측정")
+    args = ap.parse_args()
+
+    server = MockBigFinance(username="bench@example.com", password="pw").start()
+    tmp = Path(tempfile.mkdtemp())
+    cache_path = tmp / "cache" / "bigfinance_session.json"
+    os.environ.update({
+        "BASE_URL": server.base_url, "USERNAME": server.username, "PASSWORD": server.password,
+        "SESSION_CACHE_PATH": str(cache_path), "BIGFINANCE_LOGIN": "auto", "HEADLESS": "true",
+        # 전역 레이트 리미터는 끄고, 켜더라도 실제 cache/rate_limit.sqlite 가 아닌 임시 파일 사용
+        "RATE_LIMIT": "false", "RATE_LIMIT_PATH": str(tmp / "rate_limit.sqlite"),
+    })
+    from pipelines.bigrise import bigfinance as bf
+    from pipelines.bigrise.bigfinance_auth import LoginError
+
+    rows = []
+
+    def step(name, expect_logins, expect_api, fn=bf.login_session):
+        before = dict(server.stats)
+        t0 = time.perf_counter()
+        sess, checked = fn()
+        elapsed = (time.perf_counter() - t0) * 1000
+        logins = server.stats["logins"] - before.get("logins", 0)
+        api = server.stats["api_calls"] - before.get("api_calls", 0)
+        assert "categories" in checked, f"{name}: 검증 응답 이상"
+        assert (logins, api) == (expect_logins, expect_api), f"{name}: logins={logins} api={api}"
+        rows.append((name, logins, api, elapsed))
+        sess.close()
+
+    # 1) 캐시 없음
+    step("cold (requests 로그인)", 1, 1)
+    mode = stat.S_IMODE(cache_path.stat().st_mode)
+    assert mode == 0o600, f"캐시 권한 {oct(mode)}"
+
+    # 2) 캐시 재사용
+    step("warm (캐시 재사용)", 0, 1)
+
+    # 3) 서버측 만료
+    server.expire_sessions()
+    step("만료 → 재로그인", 1, 2)
+
+    # 4) 권한이 열린 캐시
+    os.chmod(cache_path, 0o644)
+    step("캐시 권한 0644 → 무시", 1, 1)
+
+    # 5) 잘못된 비밀번호 (requests 전용)
+    cache_path.unlink()
+    bf.PASSWORD, bf.BIGFINANCE_LOGIN = "wrong", "requests"
+    try:
+        bf.login_session()
+        raise AssertionError("잘못된 비밀번호인데 로그인 성공")
+    except LoginError:
+        rows.append(("잘못된 비밀번호 → LoginError", 0, 0, float("nan")))
+    bf.PASSWORD = server.password
+
+    if args.selenium:
+        bf.BIGFINANCE_LOGIN = "selenium"
+        step("selenium fallback", 1, 1)
+
+    print(f"| {'scenario':<28} | {'logins':>6} | {'api':>3} | {'ms':>8} |")
+    print(f"| {'-' * 28} | {'-' * 6} | {'-' * 3} | {'-' * 8} |")
+    for name, logins, api, ms in rows:
+        print(f"| {name:<28} | {logins:>6} | {api:>3} | {ms:>8.1f} |")
+    print("✅ 모든 시나리오 통과")
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ETF–산업 매칭 확장성 벤치마크 (합성 데이터, 외부 접속 없음)
+------------------------------------------------
+- out_sample RISE 구성내역(rise_finder_20251111_with_holdings_flattened.csv)을 1× / 10× / 100× 로 늘린 합성 데이터
+  · 구성내역 : ETF 라인업 복제(발행사 추가) + 복제분 보유종목 절반은 새 합성 종목 → 종목 유니버스도 규모만큼 증가
+  · 산업     : synthetic.make_industry (sub 카테고리 1,500 × 규모, sub 당 data 4개)
+               → merge_meta(companies JSON) · build_companies_table · chart_index
+- bigrise_pre 매칭 경로를 그대로 측정 (파일 읽기/쓰기 제외)
+  · merge  : prepare_industry (날짜 컬럼 보호 + chart_index 병합)
+  · match  : match_industry   (매칭 + industry_* 컬럼 부착)
+  · recent : recent_rows      (날짜 파싱 + 최근 7일 필터)
+  매칭 방식 code(industry_companies 종목코드 조인, 기본) / name(companies 문자열 부분문자열, 과거 데이터)
+- 구간별 소요시간(best of N) · tracemalloc 최대 메모리 · 매칭 행 수 · 결과 digest
+- --save 로 결과 JSON 저장, --compare 로 저장된 결과 대비 소요시간 · 결과 일치 비교 (새 매처 검증용)
+ex) python benchmarks/bench_matching.py --scales 1,10,100 --save out/metrics/bench_matching.json
+    python benchmarks/bench_matching.py --compare out/metrics/bench_matching.json
+"""
+
+import argparse
+import gc
+import hashlib
+import json
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from benchmarks.synthetic import UPDATE_DATES, load_rise_sample, make_industry
+from pipelines.bigrise.bigrise_pre import INDUSTRY_COLUMNS, match_industry, prepare_industry, recent_rows
+from pipelines.bigrise.industry_meta import build_companies_table, merge_meta
+from pipelines.common.perf import write_json
+
+DATE = "20251111"
+BASE_SUBS = 1500
+PER_SUB = 4
+MODES = ("code", "name")
+PHASES = ("merge", "match", "recent")
+DIGEST_COLUMNS = ["industry_info", "industry_update_date", "industry_chart_path"]
+
+
+# =====================================================
+# 합성 데이터
+# =====================================================
+def scale_holdings(rise_df: pd.DataFrame, scale: int, seed: int = 0) -> pd.DataFrame:
+    """ETF 라인업을 scale 배로 복제. 복제분 보유종목은 50% 확률로 합성 종목(합성종목NNNNNN)으로 교체"""
+    rng = np.random.default_rng(seed)
+    n_stocks = rise_df["item_name"].nunique()
+    parts = [rise_df]
+    for j in range(1, scale):
+        part = rise_df.copy()
+        part["name"] = part["name"] + f" #{j}"
+        part["detail_url"] = part["detail_url"] + f"-{j}"
+        swap = rng.random(len(part)) < 0.5
+        ids = (j - 1) * n_stocks + rng.integers(0, n_stocks, int(swap.sum()))
+        part.loc[swap, "item_name"] = [f"합성종목{i:06d}" for i in ids]
+        part.loc[swap, "item_code"] = [f"KR7{i:06d}003" for i in ids]
+        parts.append(part)
+    return pd.concat(parts, ignore_index=True)
+
+
+def make_chart_index(cat_df: pd.DataFrame, seed: int = 0) -> pd.DataFrame:
+    """chart_index.csv 와 같은 컬럼 (data 행마다 chart 1개)"""
+    rng = np.random.default_rng(seed)
+    keys = cat_df[["main_code", "group_id", "sub_code", "data_code"]].reset_index(drop=True)
+    paths = [f"./out/bigfinance/chart/{a}_{b}_{c}_{d}.json" for a, b, c, d in keys.itertuples(index=False)]
+    dates = np.array(UPDATE_DATES, dtype=object)[rng.integers(0, len(UPDATE_DATES), len(keys))]
+    return keys.assign(file_path=paths, update_date=dates)
+
+
+class Dataset:
+    def __init__(self, rise_sample: pd.DataFrame, scale: int, seed: int = 0):
+        self.scale = scale
+        self.rise_df = scale_holdings(rise_sample, scale, seed)
+        cat_df, cache_header, cache_comp = make_industry(self.rise_df, n_sub=BASE_SUBS * scale,
+                                                         per_sub=PER_SUB, seed=seed)
+        industry = merge_meta(cat_df, cache_header, cache_comp)
+        self.industry_df = industry[[c for c in INDUSTRY_COLUMNS if c in industry.columns]]
+        companies = build_companies_table(cat_df, cache_comp)
+        self.companies_df = companies[["main_code", "sub_code", "data_code", "company_code"]].astype(
+            {"company_code": str})
+        self.chart_df = make_chart_index(cat_df, seed)
+
+    def industry(self, mode: str) -> pd.DataFrame:
+        # run() 과 동일: 코드 조인이 가능하면 companies JSON 컬럼은 읽지 않음
+        return self.industry_df.drop(columns="companies") if mode == "code" else self.industry_df
+
+    def sizes(self) -> dict:
+        return {
+            "holdings": len(self.rise_df),
+            "etfs": self.rise_df["name"].nunique(),
+            "stocks": self.rise_df["item_name"].nunique(),
+            "industry": len(self.industry_df),
+            "companies": len(self.companies_df),
+        }
+
+
+# =====================================================
+# 측정
+# =====================================================
+def run_path(data: Dataset, mode: str):
+    """bigrise_pre 매칭 경로 1회 → (구간별 초, 결과 rise_df, recent_df)"""
+    industry_df = data.industry(mode)
+    companies_df = data.companies_df if mode == "code" else None
+    t = {}
+    t0 = time.perf_counter()
+    industry_df = prepare_industry(industry_df, data.chart_df)
+    t["merge"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    out, _ = match_industry(data.rise_df, industry_df, companies_df)
+    t["match"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    recent = recent_rows(out, DATE)
+    t["recent"] = time.perf_counter() - t0
+    return t, out, recent
+
+
+def digest(df: pd.DataFrame) -> str:
+    cols = [c for c in DIGEST_COLUMNS if c in df.columns]
+    h = pd.util.hash_pandas_object(df[cols].astype("string").fillna(""), index=False)
+    return hashlib.sha1(h.to_numpy().tobytes()).hexdigest()[:12]
+
+
+def measure(data: Dataset, mode: str, repeat: int) -> dict:
+    best, out, recent = None, None, None
+    for _ in range(repeat):
+        t, out, recent = run_path(data, mode)
+        if best is None or sum(t.values()) < sum(best.values()):
+            best = t
+        del out, recent
+        gc.collect()
+
+    # 메모리는 별도 1회 (tracemalloc 은 실행 속도를 늦춤)
+    tracemalloc.start()
+    _, out, recent = run_path(data, mode)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "scale": data.scale,
+        "mode": mode,
+        **data.sizes(),
+        "matched": int(out["industry_info"].notna().sum()) if "industry_info" in out.columns else 0,
+        "recent": len(recent),
+        **{f"{k}_ms": round(v * 1000, 1) for k, v in best.items()},
+        "total_ms": round(sum(best.values()) * 1000, 1),
+        "peak_mb": round(peak / 2 ** 20, 1),
+        "digest": digest(out),
+    }
+
+
+# =====================================================
+# 출력
+# =====================================================
+def print_header(compare: bool):
+    cols = ["scale", "mode", "holdings", "stocks", "industry", "matched", "recent",
+            *(f"{p}(ms)" for p in PHASES), "total(ms)", "peak(MB)"]
+    if compare:
+        cols += ["vs base", "result"]
+    print("| " + " | ".join(cols) + " |")
+    print("|" + "---|" * len(cols))
+
+
+def print_row(r: dict, base: dict = None, compare: bool = False):
+    cells = [f"{r['scale']}x", r["mode"], f"{r['holdings']:,}", f"{r['stocks']:,}", f"{r['industry']:,}",
+             f"{r['matched']:,}", f"{r['recent']:,}", *(f"{r[p + '_ms']:.1f}" for p in PHASES),
+             f"{r['total_ms']:.1f}", f"{r['peak_mb']:.1f}"]
+    if compare:
+        if base is None:
+            cells += ["-", "-"]
+        else:
+            cells += [f"{(r['total_ms'] - base['total_ms']) / base['total_ms'] * 100:+.0f}%",
+                      "same" if r["digest"] == base["digest"] else "DIFF"]
+    print("| " + " | ".join(cells) + " |")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--scales", default="1,10,100", help="out_sample 대비 규모 목록 (쉼표 구분)")
+    ap.add_argument("--modes", default=",".join(MODES), help="code,name 중 선택")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--save", type=Path, default=None, help="결과 JSON 저장 경로")
+    ap.add_argument("--compare", type=Path, default=None, help="비교 기준 결과 JSON (--save 로 저장한 파일)")
+    args = ap.parse_args()
+
+    modes = [m for m in args.modes.split(",") if m]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        ap.error(f"알 수 없는 mode: {', '.join(sorted(unknown))}")
+    base = {}
+    if args.compare:
+        saved = json.loads(args.compare.read_text(encoding="utf-8"))
+        base = {(r["scale"], r["mode"]): r for r in saved["results"]}
+
+    rise_sample = load_rise_sample()
+    print(f"out_sample {len(rise_sample):,}행 · ETF {rise_sample['name'].nunique()}개 기준, "
+          f"산업 sub {BASE_SUBS:,} × 규모 × data {PER_SUB}, best of {args.repeat}")
+    print_header(bool(args.compare))
+
+    results = []
+    for scale in (int(s) for s in args.scales.split(",")):
+        t0 = time.perf_counter()
+        data = Dataset(rise_sample, scale, args.seed)
+        gen = time.perf_counter() - t0
+        for mode in modes:
+            r = measure(data, mode, args.repeat)
+            r["generate_s"] = round(gen, 2)
+            results.append(r)
+            print_row(r, base.get((scale, mode)), bool(args.compare))
+        del data
+        gc.collect()
+
+    if args.save:
+        write_json(args.save, {
+            "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "python": sys.version.split()[0],
+            "pandas": pd.__version__,
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "results": results,
+        })
+        print(f"saved → {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+파싱 프로세스 풀 효과 (로컬 stand-in 서버, 외부 접속 없음)
+------------------------------------------------
+- naver   : 목록 스트리밍 수집(list) → 기사 본문(articles)
+- riseetf : ETF 목록 → 구성내역(holdings) → flatten
+- 파싱 워커 수(--workers)마다 같은 수집을 실행해 구간 소요시간 · 파싱 시간 · 대기 큐 최대 깊이 ·
+  큐가 가득 차 수집이 기다린 시간을 비교하고, 결과가 workers=0 (수집 스레드에서 파싱)과 같은지 확인
+  (riseetf 는 원래도 완료 순서로 기록 → 정렬 후 비교)
+ex) python benchmarks/bench_parse_pool.py --workers 0,2,4 --queue 64 --concurrency 8 --latency 0.03
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from benchmarks.bench_crawlers import DATE, configure_env
+from benchmarks.standin_server import StandInServer
+
+STAGES = ("naver", "riseetf")
+
+
+def digest(rows) -> str:
+    return hashlib.sha256(json.dumps(rows, ensure_ascii=False, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def run_naver(c: int, tmp: Path):
+    from pipelines.bigrise import naver_news as nv
+    from pipelines.common.http_client import HttpClient
+
+    nv.CLIENT = HttpClient(pool_size=c, headers=nv.HEADERS, rate=0)
+    nv.NAVER_RATE, nv.NAVER_CONCURRENCY = 0, c
+    engine = nv.make_engine()
+    rows = nv.stream_news_rows(DATE, list(nv.SECTION3_MAP), engine=engine)
+    rows = list({(r["url"], r["title"]): r for r in rows}.values())
+    nv.fetch_contents(rows, engine=engine)
+    return len(rows), digest(rows)
+
+
+def run_riseetf(c: int, tmp: Path):
+    import pandas as pd
+
+    from pipelines.bigrise import riseetf as rf
+    from pipelines.common.http_client import HttpClient
+
+    rf.CLIENT = HttpClient(pool_size=c, headers=rf.HEADERS)
+    rf.OUT_DIR = tmp / "riseETF"
+    rf.OUT_DIR.mkdir(parents=True, exist_ok=True)
+    flat = rf.flatten_holdings(rf.enrich_with_holdings_threaded(rf.scrape_rise_finder(DATE), max_workers=c))
+    df = pd.read_csv(flat, dtype=str, keep_default_na=False)
+    df = df.sort_values(["name", "number", "item_code"]).reset_index(drop=True)
+    return len(df), digest(df.to_dict("records"))
+
+
+RUNS = {"naver": ("naver_news", run_naver), "riseetf": ("riseetf", run_riseetf)}
+
+
+def bench(stage: str, workers: int, queue: int, c: int, tmp: Path):
+    import importlib
+
+    from pipelines.common.parse_pool import ParsePool
+
+    mod_name, fn = RUNS[stage]
+    mod = importlib.import_module(f"pipelines.bigrise.{mod_name}")
+    mod.PARSER = ParsePool(workers, queue, timer=mod.PARSE_TIMER)
+    parse0 = mod.PARSE_TIMER.total
+    t0 = time.perf_counter()
+    rows, dig = fn(c, tmp)
+    wall = time.perf_counter() - t0
+    mod.PARSER.shutdown()
+    return {"rows": rows, "digest": dig, "wall": wall, "parse": mod.PARSE_TIMER.total - parse0,
+            "peak": mod.PARSER.peak_depth, "blocked": mod.PARSER.blocked}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--stages", default=",".join(STAGES), help="naver,riseetf 중 선택")
+    ap.add_argument("--workers", default="0,2,4", help="파싱 워커 수 목록 (0 = 수집 스레드에서 파싱, 기준)")
+    ap.add_argument("--queue", type=int, default=64, help="파싱 대기 작업 상한")
+    ap.add_argument("--concurrency", type=int, default=8, help="수집 동시성")
+    ap.add_argument("--latency", type=float, default=0.03, help="서버 기본 응답 지연(초)")
+    args = ap.parse_args()
+
+    levels = [int(w) for w in args.workers.split(",")]
+    if 0 not in levels:
+        levels.insert(0, 0)
+    server = StandInServer(latency=args.latency).start()
+    tmp = Path(tempfile.mkdtemp())
+    configure_env(server, tmp, rate_limit=False)
+
+    print(f"stand-in {server.base_url} latency={args.latency}s concurrency={args.concurrency} queue={args.queue}")
+    print(f"| {'stage':<8} | {'workers':>7} | {'rows':>5} | {'wall(s)':>7} | {'parse(s)':>8} | "
+          f"{'peak':>4} | {'blocked(s)':>10} | {'result':<6} |")
+    print("| " + " | ".join("-" * w for w in (8, 7, 5, 7, 8, 4, 10, 6)) + " |")
+    for stage in [s for s in args.stages.split(",") if s]:
+        base = None
+        for w in levels:
+            r = bench(stage, w, args.queue, args.concurrency, tmp)
+            base = base or r["digest"]
+            print(f"| {stage:<8} | {w:>7} | {r['rows']:>5} | {r['wall']:>7.2f} | {r['parse']:>8.2f} | "
+                  f"{r['peak']:>4} | {r['blocked']:>10.2f} | {'same' if r['digest'] == base else 'DIFF':<6} |")
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+호스트별 적응형 속도 제한 검증 (로컬 throttling 서버, 외부 접속 없음)
+------------------------------------------------
+- 서버: 최근 1초 성공 응답 수가 --capacity 에 도달하면 429 (Retry-After 없음), 응답 지연 --latency
+- 두 프로세스가 같은 호스트를 동시에 수집 (일일 flow + backfill 상황 재현)
+  1) 제한 없음          : 워커 수만큼 몰아서 요청 → 429 비율
+  2) 고정 sleep         : 기존 riseetf 방식 (요청마다 0.1초 sleep)
+  3) 공유 limiter(AIMD) : 같은 SQLite 파일을 쓰는 HostRateLimiter (초기 rate 5 에서 시작)
+  4) 재실행(warm)       : 3) 에서 학습한 rate 가 남은 파일로 다시 수집
+- 처리량(성공/초) · 429 비율 · 종료 시 학습된 rate 출력
+ex) python benchmarks/bench_rate_limit.py --capacity 40 --seconds 30
+"""
+
+import argparse
+import multiprocessing as mp
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+
+class ThrottlingServer:
+    def __init__(self, capacity: int, latency: float):
+        self.capacity, self.latency = capacity, latency
+        self.window = deque()
+        self.lock = threading.Lock()
+        self._server = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self) -> "ThrottlingServer":
+        srv = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                now = time.monotonic()
+                with srv.lock:
+                    while srv.window and now - srv.window[0] > 1.0:
+                        srv.window.popleft()
+                    over = len(srv.window) >= srv.capacity
+                    if not over:
+                        srv.window.append(now)
+                time.sleep(srv.latency)
+                body = b"slow down" if over else b"ok"
+                self.send_response(429 if over else 200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def crawl(mode: str, url: str, seconds: float, workers: int, db_path: str, out):
+    """한 프로세스의 수집 루프 — (성공, 429) 건수를 out 큐로 반환"""
+    from pipelines.common.http_client import HttpClient
+    from pipelines.common.rate_limit import HostRateLimiter
+
+    limiter = HostRateLimiter(Path(db_path), rate=5) if mode.startswith("adaptive") else None
+    client = HttpClient(pool_size=workers, retries=0, limiter=limiter)
+    deadline = time.monotonic() + seconds
+
+    def worker():
+        ok = throttled = 0
+        while time.monotonic() < deadline:
+            r = client.get(url)
+            if r.status_code == 429:
+                throttled += 1
+            else:
+                ok += 1
+            if mode == "sleep":
+                time.sleep(0.1)
+        return ok, throttled
+
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        res = [f.result() for f in [ex.submit(worker) for _ in range(workers)]]
+    out.put((sum(r[0] for r in res), sum(r[1] for r in res)))
+
+
+def run_mode(mode: str, url: str, args, db_path: Path) -> tuple:
+    out = mp.Queue()
+    procs = [mp.Process(target=crawl, args=(mode, url, args.seconds, args.workers, str(db_path), out))
+             for _ in range(args.procs)]
+    for p in procs:
+        p.start()
+    results = [out.get() for _ in procs]
+    for p in procs:
+        p.join()
+
+    rate = None
+    if mode.startswith("adaptive"):
+        from pipelines.common.rate_limit import HostRateLimiter
+        stats = HostRateLimiter(db_path).stats()
+        rate = stats[0]["rate"] if stats else None
+    ok = sum(r[0] for r in results)
+    throttled = sum(r[1] for r in results)
+    return ok, throttled, rate
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--capacity", type=int, default=40, help="서버 허용 초당 요청 수")
+    ap.add_argument("--latency", type=float, default=0.02, help="서버 응답 지연(초)")
+    ap.add_argument("--seconds", type=float, default=30)
+    ap.add_argument("--procs", type=int, default=2, help="동시에 수집하는 프로세스 수")
+    ap.add_argument("--workers", type=int, default=10, help="프로세스별 스레드 수")
+    args = ap.parse_args()
+
+    server = ThrottlingServer(args.capacity, args.latency).start()
+    url = server.base_url + "/item"
+
+    print(f"server capacity={args.capacity}/s latency={args.latency}s · "
+          f"{args.procs} procs × {args.workers} workers · {args.seconds}s")
+    print(f"| {'mode':<13} | {'ok/s':>7} | {'429':>6} | {'429 %':>6} | {'rate':>6} |")
+    print(f"| {'-' * 13} | {'-' * 7} | {'-' * 6} | {'-' * 6} | {'-' * 6} |")
+    db_path = Path(tempfile.mkdtemp()) / "rate_limit.sqlite"
+    for mode in ("none", "sleep", "adaptive", "adaptive-warm"):
+        time.sleep(1.1)            # 서버 1초 창 비우기
+        ok, throttled, rate = run_mode(mode, url, args, db_path)
+        pct = 100 * throttled / max(1, ok + throttled)
+        rate_s = f"{rate:.1f}" if rate is not None else "-"
+        print(f"| {mode:<13} | {ok / args.seconds:>7.1f} | {throttled:>6} | {pct:>5.1f}% | {rate_s:>6} |")
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+체크포인트 저널 재개 검증 (로컬 stand-in 서버, 외부 접속 없음)
+------------------------------------------------
+- naver  : 기사 본문 수집(_enrich_csv)      — 저널 naver_news_YYYYMMDD_with_contents.journal.jsonl
+- charts : BigFinance chart 수집(download_all_charts) — 저널 chart_index.journal.jsonl
+- 시나리오마다
+  · full   : 중단 없이 1회 실행 (기준 요청 수 · 소요시간 · 결과)
+  · crash  : 자식 프로세스로 실행하다 요청이 --crash-at 비율만큼 나가면 SIGKILL
+  · resume : 같은 폴더에서 다시 실행 → 저널에 없는 항목만 요청하는지, 결과가 full 과 같은지 확인
+- 기사 캐시 · chart JSON 내보내기 · 공용 속도 제한은 끔 (저널 효과만 측정)
+ex) python benchmarks/bench_resume.py --crash-at 0.5 --latency 0.03
+"""
+
+import argparse
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+DATE = "20251110"
+CONCURRENCY = 4
+
+
+def configure_env(base_url: str, tmp: Path):
+    os.environ.update({
+        "NAVER_BASE_URL": base_url, "NAVER_ARTICLE_BASE_URL": base_url, "BASE_URL": base_url,
+        "BIGFINANCE_LOGIN": "requests", "SESSION_CACHE_PATH": str(tmp / "cache" / "bigfinance_session.json"),
+        "ARTICLE_CACHE": "false", "CHART_EXPORT": "false", "OUTPUT_FORMAT": "csv",
+        "RATE_LIMIT": "false", "NAVER_RATE": "0", "NAVER_CONCURRENCY": str(CONCURRENCY),
+        "METRICS_DIR": str(tmp / "metrics"),
+    })
+
+
+# =====================================================
+# 단계 실행 (부모 · 자식 프로세스 공용)
+# =====================================================
+def naver_input(work: Path) -> Path:
+    return work / f"naver_news_{DATE}.csv"
+
+
+def run_naver(work: Path) -> Path:
+    from pipelines.bigrise import naver_news as nv
+    return Path(nv.enrich_csv_with_contents_async(str(naver_input(work))))
+
+
+def use_chart_dir(bf, work: Path):
+    bf.BASE_DIR = work
+    bf.OUT_DIR = work / "out" / "bigfinance"
+    bf.CHART_META_DIR = bf.OUT_DIR / "chart"
+    bf.CHART_INDEX_FILE = bf.CHART_META_DIR / "chart_index.csv"
+    bf.CHART_JOURNAL_FILE = bf.CHART_META_DIR / "chart_index.journal.jsonl"
+    bf.CHART_STORE_PATH = bf.CHART_META_DIR / "chart_store.sqlite"
+    bf.CHART_META_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def run_charts(work: Path, table: Path) -> Path:
+    from pipelines.bigrise import bigfinance as bf
+    use_chart_dir(bf, work)
+    sess, _ = bf.login_session()
+    bf.download_all_charts(sess, table, max_workers=CONCURRENCY, sync_mode="full")
+    sess.close()
+    return bf.CHART_INDEX_FILE
+
+
+def prepare(server, tmp: Path, works: list) -> Path:
+    """naver 입력 CSV(각 작업 폴더) + BigFinance meta 테이블 생성 → meta 테이블 경로"""
+    from pipelines.bigrise import bigfinance as bf
+    from pipelines.bigrise import naver_news as nv
+
+    rows = nv.stream_news_rows(DATE, list(nv.SECTION3_MAP), engine=nv.make_engine())
+    src = Path(nv.write_news_csv(rows, DATE, tmp))
+    for w in works:
+        w.mkdir(parents=True, exist_ok=True)
+        shutil.copy(src, naver_input(w))
+
+    use_chart_dir(bf, tmp / "prep")
+    sess, checked = bf.login_session()
+    csv_file = bf.OUT_DIR / f"industry_categories_{DATE}.csv"
+    table = bf.OUT_DIR / f"industry_categories_{DATE}_with_meta_companies.csv"
+    bf.save_to_csv(bf.flatten_categories(checked), csv_file)
+    bf.enrich_with_meta(sess, csv_file, table)
+    sess.close()
+    return table
+
+
+# =====================================================
+# 시나리오
+# =====================================================
+def timed(server, stat: str, fn):
+    server.reset_stats()
+    t0 = time.perf_counter()
+    out = fn()
+    return out, server.stats.get(stat, 0), time.perf_counter() - t0
+
+
+def crash(server, stat: str, child_args: list, at: int):
+    """자식 프로세스로 실행하다 stat 요청이 at 건 이상이면 SIGKILL. (요청 수, 소요시간, 완주 여부)"""
+    server.reset_stats()
+    t0 = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, __file__, *child_args],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    while proc.poll() is None and server.stats.get(stat, 0) < at:
+        time.sleep(0.005)
+    finished = proc.poll() is not None
+    if not finished:
+        proc.send_signal(signal.SIGKILL)
+    proc.wait()
+    return server.stats.get(stat, 0), time.perf_counter() - t0, finished
+
+
+def journal_lines(path: Path) -> int:
+    # 첫 줄은 meta
+    return max(0, sum(1 for _ in path.open("rb")) - 1) if path.exists() else 0
+
+
+def same_table(a: Path, b: Path, sort_by=None) -> bool:
+    import pandas as pd
+    da, db = pd.read_csv(a, dtype=str), pd.read_csv(b, dtype=str)
+    if sort_by:
+        da, db = (d.sort_values(sort_by).reset_index(drop=True) for d in (da, db))
+    return da.equals(db)
+
+
+def print_row(stage, scenario, reqs, wall, journal="-", result="-"):
+    print(f"| {stage:<6} | {scenario:<15} | {reqs:>5} | {wall:>7.2f} | {journal!s:>7} | {result:<6} |")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--crash-at", type=float, default=0.5, help="전체 요청 대비 강제 종료 시점 비율")
+    ap.add_argument("--latency", type=float, default=0.03)
+    ap.add_argument("--child", choices=["naver", "charts"], default=None, help=argparse.SUPPRESS)
+    ap.add_argument("--work", type=Path, default=None, help=argparse.SUPPRESS)
+    ap.add_argument("--table", type=Path, default=None, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child == "naver":
+        run_naver(args.work)
+        return
+    if args.child == "charts":
+        run_charts(args.work, args.table)
+        return
+
+    from benchmarks.standin_server import StandInServer
+
+    server = StandInServer(latency=args.latency).start()
+    tmp = Path(tempfile.mkdtemp())
+    configure_env(server.base_url, tmp)
+    os.environ.update({"USERNAME": server.bigfinance.username, "PASSWORD": server.bigfinance.password})
+    full_dir, resume_dir = tmp / "full", tmp / "resume"
+    table = prepare(server, tmp, [full_dir, resume_dir])
+
+    print(f"stand-in {server.base_url} latency={args.latency}s crash_at={args.crash_at:.0%} "
+          f"concurrency={CONCURRENCY}")
+    print(f"| {'stage':<6} | {'scenario':<15} | {'reqs':>5} | {'wall(s)':>7} | {'journal':>7} | {'result':<6} |")
+    print("| " + " | ".join("-" * w for w in (6, 15, 5, 7, 7, 6)) + " |")
+
+    # ① naver 본문
+    from pipelines.bigrise import naver_news as nv
+    base_out, n_full, t_full = timed(server, "naver_article", lambda: run_naver(full_dir))
+    print_row("naver", "full", n_full, t_full)
+    jpath = nv.journal_path(nv.table_path(resume_dir / f"naver_news_{DATE}_with_contents"))
+    n, t, finished = crash(server, "naver_article", ["--child", "naver", "--work", str(resume_dir)],
+                           int(n_full * args.crash_at))
+    print_row("naver", "crash" + (" (완주)" if finished else " (SIGKILL)"), n, t, journal_lines(jpath))
+    out, n, t = timed(server, "naver_article", lambda: run_naver(resume_dir))
+    print_row("naver", "resume", n, t, journal_lines(jpath),
+              "same" if same_table(base_out, out) else "DIFF")
+
+    # ② BigFinance chart
+    from pipelines.bigrise import bigfinance as bf
+    base_idx, n_full, t_full = timed(server, "bigfinance_api", lambda: run_charts(full_dir, table))
+    print_row("charts", "full", n_full, t_full)
+    jpath = resume_dir / "out" / "bigfinance" / "chart" / bf.CHART_JOURNAL_FILE.name
+    n, t, finished = crash(server, "bigfinance_api",
+                           ["--child", "charts", "--work", str(resume_dir), "--table", str(table)],
+                           int(n_full * args.crash_at))
+    print_row("charts", "crash" + (" (완주)" if finished else " (SIGKILL)"), n, t, journal_lines(jpath))
+    idx, n, t = timed(server, "bigfinance_api", lambda: run_charts(resume_dir, table))
+    print_row("charts", "resume", n, t, journal_lines(jpath),
+              "same" if same_table(base_idx, idx, sort_by=bf.CHART_KEY_COLUMNS) else "DIFF")
+
+    server.stop()
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+단계 기동 비용 벤치마크: subprocess 모드 vs in-process 모드
+------------------------------------------------
+- subprocess : 단계마다 python3 기동 + 모듈 import (pandas · bs4 · selenium 등 매번 재로드)
+- inprocess  : 한 프로세스에서 네 모듈을 한 번씩 import (flow 프로세스는 이미 떠 있으므로
+               실제 추가 비용은 import 시간뿐)
+- import 부작용 검사: import 후 로깅 핸들러가 붙지 않았는지 확인 (Chrome/디렉토리 생성 없음)
+- 네트워크 · 실제 수집은 하지 않음
+ex) python benchmarks/bench_startup.py --repeat 5
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+STAGES = [
+    "pipelines.bigrise.naver_news",
+    "pipelines.bigrise.riseetf",
+    "pipelines.bigrise.bigfinance",
+    "pipelines.bigrise.bigrise_pre",
+]
+
+# in-process: 한 인터프리터에서 네 모듈 import 시간 측정 + 부작용 검사
+INPROCESS_PROBE = f"""
+import importlib, logging, time
+t0 = time.perf_counter()
+mods = [importlib.import_module(m) for m in {STAGES!r}]
+elapsed = time.perf_counter() - t0
+leaked = [m.__name__ for m in mods if m.log.handlers] + (["root"] if logging.getLogger().handlers else [])
+print(elapsed, ",".join(leaked))
+"""
+
+
+def spawn(code: str) -> float:
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=BASE_DIR, check=True,
+                   stdout=subprocess.DEVNULL)
+    return time.perf_counter() - t0
+
+
+def best(fn, repeat: int) -> float:
+    return min(fn() for _ in range(repeat))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    print(f"| {'stage':<32} | {'subprocess(ms)':>14} |")
+    print(f"| {'-' * 32} | {'-' * 14} |")
+    total = 0.0
+    for mod in STAGES:
+        t = best(lambda: spawn(f"import {mod}"), args.repeat)
+        total += t
+        print(f"| {mod:<32} | {t * 1000:>14.1f} |")
+    print(f"| {'합계 (subprocess 모드 4단계)':<29} | {total * 1000:>14.1f} |")
+
+    runs = []
+    for _ in range(args.repeat):
+        out = subprocess.run([sys.executable, "-c", INPROCESS_PROBE], cwd=BASE_DIR, check=True,
+                             capture_output=True, text=True).stdout.split()
+        runs.append(float(out[0]))
+        leaked = out[1] if len(out) > 1 else ""
+    imports = min(runs)
+    interp = best(lambda: spawn("pass"), args.repeat)
+
+    print()
+    print(f"- python3 기동만           : {interp * 1000:.1f} ms")
+    print(f"- in-process 네 모듈 import : {imports * 1000:.1f} ms (flow 프로세스에서 1회)")
+    print(f"- subprocess 대비 절감      : {(total - imports) * 1000:.1f} ms ({total / imports:.1f}x)")
+    print(f"- import 부작용(로깅 핸들러) : {leaked or '없음'}")
+    if leaked:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+행 단위 pandas 루프 vs 컬럼 연산 비교 벤치마크
+------------------------------------------------
+- enrich_with_meta : iterrows + df.at  →  merge_meta (DataFrame merge)
+- download_all_charts 작업 목록 : iterrows  →  itertuples
+- industry_update_date : apply(get_update_date)  →  coalesce_update_date
+- parsed_date : apply(parse_date)  →  parse_dates (to_datetime)
+- 두 구현의 결과가 동일한지 검증 후 시간 비교
+
+실행: python benchmarks/bench_vectorize.py [--repeat 5]
+"""
+
+import argparse
+import copy
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from benchmarks.synthetic import BIGRISE_SAMPLE, load_rise_sample, make_industry
+from pipelines.bigrise.industry_meta import merge_meta
+from pipelines.bigrise.bigrise_pre import UPDATE_DATE_COLUMNS, coalesce_update_date, parse_dates
+
+CHART_COLUMNS = ["main_code", "group_id", "sub_code", "data_code",
+                 "data_type", "sub_name", "data_name", "update_date"]
+
+
+# =====================================================
+# 기존(행 단위) 구현
+# =====================================================
+def legacy_merge_meta(df, cache_header, cache_comp):
+    for idx, r in df.iterrows():
+        k = (r["main_code"], r["sub_code"])
+        for k2, v2 in cache_header.get(k, {}).items():
+            df.at[idx, k2] = v2
+        df.at[idx, "companies"] = json.dumps(cache_comp.get(k, []), ensure_ascii=False)
+    return df
+
+
+def legacy_chart_tasks(df):
+    return [tuple(r[c] for c in CHART_COLUMNS) for _, r in df.iterrows()]
+
+
+def legacy_get_update_date(row):
+    for col in UPDATE_DATE_COLUMNS:
+        v = row.get(col, None)
+        if pd.notna(v) and str(v).strip() != "":
+            return v
+    return ""
+
+
+def legacy_parse_date(date_str):
+    if pd.isna(date_str):
+        return None
+    s = str(date_str).strip()
+    for fmt in ("%Y%m%d", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(s, fmt)
+        except ValueError:
+            pass
+    return None
+
+
+# =====================================================
+# 측정
+# =====================================================
+def best_of(fn, repeat):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def report(name, rows, old, new):
+    print(f"{name:<24}{rows:>8}{old * 1000:>12.1f}{new * 1000:>12.1f}{old / new:>9.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rise_df = load_rise_sample()
+    cat_df, cache_header, cache_comp = make_industry(rise_df, n_sub=1500, per_sub=4)
+    bigrise_df = pd.read_csv(BIGRISE_SAMPLE)
+
+    print(f"{'stage':<24}{'rows':>8}{'before(ms)':>12}{'after(ms)':>12}{'speedup':>10}")
+
+    # ① header + companies 병합
+    t_old, a = best_of(lambda: legacy_merge_meta(cat_df.copy(), cache_header, cache_comp), args.repeat)
+    t_new, b = best_of(lambda: merge_meta(cat_df.copy(), copy.deepcopy(cache_header), cache_comp), args.repeat)
+    assert a.to_csv(index=False) == b.to_csv(index=False), "merge_meta 결과 불일치"
+    report("enrich_with_meta", len(cat_df), t_old, t_new)
+
+    # ② chart 작업 목록
+    t_old, a = best_of(lambda: legacy_chart_tasks(cat_df), args.repeat)
+    t_new, b = best_of(lambda: list(cat_df[CHART_COLUMNS].itertuples(index=False, name=None)), args.repeat)
+    assert a == b, "chart 작업 목록 불일치"
+    report("chart task list", len(cat_df), t_old, t_new)
+
+    # ③ industry_update_date 선택 (out_sample 기반 3개 후보 컬럼)
+    upd = pd.DataFrame({
+        "industry_update_date_raw": bigrise_df["industry_update_date"].where(bigrise_df.index % 3 == 0),
+        "industry_update_date_header": bigrise_df["industry_update_date"].where(bigrise_df.index % 3 == 1, " "),
+        "chart_update_date": bigrise_df["industry_update_date"],
+    })
+    t_old, a = best_of(lambda: upd.apply(legacy_get_update_date, axis=1), args.repeat)
+    t_new, b = best_of(lambda: coalesce_update_date(upd), args.repeat)
+    assert a.fillna("").astype(str).tolist() == b.fillna("").astype(str).tolist(), "update_date 불일치"
+    report("industry_update_date", len(upd), t_old, t_new)
+
+    # ④ 날짜 파싱 (out_sample industry_update_date + YYYYMMDD 변형)
+    dates = pd.concat([
+        bigrise_df["industry_update_date"],
+        bigrise_df["industry_update_date"].str.replace("-", "", regex=False),
+    ], ignore_index=True)
+    t_old, a = best_of(lambda: pd.to_datetime(dates.apply(legacy_parse_date)), args.repeat)
+    t_new, b = best_of(lambda: parse_dates(dates), args.repeat)
+    assert a.equals(b), "parsed_date 불일치"
+    report("parsed_date", len(dates), t_old, t_new)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+벤치마크용 HTML 픽스처 생성기
+------------------------------------------------
+- out_sample 의 Naver 기사 / RISE 구성종목으로 실제 사이트와 같은 구조의 페이지 생성
+  · Naver 뉴스 목록 (news_list.naver, euc-kr)
+  · Naver 기사 본문 (n.news.naver.com, div#dic_area)
+  · RISE ETF 목록 (prod/finder, th onclick 상세 경로 + 가격/등락)
+  · RISE ETF 상세 (tab3 구성내역 tbody[data-class="tab3PdfList"])
+- 메뉴 · 스크립트 · 주석 등 페이지 외곽 마크업 포함 → 전체 문서 파싱 비용이 실제와 비슷
+- seed 고정 → 실행마다 동일한 페이지
+"""
+
+import csv
+import html
+import random
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+from urllib.parse import urlparse
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+SAMPLE_DIR = BASE_DIR / "out_sample"
+NAVER_SAMPLE = SAMPLE_DIR / "naver" / "naver_news_20251110_with_contents.csv"
+RISE_SAMPLE = SAMPLE_DIR / "riseETF" / "rise_finder_20251111_with_holdings_flattened.csv"
+FIXTURE_DIR = BASE_DIR / "benchmarks" / "fixtures"
+
+NAVER_PAGE_SIZE = 20
+esc = html.escape
+
+
+# =====================================================
+# 샘플 로드
+# =====================================================
+def load_news_sample() -> List[dict]:
+    with open(NAVER_SAMPLE, newline="", encoding="utf-8-sig") as f:
+        return list(csv.DictReader(f))
+
+
+def load_holdings_sample() -> Dict[str, List[dict]]:
+    """detail_url → 구성종목 행 목록 (파일 순서 유지)"""
+    by_etf: Dict[str, List[dict]] = defaultdict(list)
+    with open(RISE_SAMPLE, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            by_etf[row["detail_url"]].append(row)
+    return dict(by_etf)
+
+
+# =====================================================
+# 페이지 외곽 (메뉴 · 스크립트 · 주석)
+# =====================================================
+def _chrome(rnd: random.Random, links: int = 120, scripts: int = 6) -> Tuple[str, str]:
+    nav = "".join(
+        f'<li class="m{i % 7}"><a href="/menu/{i}.naver" onclick="clk(\'m{i}\')">메뉴 {i}</a></li>'
+        for i in range(links)
+    )
+    js = "".join(
+        f"<script>var cfg{i} = {{a: {rnd.randint(0, 999)}, b: '<div>' + 'x'.repeat({i})}};</script>"
+        for i in range(scripts)
+    )
+    head = (f"<head><title>fixture</title><style>.a{{color:red}} .b{{margin:0}}</style>{js}</head>"
+            f'<body><div id="header"><ul class="gnb">{nav}</ul></div><!-- header end -->')
+    foot = (f'<div id="footer"><ul>{nav}</ul><p>Copyright &copy; fixture</p></div>'
+            f"{js}</body>")
+    return head, foot
+
+
+# =====================================================
+# Naver
+# =====================================================
+def naver_sections(rows: List[dict]) -> Dict[int, List[dict]]:
+    by_sec: Dict[int, List[dict]] = defaultdict(list)
+    for r in rows:
+        by_sec[int(r["section_id3"])].append(r)
+    return dict(by_sec)
+
+
+def naver_max_page(n_rows: int) -> int:
+    return max(1, (n_rows + NAVER_PAGE_SIZE - 1) // NAVER_PAGE_SIZE)
+
+
+def naver_list_page(section_rows: List[dict], page: int, seed: int = 0) -> bytes:
+    """news_list.naver 목록 페이지 (euc-kr 바이트)"""
+    rnd = random.Random(seed * 1000 + page)
+    head, foot = _chrome(rnd)
+    items = section_rows[(page - 1) * NAVER_PAGE_SIZE: page * NAVER_PAGE_SIZE]
+    body = "".join(
+        f'<dl><dt class="thumb"><a href="/news/news_read.naver?article_id={r["article_id"]}">'
+        f'<img src="https://imgnews.pstatic.net/{i}.jpg"></a></dt>'
+        f'<dd class="articleSubject">\n'
+        f'<a href="/news/news_read.naver?article_id={r["article_id"]}&amp;office_id={r["office_id"]}'
+        f'&amp;mode=LSS3D&amp;type=0" title="{esc(r["title"])}">{esc(r["title"])}</a>\n</dd>\n'
+        f'<dd class="articleSummary">\n{esc(r["contents"][:120])}\n'
+        f'<span class="press">{esc(r["press"])}</span>\n<span class="bar">|</span>\n'
+        f'<span class="wdate">{r["wdate"]}</span>\n</dd></dl>'
+        for i, r in enumerate(items)
+    )
+    last = naver_max_page(len(section_rows))
+    nav = "".join(f'<td><a href="/news/news_list.naver?mode=LSS3D&amp;page={p}">{p}</a></td>'
+                  for p in range(1, last + 1))
+    doc = (f'<html lang="ko">{head}<div class="mainNewsList"><ul class="realtimeNewsList">{body}'
+           f'</ul></div><table class="Nnavi"><tr>{nav}</tr></table>{foot}</html>')
+    return doc.encode("cp949", errors="replace")
+
+
+def naver_article_page(row: dict, seed: int = 0) -> bytes:
+    """n.news.naver.com 기사 페이지 (utf-8 바이트, 본문은 div#dic_area)"""
+    rnd = random.Random(f"{seed}-{row['office_id']}-{row['article_id']}")
+    head, foot = _chrome(rnd, links=300, scripts=12)
+    words = esc(row["contents"]).split(" ")
+    cut = sorted(rnd.sample(range(len(words)), min(3, max(0, len(words) - 1))))
+    parts, prev = [], 0
+    for c in cut:
+        parts.append(" ".join(words[prev:c]))
+        prev = c
+    parts.append(" ".join(words[prev:]))
+    body = (
+        f'<span class="end_photo_org"><img src="x.jpg"><em class="img_desc"></em></span>'
+        f"\n{parts[0]}<br><br>\n<!-- 본문 중간 광고 -->"
+        + "".join(f'<span class="b">\n  {p}</span><br/>\n' for p in parts[1:])
+        + "<script>ad_slot('dic');</script>\n"
+    )
+    doc = (f'<html lang="ko">{head}<div id="ct"><div class="media_end_head">'
+           f'<h2 class="media_end_head_headline">{esc(row["title"])}</h2></div>'
+           f'<div id="newsct_article"><article id="dic_area" class="go_trans _article_content">'
+           f"{body}</article></div></div>{foot}</html>")
+    # 실제 페이지는 article#dic_area / div#dic_area 가 섞여 있음
+    if rnd.random() < 0.5:
+        doc = doc.replace('<article id="dic_area"', '<div id="dic_area"', 1)
+        doc = doc.replace("</article></div></div>", "</div></div></div>", 1)
+    return doc.encode("utf-8")
+
+
+# =====================================================
+# RISE ETF
+# =====================================================
+def rise_finder_page(etfs: Dict[str, List[dict]], seed: int = 0) -> bytes:
+    """ETF 목록 페이지 (etfs = load_holdings_sample(), 상세 경로는 detail_url 의 path)"""
+    rnd = random.Random(seed)
+    head, foot = _chrome(rnd, links=200)
+    rows = []
+    for detail_url, holdings in etfs.items():
+        h = holdings[0]
+        direction, _, value = h["change"].partition(" ")
+        path = urlparse(detail_url).path
+        rows.append(
+            f'<tr>\n  <th scope="row" onclick="location.href=\'{esc(path)}\'">{esc(h["name"])}</th>\n'
+            f'  <td>{esc(h["price"])}</td>\n'
+            f'  <td class="up"><span class="blind">{esc(direction)}</span>{esc(value)}</td>\n'
+            f'  <td>{rnd.randint(1, 9999):,}</td>\n</tr>'
+        )
+    doc = (f'<html lang="ko">{head}<div class="finder"><table class="tbl"><thead><tr><th>종목명</th>'
+           f'<th>현재가</th><th>등락</th></tr></thead><tbody>{"".join(rows)}</tbody></table>'
+           f"</div>{foot}</html>")
+    return doc.encode("utf-8")
+
+
+def rise_detail_page(holdings: List[dict], seed: int = 0) -> bytes:
+    """ETF 상세 페이지 (tab3 구성내역 tbody 포함, utf-8 바이트)"""
+    rnd = random.Random(seed)
+    head, foot = _chrome(rnd, links=200)
+    other = "".join(f"<tr><th>{i}</th><td>기타 {i}</td><td>{i * 3}</td></tr>" for i in range(30))
+    rows = "".join(
+        f'<tr>\n  <th scope="row">{esc(h["number"])}</th>\n'
+        f'  <td class="tl"><span>{esc(h["item_name"])}</span></td>\n'
+        f'  <td>{esc(h["item_code"])}</td>\n  <td>{esc(h["base_price"])}</td>\n'
+        f'  <td><em>{esc(h["ratio"])}</em></td>\n  <td>{esc(h["value"])}</td>\n</tr>'
+        for h in holdings
+    )
+    doc = (f'<html lang="ko">{head}<div class="tab_cont"><table class="tbl"><tbody>{other}</tbody></table>'
+           f'<table class="tbl pdf"><thead><tr><th>번호</th><th>종목명</th></tr></thead>'
+           f'<tbody data-class="tab3PdfList">{rows}<tr><td colspan="6">합계</td></tr></tbody></table>'
+           f"</div>{foot}</html>")
+    return doc.encode("utf-8")
+
+
+# =====================================================
+# 파일 저장
+# =====================================================
+def write_fixtures(out_dir: Path = FIXTURE_DIR, seed: int = 0) -> Path:
+    """
+    out_dir/
+      naver_list/   naver_news_list_{date}_s{sec}_p{page}.html (euc-kr)
+      naver_article/{office_id}_{article_id}.html
+      rise_detail/  {idx}.html
+    """
+    news = load_news_sample()
+    for sub in ("naver_list", "naver_article", "rise_detail"):
+        (out_dir / sub).mkdir(parents=True, exist_ok=True)
+
+    date = "20251110"
+    for sec, rows in naver_sections(news).items():
+        for page in range(1, naver_max_page(len(rows)) + 1):
+            path = out_dir / "naver_list" / f"naver_news_list_{date}_s{sec}_p{page}.html"
+            path.write_bytes(naver_list_page(rows, page, seed))
+    for r in news:
+        path = out_dir / "naver_article" / f"{r['office_id']}_{r['article_id']}.html"
+        path.write_bytes(naver_article_page(r, seed))
+    for i, holdings in enumerate(load_holdings_sample().values()):
+        (out_dir / "rise_detail" / f"{i:03d}.html").write_bytes(rise_detail_page(holdings, seed + i))
+    return out_dir
+
+
+if __name__ == "__main__":
+    print(write_fixtures())
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+로컬 BigFinance 모의 서버 (로그인 + 산업 API)
+------------------------------------------------
+- GET  /login  : XSRF-TOKEN 쿠키 발급 + 실제와 같은 형태의 로그인 폼 (Selenium 으로도 로그인 가능)
+- POST /login  : X-XSRF-TOKEN 헤더 · 계정 확인 → SESSION 쿠키 발급 후 / 로 302
+- GET  /api/industry/...             : SESSION 쿠키가 유효할 때만 200, 아니면 401
+  categories / header / companies / chart 응답은 synthetic.make_industry 데이터로 생성
+- 통계: logins / login_pages / api_calls / unauthorized
+ex) server = MockBigFinance(username="u", password="p").start()
+    server.base_url  → "http://127.0.0.1:<port>"
+    server.expire_sessions()  # 서버측 세션 만료 재현
+"""
+
+import json
+import secrets
+import threading
+from collections import defaultdict
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+LOGIN_FORM = """<!DOCTYPE html><html><head><meta charset="utf-8"><title>로그인</title></head><body>
+<form method="post" action="/login">
+  <input type="radio" id="personal-users" name="userType" value="personal" checked>
+  <input type="radio" id="enterprise-users" name="userType" value="enterprise">
+  <input type="text" name="username"><input type="password" name="password">
+  <input type="hidden" name="_csrf" value="{xsrf}">
+  <button type="submit">로그인</button>
+</form></body></html>"""
+
+
+def build_categories(categories_df) -> dict:
+    """flatten_categories 입력과 같은 중첩 구조로 복원"""
+    tree = {}
+    for r in categories_df.to_dict("records"):
+        main = tree.setdefault(r["main_code"], {"code": r["main_code"], "name": r["main_name"], "groups": {}})
+        group = main["groups"].setdefault(r["group_id"], {"groupId": r["group_id"], "groupName": r["group_name"],
+                                                          "subCategories": {}})
+        sub = group["subCategories"].setdefault(r["sub_code"], {
+            "subCode": r["sub_code"], "subName": r["sub_name"], "updateDate": r["update_date"],
+            "industryDataType": r["data_type"], "dataCategories": [],
+        })
+        sub["dataCategories"].append({"dataCode": r["data_code"], "dataName": r["data_name"],
+                                      "lastUpdateDatetime": r["last_update"]})
+    return {"categories": [
+        {**m, "groups": [{**g, "subCategories": list(g["subCategories"].values())}
+                         for g in m["groups"].values()]}
+        for m in tree.values()
+    ]}
+
+
+class MockBigFinance:
+    def __init__(self, username: str = "user@example.com", password: str = "secret",
+                 n_sub: int = 20, per_sub: int = 3, seed: int = 0):
+        from benchmarks.synthetic import load_rise_sample, make_industry
+
+        self.username, self.password = username, password
+        cat, self.headers, self.companies = make_industry(load_rise_sample(), n_sub=n_sub,
+                                                          per_sub=per_sub, seed=seed)
+        self.categories = build_categories(cat)
+        self.sessions = set()
+        self.xsrf = set()
+        self.stats = defaultdict(int)
+        self._lock = threading.Lock()
+        self._server = None
+
+    # -------------------------------------------------
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self) -> "MockBigFinance":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def expire_sessions(self):
+        with self._lock:
+            self.sessions.clear()
+
+    def count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    # -------------------------------------------------
+    def api_response(self, path: str, query: dict):
+        parts = path.strip("/").split("/")        # api / industry / ...
+        if path == "/api/industry/categories":
+            return self.categories
+        if parts[2:4] == ["header", "codes"]:
+            return self.headers.get((int(parts[4]), int(parts[6])), {})
+        if parts[2] == "codes" and parts[-1] == "companies":
+            comps = self.companies.get((int(parts[3]), int(parts[5])), [])
+            return [{"companyCode": c["code"], "companyName": c["name"]} for c in comps]
+        if parts[2:4] == ["chart", "codes"]:
+            code = query.get("dataCode", ["0"])[0]
+            return {"dataCode": code, "series": [{"date": f"2025-11-{d:02d}", "value": d * 1.5}
+                                                 for d in range(1, 11)]}
+        return None
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def cookies(self):
+                c = SimpleCookie(self.headers.get("Cookie", ""))
+                return {k: m.value for k, m in c.items()}
+
+            def send(self, status, body=b"", ctype="application/json", cookies=None, location=None):
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                for k, v in (cookies or {}).items():
+                    self.send_header("Set-Cookie", f"{k}={v}; Path=/")
+                if location:
+                    self.send_header("Location", location)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                u = urlparse(self.path)
+                if u.path == "/login":
+                    mock.count("login_pages")
+                    token = secrets.token_hex(16)
+                    with mock._lock:
+                        mock.xsrf.add(token)
+                    self.send(200, LOGIN_FORM.format(xsrf=token).encode("utf-8"), "text/html; charset=utf-8",
+                              cookies={"XSRF-TOKEN": token})
+                    return
+                if u.path == "/":
+                    self.send(200, b"<html><body>home</body></html>", "text/html")
+                    return
+                if u.path.startswith("/api/"):
+                    mock.count("api_calls")
+                    if self.cookies().get("SESSION") not in mock.sessions:
+                        mock.count("unauthorized")
+                        self.send(401, b'{"error":"unauthorized"}')
+                        return
+                    data = mock.api_response(u.path, parse_qs(u.query))
+                    if data is None:
+                        self.send(404, b"{}")
+                    else:
+                        self.send(200, json.dumps(data, ensure_ascii=False).encode("utf-8"))
+                    return
+                self.send(404, b"")
+
+            def do_POST(self):
+                if urlparse(self.path).path != "/login":
+                    self.send(404, b"")
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode("utf-8")).items()}
+                token = self.headers.get("X-XSRF-TOKEN") or form.get("_csrf")
+                if token not in mock.xsrf or self.cookies().get("XSRF-TOKEN") != token:
+                    self.send(403, b'{"error":"csrf"}')
+                    return
+                if form.get("username") != mock.username or form.get("password") != mock.password:
+                    self.send(401, b'{"error":"bad credentials"}')
+                    return
+                mock.count("logins")
+                sid = secrets.token_hex(16)
+                with mock._lock:
+                    mock.sessions.add(sid)
+                self.send(302, cookies={"SESSION": sid}, location="/")
+
+        return Handler
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    server = MockBigFinance().start()
+    print(f"BASE_URL={server.base_url}  USERNAME={server.username}  PASSWORD={server.password}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
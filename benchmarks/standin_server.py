@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+로컬 stand-in HTTP 서버 (Naver · RISE · BigFinance 대역, 외부 접속 없음)
+------------------------------------------------
+- 한 포트에서 세 사이트 경로를 모두 응답 (경로가 겹치지 않음)
+  · Naver 목록  GET /news/news_list.naver?section_id3=&page=   (euc-kr, fixtures.naver_list_page)
+  · Naver 기사  GET /mnews/article/{office_id}/{article_id}     (fixtures.naver_article_page)
+  · RISE 목록   GET /prod/finder                                (fixtures.rise_finder_page)
+  · RISE 상세   GET /prod/finderDetail/{code}                   (fixtures.rise_detail_page)
+  · BigFinance  /login · /api/industry/...                      (mock_bigfinance 핸들러 그대로)
+- 페이지 내용은 out_sample 기반 (첫 요청 시 생성 후 메모리 캐시)
+- 모든 요청에 지연(latency + 0~jitter 초) 주입, error_rate 확률로 error_status 응답
+- 통계: 경로 종류별 요청 수 · 주입한 오류 수
+ex) server = StandInServer(latency=0.03, error_rate=0.02).start()
+    os.environ["NAVER_BASE_URL"] = server.base_url
+"""
+
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from benchmarks import fixtures
+from benchmarks.mock_bigfinance import MockBigFinance
+
+
+class QuietServer(ThreadingHTTPServer):
+    """클라이언트가 도중에 끊은 연결(강제 종료한 크롤러 등)은 오류 출력 생략"""
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class StandInServer:
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 503, seed: int = 0, bf_subs: int = 60, bf_per_sub: int = 3,
+                 username: str = "bench@example.com", password: str = "pw"):
+        self.latency, self.jitter = latency, jitter
+        self.error_rate, self.error_status = error_rate, error_status
+        self.seed = seed
+        self.bigfinance = MockBigFinance(username=username, password=password,
+                                         n_sub=bf_subs, per_sub=bf_per_sub, seed=seed)
+
+        news = fixtures.load_news_sample()
+        self.sections = fixtures.naver_sections(news)
+        self.articles = {(r["office_id"], r["article_id"]): r for r in news}
+        self.etfs = fixtures.load_holdings_sample()
+        self.details = {urlparse(url).path: rows for url, rows in self.etfs.items()}
+
+        self.stats = defaultdict(int)
+        self._pages = {}
+        self._rnd = random.Random(seed)
+        self._lock = threading.Lock()
+
+    # -------------------------------------------------
+    @property
+    def base_url(self) -> str:
+        return self.bigfinance.base_url
+
+    def start(self) -> "StandInServer":
+        # mock_bigfinance 의 서버 · 핸들러를 이 서버 핸들러로 교체해 재사용
+        mock = self.bigfinance
+        mock._server = QuietServer(("127.0.0.1", 0), self._handler(mock._handler()))
+        mock._server.daemon_threads = True
+        threading.Thread(target=mock._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.bigfinance.stop()
+
+    def count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats.clear()
+
+    # -------------------------------------------------
+    def page(self, key: tuple, render):
+        """렌더링 결과 메모리 캐시 (동시 첫 요청은 중복 렌더링될 수 있으나 결과 동일)"""
+        body = self._pages.get(key)
+        if body is None:
+            body = self._pages[key] = render()
+        return body
+
+    def html_response(self, path: str, query: dict):
+        """(kind, body, content-type) — 대역 대상이 아니면 None"""
+        if path == "/news/news_list.naver":
+            sec = int(query.get("section_id3", ["0"])[0])
+            page = int(query.get("page", ["1"])[0])
+            rows = self.sections.get(sec, [])
+            body = self.page(("list", sec, page), lambda: fixtures.naver_list_page(rows, page, self.seed))
+            return "naver_list", body, "text/html; charset=euc-kr"
+        if path.startswith("/mnews/article/"):
+            oid, aid = path.rstrip("/").split("/")[-2:]
+            row = self.articles.get((oid, aid))
+            if row is None:
+                return "naver_article", None, ""
+            body = self.page(("article", oid, aid), lambda: fixtures.naver_article_page(row, self.seed))
+            return "naver_article", body, "text/html; charset=utf-8"
+        if path == "/prod/finder":
+            body = self.page(("finder",), lambda: fixtures.rise_finder_page(self.etfs, self.seed))
+            return "rise_finder", body, "text/html; charset=utf-8"
+        if path in self.details:
+            body = self.page(("detail", path), lambda: fixtures.rise_detail_page(self.details[path], self.seed))
+            return "rise_detail", body, "text/html; charset=utf-8"
+        return None
+
+    def inject(self) -> bool:
+        """지연 주입 후 이번 요청을 오류로 응답할지 여부"""
+        with self._lock:
+            delay = self.latency + (self._rnd.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = self.error_rate > 0 and self._rnd.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        return fail
+
+    def _handler(self, base):
+        srv = self
+
+        class Handler(base):
+            def do_GET(self):
+                u = urlparse(self.path)
+                kind = srv.html_response(u.path, parse_qs(u.query)) if not u.path.startswith(
+                    ("/api/", "/login")) else None
+                srv.count(kind[0] if kind else ("bigfinance_api" if u.path.startswith("/api/") else "bigfinance"))
+                if srv.inject():
+                    srv.count("injected_errors")
+                    self.send(srv.error_status, b"injected", "text/plain")
+                    return
+                if kind is None:
+                    super().do_GET()
+                elif kind[1] is None:
+                    self.send(404, b"", "text/html")
+                else:
+                    self.send(200, kind[1], kind[2])
+
+            def do_POST(self):
+                srv.count("bigfinance_login")
+                super().do_POST()
+
+        return Handler
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(description="로컬 stand-in 서버 (수동 실행용)")
+    ap.add_argument("--latency", type=float, default=0.03)
+    ap.add_argument("--jitter", type=float, default=0.0)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    args = ap.parse_args()
+    server = StandInServer(args.latency, args.jitter, args.error_rate).start()
+    print(f"NAVER_BASE_URL={server.base_url} NAVER_ARTICLE_BASE_URL={server.base_url} "
+          f"RISE_BASE_URL={server.base_url} BASE_URL={server.base_url} "
+          f"USERNAME={server.bigfinance.username} PASSWORD={server.bigfinance.password}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
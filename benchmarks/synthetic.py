@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+벤치마크용 합성 데이터 생성기
+------------------------------------------------
+- out_sample 의 RISE 구성종목을 씨앗으로 BigFinance 산업 카테고리/기업 목록 생성
+- seed 고정 → 실행마다 동일한 데이터
+"""
+
+import random
+from pathlib import Path
+
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+SAMPLE_DIR = BASE_DIR / "out_sample"
+RISE_SAMPLE = SAMPLE_DIR / "riseETF" / "rise_finder_20251111_with_holdings_flattened.csv"
+BIGRISE_SAMPLE = SAMPLE_DIR / "bigRise" / "bigrise_20251111.csv"
+
+FREQUENCIES = ["DAILY", "WEEKLY", "MONTHLY", "QUARTER", "YEAR"]
+UPDATE_DATES = [None, "", "20251105", "2025-11-10", "2025-10-01", "20250814"]
+
+
+def load_rise_sample() -> pd.DataFrame:
+    return pd.read_csv(RISE_SAMPLE)
+
+
+def make_industry(rise_df: pd.DataFrame, n_sub: int = 300, per_sub: int = 4, seed: int = 0):
+    """
+    (categories_df, cache_header, cache_comp) 반환.
+    categories_df 는 flatten_categories 출력과 같은 컬럼 구성.
+    """
+    rnd = random.Random(seed)
+    holdings = rise_df[["item_name", "item_code"]].dropna().drop_duplicates("item_name")
+    universe = list(holdings.itertuples(index=False, name=None))
+
+    rows, cache_header, cache_comp = [], {}, {}
+    for sub in range(n_sub):
+        main_code, sub_code = sub % 9, sub
+        picks = rnd.sample(universe, min(len(universe), rnd.randint(0, 8)))
+        cache_comp[(main_code, sub_code)] = [
+            {"code": str(code)[3:9] if len(str(code)) == 12 else str(code), "name": name}
+            for name, code in picks
+        ]
+        if rnd.random() < 0.9:
+            cache_header[(main_code, sub_code)] = {
+                "frequency": rnd.choice(FREQUENCIES),
+                "source": f"source-{sub % 13}",
+                "updateDate": rnd.choice(UPDATE_DATES),
+                "unit": rnd.choice([1, 1000, 1000000]),
+            }
+        for d in range(per_sub):
+            rows.append({
+                "main_code": main_code, "main_name": f"main-{main_code}",
+                "group_id": sub % 4, "group_name": f"group-{sub % 4}",
+                "sub_code": sub_code, "sub_name": f"sub-{sub}",
+                "update_date": rnd.choice(UPDATE_DATES),
+                "data_type": "chart", "data_code": d, "data_name": f"data-{d}",
+                "last_update": f"2025-11-{rnd.randint(1, 11):02d}T00:00:00",
+            })
+
+    return pd.DataFrame(rows), cache_header, cache_comp
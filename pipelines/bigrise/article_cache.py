@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Naver 기사 본문 디스크 캐시 (naver_news.py 에서 import)
+------------------------------------------------
+- 키: (office_id, article_id) — 게시 후 본문이 바뀌지 않으므로 재수집 불필요
+- 저장: SQLite 단일 파일, 본문은 zlib 압축 BLOB
+- 정리: 보관 기간(max_age_days) 초과 → 삭제, 용량(max_bytes) 초과 → 오래 안 쓴 순으로 삭제
+- 통계: hits / misses / writes / evicted
+"""
+
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    office_id   TEXT NOT NULL,
+    article_id  TEXT NOT NULL,
+    body        BLOB NOT NULL,
+    size        INTEGER NOT NULL,
+    fetched_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (office_id, article_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_articles_accessed ON articles(accessed_at);
+"""
+
+
+class ArticleCache:
+    """스레드 안전 기사 본문 캐시"""
+
+    def __init__(self, path: Path, max_bytes: int = 512 * 1024 * 1024, max_age_days: float = 180):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+        self.hits = self.misses = self.writes = self.evicted = 0
+
+        self._lock = threading.Lock()
+        # autocommit: 중간에 죽어도 저장된 본문은 남도록
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    # =====================================================
+    # 조회 / 저장
+    # =====================================================
+    def get(self, office_id: str, article_id: str) -> Optional[str]:
+        if not office_id or not article_id:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body FROM articles WHERE office_id=? AND article_id=?",
+                (office_id, article_id),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE articles SET accessed_at=? WHERE office_id=? AND article_id=?",
+                (time.time(), office_id, article_id),
+            )
+            self.hits += 1
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def put(self, office_id: str, article_id: str, text: str):
+        # 빈 본문(수집 실패)은 저장하지 않음 → 다음 실행에서 재시도
+        if not office_id or not article_id or not text:
+            return
+        body = zlib.compress(text.encode("utf-8"), 6)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?, ?)",
+                (office_id, article_id, body, len(body), now, now),
+            )
+            self.writes += 1
+
+    # =====================================================
+    # 정리
+    # =====================================================
+    def evict(self) -> int:
+        """보관 기간 · 용량 기준 정리, 삭제 건수 반환"""
+        removed = 0
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM articles WHERE fetched_at < ?", (time.time() - self.max_age,)
+            )
+            removed += cur.rowcount
+
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM articles").fetchone()[0]
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                rows = self._conn.execute(
+                    "SELECT office_id, article_id, size FROM articles ORDER BY accessed_at"
+                )
+                victims = []
+                for oid, aid, size in rows:
+                    if excess <= 0:
+                        break
+                    victims.append((oid, aid))
+                    excess -= size
+                self._conn.executemany(
+                    "DELETE FROM articles WHERE office_id=? AND article_id=?", victims
+                )
+                removed += len(victims)
+            self.evicted += removed
+        return removed
+
+    # =====================================================
+    # 통계 / 종료
+    # =====================================================
+    def stats(self) -> dict:
+        with self._lock:
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM articles"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits, "misses": self.misses, "writes": self.writes,
+            "evicted": self.evicted, "entries": count, "bytes": size,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
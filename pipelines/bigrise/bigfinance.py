@@ -4,26 +4,33 @@
 BigFinance 산업 카테고리 크롤러 (Prefect 파이프라인 대응 버전)
 ------------------------------------------------
 - 로그인 → 산업 카테고리 수집 → 평탄화 CSV 생성
+- 로그인: 캐시 세션 쿠키(0600) 검증 → requests 폼 POST → Selenium(fallback) 순서
 - header + companies 병합
-- chart 데이터 JSON 저장
+- 기업 long 테이블 저장: industry_companies_YYYYMMDD.csv
+  (main_code, sub_code, data_code, company_code, company_name)
+- 최종 산출물 형식: .env OUTPUT_FORMAT(csv | parquet)
+- chart 데이터: 내용 주소 저장소(out/bigfinance/chart/chart_store.sqlite)에 compact JSON 으로 저장
+  같은 내용은 날짜와 관계없이 1번만 저장, CHART_EXPORT=true 면 기존 JSON 파일 구조로도 내보냄
 - chart 메타 저장: out/bigfinance/chart/chart_manifest.json + chart_index.csv
-
-chart 저장 구조:
+- chart 증분 수집(CHART_SYNC=delta): 직전 chart_index 의 update_date/last_update 와
+  비교해 신규/변경 chart 만 다운로드, 나머지는 index 항목 이월
+- chart 체크포인트: 받은 chart 의 index 항목을 chart_index.journal.jsonl 에 바로 기록,
+  중단 후 재실행(Prefect 재시도 포함) 시 저널에 있는 chart 는 다시 요청하지 않음
+- 스냅샷 전용: API 가 현재 카테고리만 제공 → 오늘 이외의 --date 는 SnapshotOnlyError
+- 성능 지표: login · categories · meta · charts 구간별 HTTP · JSON 파싱 시간 · 행 수 → out/metrics
+
+chart 호환 경로 (CHART_EXPORT=true 일 때 실제 파일 생성):
 out/bigfinance/{data_type}/{main_code}/{group_id}/{sub_code}/{data_code}-{sub_name}-{data_name}.json
 
-chart_index.csv 의 file_path 는 반드시 아래 형태:
+chart_index.csv 의 file_path 는 반드시 아래 형태 (chart_hash 는 저장소 blob 주소):
 ./out/bigfinance/chart/0/2/1/2-글로벌_자동차_판매_국가별_(월)-USA.json
 """
 
-import os, time, json, csv, random, sys, logging
+import argparse, os, json, csv, random, sys, logging
 from datetime import datetime
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 from pathlib import Path
 from dotenv import load_dotenv
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
 import requests
 import pandas as pd
 from tqdm import tqdm
@@ -35,29 +42,55 @@ import urllib3
 # 경로 설정
 # =====================================================
 BASE_DIR = Path(__file__).resolve().parents[2]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from pipelines.bigrise.bigfinance_auth import LoginError, SessionCache, parse_fields, requests_login
+from pipelines.bigrise.chart_store import ChartStore, chart_key, write_json
+from pipelines.bigrise.industry_meta import merge_meta, build_companies_table
+from pipelines.common.http_client import HttpClient
+from pipelines.common.journal import Journal
+from pipelines.common.perf import StageMetrics, Timer
+from pipelines.common.runtime import ensure_dirs, setup_logging, snapshot_date
+from pipelines.common.storage import count_rows, find_table, read_table, table_path, write_table
+
 OUT_DIR = BASE_DIR / "out" / "bigfinance"
 LOG_DIR = BASE_DIR / "logs"
 CHART_META_DIR = OUT_DIR / "chart"
+CHART_INDEX_FILE = CHART_META_DIR / "chart_index.csv"
+CHART_JOURNAL_FILE = CHART_META_DIR / "chart_index.journal.jsonl"   # 수집 중 체크포인트 (완료 시 삭제)
+
+# 과거 날짜 수집 불가 (backfill 에서 snapshot-only 로 표시)
+SNAPSHOT_ONLY = True
+
+
+def categories_csv(date):
+    return OUT_DIR / f"industry_categories_{date}.csv"
+
+
+# 아래 두 경로의 확장자는 .env OUTPUT_FORMAT(csv | parquet) 에 따라 run() 에서 결정
+def meta_base(date):
+    return OUT_DIR / f"industry_categories_{date}_with_meta_companies"
+
+
+def companies_base(date):
+    return OUT_DIR / f"industry_companies_{date}"
+
+
+def find_output(date):
+    """date 의 meta+companies 최종 테이블 (없으면 None)"""
+    return find_table(meta_base(date))
 
-OUT_DIR.mkdir(parents=True, exist_ok=True)
-LOG_DIR.mkdir(parents=True, exist_ok=True)
-CHART_META_DIR.mkdir(parents=True, exist_ok=True)
 
-today = datetime.now().strftime("%Y%m%d")
-CSV_FILE = OUT_DIR / f"industry_categories_{today}.csv"
-OUT_FILE = OUT_DIR / f"industry_categories_{today}_with_meta_companies.csv"
+def cache_artifacts(date):
+    """단계 캐시 검증 대상 (stage_cache): 최종 테이블 + 종목코드 테이블 + chart index"""
+    return [find_output(date), find_table(companies_base(date)),
+            CHART_INDEX_FILE if CHART_INDEX_FILE.exists() else None]
 
 
 # =====================================================
-# 로깅
+# 로깅 (핸들러는 실행 시점에 setup_logging 으로 연결)
 # =====================================================
-log_path = LOG_DIR / f"bigfinance_{today}.log"
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[logging.FileHandler(log_path, encoding="utf-8"),
-              logging.StreamHandler(sys.stdout)],
-)
 log = logging.getLogger(__name__)
 
 
@@ -73,39 +106,69 @@ PASSWORD = os.getenv("PASSWORD")
 LOGIN_PAGE = os.getenv("LOGIN_PAGE", "/login")
 HEADLESS = os.getenv("HEADLESS", "false").lower() in ("1", "true", "yes")
 KEEP_TEMP = os.getenv("KEEP_TEMP", "false").lower() in ("1", "true", "yes")
+CHART_SYNC = os.getenv("CHART_SYNC", "delta").lower()   # delta | full
+CHART_STORE_PATH = Path(os.getenv("CHART_STORE_PATH", CHART_META_DIR / "chart_store.sqlite"))
+# 기존 chart JSON 파일 구조로도 내보낼지 (외부 소비자 호환용)
+CHART_EXPORT = os.getenv("CHART_EXPORT", "true").lower() in ("1", "true", "yes")
+
+# 로그인: auto(캐시 → requests 폼 POST → Selenium) | requests | selenium
+BIGFINANCE_LOGIN = os.getenv("BIGFINANCE_LOGIN", "auto").lower()
+LOGIN_POST_PATH = os.getenv("LOGIN_POST_PATH", "/login")
+LOGIN_USER_FIELD = os.getenv("LOGIN_USER_FIELD", "username")
+LOGIN_PASS_FIELD = os.getenv("LOGIN_PASS_FIELD", "password")
+LOGIN_EXTRA_FIELDS = parse_fields(os.getenv("LOGIN_EXTRA_FIELDS", ""))
+SESSION_CACHE_PATH = Path(os.getenv("SESSION_CACHE_PATH", BASE_DIR / "cache" / "bigfinance_session.json"))
+SESSION_MAX_HOURS = float(os.getenv("SESSION_MAX_HOURS", "12"))
 
 API_PATH = "/api/industry/categories"
+# 세션 검증용 API (기본은 어차피 첫 요청인 카테고리 API → 검증 응답을 그대로 재사용)
+SESSION_CHECK_PATH = os.getenv("SESSION_CHECK_PATH", API_PATH)
+# API 응답 JSON 디코딩 · 평탄화 누적 시간 (성능 지표용)
+PARSE_TIMER = Timer()
+META_WORKERS = int(os.getenv("BIGFINANCE_META_WORKERS", "4"))     # header+companies 동시 요청 수
+CHART_WORKERS = int(os.getenv("BIGFINANCE_CHART_WORKERS", "6"))   # chart 동시 요청 수
 
 
 # =====================================================
-# Selenium
+# Selenium (fallback 로그인에서만 import · 실행)
 # =====================================================
-chrome_opts = Options()
-if HEADLESS:
-    chrome_opts.add_argument("--headless=new")
-chrome_opts.add_argument("--no-sandbox")
-chrome_opts.add_argument("--disable-gpu")
-chrome_opts.add_argument("--disable-dev-shm-usage")
-chrome_opts.add_argument("--window-size=1280,850")
-chrome_opts.add_argument("--blink-settings=imagesEnabled=false")
-chrome_opts.add_argument("--disable-extensions")
-chrome_opts.add_argument("--disable-blink-features=AutomationControlled")
-chrome_opts.add_argument("--remote-debugging-port=9222")
-
-try:
-    driver = webdriver.Chrome(service=Service(), options=chrome_opts)
-except Exception as e:
-    log.error(f"❌ Chrome 실행 실패: {e}")
-    sys.exit(1)
+def start_chrome():
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
+    chrome_opts = Options()
+    if HEADLESS:
+        chrome_opts.add_argument("--headless=new")
+    chrome_opts.add_argument("--no-sandbox")
+    chrome_opts.add_argument("--disable-gpu")
+    chrome_opts.add_argument("--disable-dev-shm-usage")
+    chrome_opts.add_argument("--window-size=1280,850")
+    chrome_opts.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_opts.add_argument("--disable-extensions")
+    chrome_opts.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_opts.add_argument("--remote-debugging-port=9222")
+
+    try:
+        return webdriver.Chrome(service=Service(), options=chrome_opts)
+    except Exception as e:
+        log.error(f"❌ Chrome 실행 실패: {e}")
+        raise
 
 
 # =====================================================
 # 로그인
 # =====================================================
 def selenium_login(driver):
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
     log.info("[*] 로그인 시도 중...")
-    driver.get(urljoin(BASE_URL, LOGIN_PAGE))
-    time.sleep(2)
+    login_url = urljoin(BASE_URL, LOGIN_PAGE)
+    driver.get(login_url)
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.XPATH, "//input[@type='password']")))
 
     try:
         radio = driver.find_element(By.ID, "enterprise-users")
@@ -120,7 +183,11 @@ def selenium_login(driver):
 
     btn = driver.find_element(By.XPATH, "//button[contains(text(),'로그인')]")
     driver.execute_script("arguments[0].click();", btn)
-    time.sleep(2)
+    try:
+        # 고정 sleep 대신 로그인 페이지를 벗어날 때까지만 대기
+        WebDriverWait(driver, 10).until(lambda d: d.current_url.split("?")[0] != login_url)
+    except TimeoutException:
+        log.warning("⚠️ 로그인 후 페이지 이동 없음 (쿠키 그대로 사용)")
 
     cookies = {c["name"]: c["value"] for c in driver.get_cookies()}
     return cookies
@@ -130,8 +197,8 @@ def selenium_login(driver):
 # Session
 # =====================================================
 def make_requests_session(cookies):
-    sess = requests.Session()
-    sess.headers.update({
+    """로그인 쿠키를 실은 공통 HttpClient (keep-alive 풀 · 재시도 · 통계)"""
+    sess = HttpClient(pool_size=max(META_WORKERS, CHART_WORKERS), headers={
         "accept": "application/json",
         "user-agent": "Mozilla/5.0",
         "origin": BASE_URL,
@@ -139,10 +206,88 @@ def make_requests_session(cookies):
         "x-xsrf-token": cookies.get("XSRF-TOKEN")
     })
     for k, v in cookies.items():
-        sess.cookies.set(k, v, domain="bigfinance.co.kr", path="/")
+        sess.cookies.set(k, v, domain=urlparse(BASE_URL).hostname, path="/")
     return sess
 
 
+def validate_session(sess):
+    """
+    가벼운 API 1회로 세션 유효성 확인. 유효하면 응답 JSON, 아니면 None.
+    (로그인 페이지로 리다이렉트되거나 JSON 이 아니면 만료로 판단)
+    """
+    try:
+        r = sess.get(urljoin(BASE_URL, SESSION_CHECK_PATH), timeout=15, allow_redirects=False)
+    except requests.RequestException as e:
+        log.warning(f"⚠️ 세션 검증 요청 실패: {e}")
+        return None
+    if r.status_code != 200:
+        return None
+    try:
+        return r.json()
+    except ValueError:
+        return None
+
+
+def browser_login():
+    driver = start_chrome()
+    try:
+        return selenium_login(driver)
+    finally:
+        driver.quit()
+        log.info("[*] Chrome 세션 종료")
+
+
+def login_session():
+    """
+    로그인된 HttpClient 와 검증 응답을 반환.
+    캐시 쿠키 → requests 폼 로그인 → Selenium 순서로 시도하고, 성공한 쿠키는 캐시에 저장.
+    """
+    cache = SessionCache(SESSION_CACHE_PATH, BASE_URL, SESSION_MAX_HOURS)
+
+    cookies = cache.load()
+    if cookies:
+        sess = make_requests_session(cookies)
+        checked = validate_session(sess)
+        if checked is not None:
+            log.info("🔑 캐시된 세션 재사용")
+            return sess, checked
+        log.info("🔑 캐시된 세션 만료 → 재로그인")
+        sess.close()
+
+    attempts = {
+        "auto": ["requests", "selenium"],
+        "requests": ["requests"],
+        "selenium": ["selenium"],
+    }.get(BIGFINANCE_LOGIN)
+    if attempts is None:
+        raise ValueError(f"❌ 지원하지 않는 BIGFINANCE_LOGIN: {BIGFINANCE_LOGIN} (auto | requests | selenium)")
+
+    for method in attempts:
+        try:
+            if method == "requests":
+                cookies = requests_login(
+                    BASE_URL, LOGIN_PAGE, LOGIN_POST_PATH, USERNAME, PASSWORD,
+                    user_field=LOGIN_USER_FIELD, pass_field=LOGIN_PASS_FIELD,
+                    extra_fields=LOGIN_EXTRA_FIELDS, headers={"user-agent": "Mozilla/5.0"},
+                )
+            else:
+                cookies = browser_login()
+        except LoginError as e:
+            log.warning(f"⚠️ {method} 로그인 실패: {e}")
+            continue
+
+        sess = make_requests_session(cookies)
+        checked = validate_session(sess)
+        if checked is not None:
+            log.info(f"🔑 {method} 로그인 성공")
+            cache.save(cookies)
+            return sess, checked
+        log.warning(f"⚠️ {method} 로그인 후 세션 검증 실패")
+        sess.close()
+
+    raise LoginError("❌ BigFinance 로그인 실패 (모든 방법 시도)")
+
+
 # =====================================================
 # 산업 카테고리 API
 # =====================================================
@@ -188,15 +333,21 @@ def save_to_csv(rows, out_path):
 # header + companies
 # =====================================================
 def safe_get_json(sess, url):
-    for _ in range(3):
-        try:
-            r = sess.get(url, verify=False, timeout=20)
-            if r.status_code == 200:
-                return r.json()
-        except:
-            pass
-        time.sleep(1)
-    return None
+    """재시도는 HttpClient 정책에 맡기고, 최종 실패만 경고로 남긴다."""
+    try:
+        r = sess.get(url, verify=False, timeout=20)
+    except requests.RequestException as e:
+        log.warning(f"⚠️ 요청 실패: {url} ({e})")
+        return None
+    if r.status_code != 200:
+        log.warning(f"⚠️ HTTP {r.status_code}: {url}")
+        return None
+    try:
+        with PARSE_TIMER.time():
+            return r.json()
+    except ValueError:
+        log.warning(f"⚠️ JSON 파싱 실패: {url}")
+        return None
 
 
 def fetch_header_meta(sess, main_code, sub_code):
@@ -215,7 +366,7 @@ def fetch_companies(sess, main_code, sub_code):
     return []
 
 
-def enrich_with_meta(sess, csv_path, out_path):
+def enrich_with_meta(sess, csv_path, out_path, companies_path=None):
     df = pd.read_csv(csv_path)
     pairs = df.groupby(["main_code", "sub_code"]).size().index.tolist()
 
@@ -226,18 +377,18 @@ def enrich_with_meta(sess, csv_path, out_path):
         cache_header[(a, b)] = fetch_header_meta(sess, a, b)
         cache_comp[(a, b)] = fetch_companies(sess, a, b)
 
-    with ThreadPoolExecutor(max_workers=4) as ex:
+    with ThreadPoolExecutor(max_workers=META_WORKERS) as ex:
         futures = [ex.submit(job, a, b) for (a, b) in pairs]
         for _ in tqdm(as_completed(futures), total=len(futures), ncols=90, desc="header+companies"):
             pass
 
-    for idx, r in df.iterrows():
-        k = (r["main_code"], r["sub_code"])
-        for k2, v2 in cache_header.get(k, {}).items():
-            df.at[idx, k2] = v2
-        df.at[idx, "companies"] = json.dumps(cache_comp.get(k, []), ensure_ascii=False)
+    df = merge_meta(df, cache_header, cache_comp)
+    write_table(df, out_path, schema="industry_meta")
 
-    df.to_csv(out_path, index=False, encoding="utf-8-sig")
+    if companies_path is not None:
+        comp_df = build_companies_table(df, cache_comp)
+        write_table(comp_df, companies_path, schema="industry_companies")
+        log.info(f"🏢 기업 long 테이블 저장 ({len(comp_df)}행) → {companies_path}")
 
 
 # =====================================================
@@ -255,31 +406,25 @@ def sanitize_filename(text):
 # =====================================================
 # chart JSON 다운로드
 # =====================================================
-def fetch_chart_json(sess, main_code, group_id, sub_code,
-                     data_code, data_type, sub_name, data_name):
+def chart_rel_path(main_code, group_id, sub_code, data_code, data_type, sub_name, data_name):
+    """chart_index.csv file_path (기존 JSON 파일 구조 기준 "./out/..." 상대경로)"""
+    out_path = (
+        OUT_DIR / sanitize_filename(data_type) / str(main_code) / str(group_id) / str(sub_code)
+        / f"{data_code}-{sanitize_filename(sub_name)}-{sanitize_filename(data_name)}.json"
+    )
+    return f"./{out_path.relative_to(BASE_DIR)}"
 
+
+def fetch_chart_json(sess, main_code, sub_code, data_code):
+    """chart API 응답 JSON (실패 시 None)"""
     url = f"{BASE_URL}/api/industry/chart/codes/{main_code}/subCodes/{sub_code}?dataCode={data_code}"
 
     try:
         r = sess.get(url, verify=False, timeout=20)
         if r.status_code != 200:
             return None
-
-        data = r.json()
-
-        safe_type = sanitize_filename(data_type)
-        safe_sub = sanitize_filename(sub_name)
-        safe_name = sanitize_filename(data_name)
-
-        out_dir = OUT_DIR / safe_type / str(main_code) / str(group_id) / str(sub_code)
-        out_dir.mkdir(parents=True, exist_ok=True)
-
-        out_path = out_dir / f"{data_code}-{safe_sub}-{safe_name}.json"
-
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-
-        return out_path
+        with PARSE_TIMER.time():
+            return r.json()
 
     except:
         return None
@@ -301,7 +446,7 @@ def build_chart_manifest(items):
 
     # CSV
     pd.DataFrame(items).to_csv(
-        CHART_META_DIR / "chart_index.csv",
+        CHART_INDEX_FILE,
         index=False,
         encoding="utf-8-sig"
     )
@@ -312,80 +457,229 @@ def build_chart_manifest(items):
 # =====================================================
 # chart 병렬 다운로드
 # =====================================================
-def download_all_charts(sess, csv_path, max_workers=6):
-    df = pd.read_csv(csv_path)
+CHART_TASK_COLUMNS = [
+    "main_code", "group_id", "sub_code",
+    "data_code", "data_type",
+    "sub_name", "data_name",
+    "update_date", "last_update"
+]
+CHART_KEY_COLUMNS = ["main_code", "group_id", "sub_code", "data_code"]
+
+
+def _norm(v):
+    return "" if pd.isna(v) else str(v).strip()
+
+
+def load_previous_chart_index():
+    """직전 chart_index.csv → {(main, group, sub, data): row dict}"""
+    if not CHART_INDEX_FILE.exists():
+        return {}
+    prev = pd.read_csv(CHART_INDEX_FILE, dtype=str, keep_default_na=False)
+    if "last_update" not in prev.columns:
+        # 예전 형식 index 는 변경 여부를 알 수 없으므로 전체 재수집
+        return {}
+    return {
+        tuple(r[c] for c in CHART_KEY_COLUMNS): r
+        for r in prev.to_dict("records")
+    }
+
+
+def carry_over_chart(store, prev_item, update_date, last_update):
+    """
+    update_date / last_update 가 같으면 재수집 없이 이전 chart 를 유지하고 chart_hash 반환.
+    저장소에 없으면(저장소 도입 전 index) 남아 있는 JSON 파일을 가져옴. 유지 불가 시 None.
+    """
+    if prev_item is None:
+        return None
+    if _norm(prev_item.get("last_update")) != _norm(last_update):
+        return None
+    if _norm(prev_item.get("update_date")) != _norm(update_date):
+        return None
+    key = chart_key(*(prev_item[c] for c in CHART_KEY_COLUMNS))
+    entry = store.entry(key)
+    if entry:
+        return entry[0]
+    rel = prev_item.get("file_path", "")
+    path = BASE_DIR / rel.replace("./", "", 1)
+    if rel and path.exists():
+        return store.import_file(key, path, rel)
+    return None
 
-    tasks = []
-    for _, r in df.iterrows():
-        tasks.append((
-            r["main_code"], r["group_id"], r["sub_code"],
-            r["data_code"], r["data_type"],
-            r["sub_name"], r["data_name"],
-            r["update_date"]
-        ))
 
-    index_items = []
+def export_chart(store, digest, rel_path):
+    """CHART_EXPORT=true 일 때 유지 chart 의 기존 구조 JSON 파일이 없으면 저장소에서 복원"""
+    path = BASE_DIR / rel_path.replace("./", "", 1)
+    if not path.exists():
+        store.export(digest, path)
+
+
+def chart_item_key(item):
+    """chart_index 항목 / 작업 tuple 공용 저널 키 (main/group/sub/data)"""
+    values = (item[c] for c in CHART_KEY_COLUMNS) if isinstance(item, dict) else item[:4]
+    return "/".join(_norm(v) for v in values)
+
+
+def resume_chart(store, journal, t):
+    """
+    이전 실행이 저널에 남긴 항목이 같은 update_date/last_update 이고 저장소 hash 도 그대로면 True
+    (중단 후 재실행 시 이미 받은 chart 는 다시 요청하지 않음)
+    """
+    item = journal.get(chart_item_key(t))
+    if item is None:
+        return False
+    if (_norm(item["update_date"]), _norm(item["last_update"])) != (_norm(t[7]), _norm(t[8])):
+        return False
+    entry = store.entry(chart_key(*t[:4]))
+    return entry is not None and entry[0] == item["chart_hash"]
+
+
+def download_all_charts(sess, table_file, max_workers=CHART_WORKERS, sync_mode=None):
+    """
+    sync_mode = "delta" : 직전 chart_index 와 비교해 신규/변경 chart 만 수집 (기본)
+    sync_mode = "full"  : 전체 재수집
+    완료한 chart_index 항목은 저널(chart_index.journal.jsonl)에 바로 기록 →
+    중간에 실패해도 같은 입력 테이블로 재실행하면 저널에 있는 chart 는 건너뜀
+    """
+    sync_mode = (sync_mode or CHART_SYNC).lower()
+    df = read_table(
+        table_file, columns=CHART_TASK_COLUMNS,
+        dtype={"update_date": str, "last_update": str},
+    ).reindex(columns=CHART_TASK_COLUMNS)
+    all_tasks = list(df.itertuples(index=False, name=None))
+
+    store = ChartStore(CHART_STORE_PATH)
+    journal = Journal(CHART_JOURNAL_FILE, key=chart_item_key,
+                      meta={"table": Path(table_file).name, "sync": sync_mode})
+    tasks = [t for t in all_tasks if not resume_chart(store, journal, t)]
+    if journal.resumed:
+        log.info(f"♻️ chart 저널 재개: {len(all_tasks) - len(tasks)}개 완료분 유지")
+
+    # 변경 없는 chart 는 이전 manifest 항목을 그대로 이어받음
+    prev_index = load_previous_chart_index() if sync_mode == "delta" else {}
+    if prev_index:
+        pending = []
+        for t in tasks:
+            key = tuple(_norm(v) for v in t[:4])
+            prev_item = prev_index.get(key)
+            digest = carry_over_chart(store, prev_item, t[7], t[8])
+            if digest:
+                journal.append(chart_index_item(t, prev_item["file_path"], digest))
+                if CHART_EXPORT:
+                    export_chart(store, digest, prev_item["file_path"])
+            else:
+                pending.append(t)
+        log.info(f"🔄 chart delta sync: 변경/신규 {len(pending)}개, 유지 {len(tasks) - len(pending)}개")
+        tasks = pending
 
     def work(t):
         (main_code, group_id, sub_code,
          data_code, data_type,
          sub_name, data_name,
-         update_date) = t
-
-        out_path = fetch_chart_json(
-            sess, main_code, group_id, sub_code,
-            data_code, data_type, sub_name, data_name
-        )
-
-        if out_path:
-            # 상대경로 변환 (핵심!)
-            rel_path = f"./{out_path.relative_to(BASE_DIR)}"
-
-            index_items.append({
-                "data_type": data_type,
-                "main_code": main_code,
-                "group_id": group_id,
-                "sub_code": sub_code,
-                "data_code": data_code,
-                "sub_name": sanitize_filename(sub_name),
-                "data_name": sanitize_filename(data_name),
-                "file_path": rel_path,
-                "update_date": update_date
-            })
-
-    with ThreadPoolExecutor(max_workers=max_workers) as ex:
-        futures = [ex.submit(work, t) for t in tasks]
-        for _ in tqdm(as_completed(futures), total=len(futures), ncols=90, desc="chart 수집"):
-            pass
+         update_date, last_update) = t
 
-    build_chart_manifest(index_items)
+        data = fetch_chart_json(sess, main_code, sub_code, data_code)
+        if data is None:
+            return
 
+        # 상대경로 변환 (핵심!)
+        rel_path = chart_rel_path(main_code, group_id, sub_code, data_code, data_type, sub_name, data_name)
+        digest = store.put(chart_key(main_code, group_id, sub_code, data_code), data, rel_path)
+        if CHART_EXPORT:
+            write_json(BASE_DIR / rel_path.replace("./", "", 1), data)
+        journal.append(chart_index_item(t, rel_path, digest))
 
-# =====================================================
-# main
-# =====================================================
-def main():
     try:
-        cookies = selenium_login(driver)
-        sess = make_requests_session(cookies)
-
-        data = fetch_api(sess, API_PATH)
-        rows = flatten_categories(data)
-        save_to_csv(rows, CSV_FILE)
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            futures = [ex.submit(work, t) for t in tasks]
+            for _ in tqdm(as_completed(futures), total=len(futures), ncols=90, desc="chart 수집"):
+                pass
+
+        # 입력 순서대로 index 구성 (받지 못한 chart 는 제외)
+        index_items = [journal.get(k) for k in map(chart_item_key, all_tasks) if k in journal]
+        build_chart_manifest(index_items)
+        journal.remove()
+        removed = store.gc()
+        log.info(f"🗄️ chart 저장소 {store.stats()} (미참조 blob {removed}개 정리)")
+    finally:
+        journal.close()
+        store.close()
+    return len(index_items)
+
+
+def chart_index_item(t, rel_path, digest):
+    (main_code, group_id, sub_code,
+     data_code, data_type,
+     sub_name, data_name,
+     update_date, last_update) = t
+    return {
+        "data_type": data_type,
+        "main_code": main_code,
+        "group_id": group_id,
+        "sub_code": sub_code,
+        "data_code": data_code,
+        "sub_name": sanitize_filename(sub_name),
+        "data_name": sanitize_filename(data_name),
+        "file_path": rel_path,
+        "chart_hash": digest,
+        "update_date": update_date,
+        "last_update": last_update
+    }
 
-        enrich_with_meta(sess, CSV_FILE, OUT_FILE)
 
-        download_all_charts(sess, OUT_FILE, max_workers=6)
+# =====================================================
+# 전체 실행
+# =====================================================
+def run(sync_mode=None, target_date=None):
+    """
+    BigFinance 수집 전체 실행 (스크립트 / in-process Prefect task 공용).
+    meta+companies 최종 테이블 경로 반환. 오류는 호출자에게 전달.
+    target_date 는 오늘만 허용 (스냅샷 전용).
+    """
+    date = snapshot_date("bigfinance", target_date)
+    csv_file = categories_csv(date)
+    ensure_dirs(OUT_DIR, CHART_META_DIR)
+    perf = StageMetrics("bigfinance", date, parse=PARSE_TIMER)
+    with perf.phase("login"):
+        sess, checked = login_session()
+    perf.client = sess     # 이후 구간은 로그인 세션의 HTTP 통계 포함
+
+    with perf.phase("categories") as p:
+        data = checked if SESSION_CHECK_PATH == API_PATH else fetch_api(sess, API_PATH)
+        with PARSE_TIMER.time():
+            rows = flatten_categories(data)
+        save_to_csv(rows, csv_file)
+        p["rows"] = len(rows)
+
+    out_file = table_path(meta_base(date))
+    with perf.phase("meta") as p:
+        enrich_with_meta(sess, csv_file, out_file, table_path(companies_base(date)))
+        p["rows"] = count_rows(out_file)
+
+    with perf.phase("charts") as p:
+        p["rows"] = download_all_charts(sess, out_file, max_workers=CHART_WORKERS, sync_mode=sync_mode)
+    log.info(f"🌐 HTTP {sess.metrics.summary()}")
+    log.info(f"🚦 {sess.rate_summary()}")
+    log.info(f"⏱️ 성능 지표 → {perf.save()}")
+
+    if not KEEP_TEMP and csv_file.exists():
+        csv_file.unlink()
+    return out_file
 
-        if not KEEP_TEMP and CSV_FILE.exists():
-            CSV_FILE.unlink()
 
+# =====================================================
+# main
+# =====================================================
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--date", type=str, default=None, help="YYYYMMDD (스냅샷 전용: 오늘만 가능)")
+    parser.add_argument("--sync", choices=["delta", "full"], default=None, help="chart 수집 방식 (기본 CHART_SYNC)")
+    args = parser.parse_args()
+    setup_logging("bigfinance", LOG_DIR)
+    try:
+        run(sync_mode=args.sync, target_date=args.date)
     except Exception as e:
         log.exception(f"❌ 오류 발생: {e}")
-
-    finally:
-        driver.quit()
-        log.info("[*] Chrome 세션 종료")
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BigFinance 로그인 세션 관리 (bigfinance.py 에서 import)
+------------------------------------------------
+- 세션 쿠키(XSRF-TOKEN 포함) 로컬 캐시: 소유자만 읽기/쓰기(0600) JSON, 보관 시간 제한
+  권한이 열려 있는 캐시 파일은 사용하지 않음
+- requests 만으로 로그인: 로그인 페이지 GET(XSRF-TOKEN 발급) → 폼 POST 재현
+- Selenium 로그인은 bigfinance.py 에서 위 두 방법이 실패했을 때만 사용
+"""
+
+import json
+import logging
+import os
+import stat
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urljoin
+
+import requests
+
+from pipelines.common.http_client import HttpClient
+
+log = logging.getLogger(__name__)
+
+
+class LoginError(RuntimeError):
+    """requests 폼 로그인 실패"""
+
+
+# =====================================================
+# 쿠키 캐시
+# =====================================================
+class SessionCache:
+    """
+    {"saved_at": epoch, "base_url": ..., "cookies": {name: value}} 를 0600 파일로 저장.
+    base_url 이 다르거나 max_age 를 넘긴 캐시는 무시.
+    """
+
+    def __init__(self, path: Path, base_url: str, max_age_hours: float = 12):
+        self.path = Path(path)
+        self.base_url = base_url
+        self.max_age = max_age_hours * 3600
+
+    def load(self) -> Optional[Dict[str, str]]:
+        if not self.path.exists():
+            return None
+        mode = stat.S_IMODE(self.path.stat().st_mode)
+        if mode & (stat.S_IRWXG | stat.S_IRWXO):
+            log.warning(f"⚠️ 세션 캐시 권한이 열려 있어 사용하지 않음 ({oct(mode)}): {self.path}")
+            return None
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            log.warning(f"⚠️ 세션 캐시 로드 실패: {e}")
+            return None
+        if data.get("base_url") != self.base_url:
+            return None
+        if time.time() - float(data.get("saved_at", 0)) > self.max_age:
+            log.info("⌛ 세션 캐시 만료")
+            return None
+        return data.get("cookies") or None
+
+    def save(self, cookies: Dict[str, str]):
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        payload = json.dumps({"saved_at": time.time(), "base_url": self.base_url, "cookies": cookies},
+                             ensure_ascii=False)
+        tmp = self.path.with_suffix(".tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.chmod(tmp, 0o600)          # 기존 tmp 가 남아 있던 경우에도 권한 보장
+        os.replace(tmp, self.path)
+
+    def clear(self):
+        if self.path.exists():
+            self.path.unlink()
+
+
+# =====================================================
+# requests 폼 로그인
+# =====================================================
+def requests_login(base_url: str, login_page: str, post_path: str, username: str, password: str,
+                   user_field: str = "username", pass_field: str = "password",
+                   extra_fields: Optional[Dict[str, str]] = None, headers: Optional[dict] = None,
+                   timeout=(5, 15)) -> Dict[str, str]:
+    """
+    브라우저 로그인 폼 제출을 requests 로 재현하고 로그인 후 쿠키를 반환.
+    XSRF-TOKEN 쿠키가 있으면 X-XSRF-TOKEN 헤더로 함께 전송.
+    """
+    if not username or not password:
+        raise LoginError("USERNAME / PASSWORD 미설정")
+
+    client = HttpClient(pool_size=1, headers=headers, retries=1, timeout=timeout)
+    try:
+        page = client.get(urljoin(base_url, login_page))
+        if page.status_code >= 400:
+            raise LoginError(f"로그인 페이지 HTTP {page.status_code}")
+
+        xsrf = client.cookies.get("XSRF-TOKEN")
+        form = {user_field: username, pass_field: password, **(extra_fields or {})}
+        r = client.post(
+            urljoin(base_url, post_path),
+            data=form,
+            headers={"X-XSRF-TOKEN": xsrf, "Referer": page.url} if xsrf else {"Referer": page.url},
+        )
+        if r.status_code >= 400:
+            raise LoginError(f"로그인 POST HTTP {r.status_code}")
+        return client.cookies.get_dict()
+    except requests.RequestException as e:
+        # 연결 오류 · 타임아웃 · 재시도 소진도 로그인 실패로 (auto 모드 Selenium fallback 대상)
+        raise LoginError(f"로그인 요청 실패: {e}") from e
+    finally:
+        client.close()
+
+
+def parse_fields(spec: str) -> Dict[str, str]:
+    """'userType=enterprise&remember=on' → dict (빈 문자열이면 {})"""
+    out = {}
+    for part in filter(None, (spec or "").split("&")):
+        k, _, v = part.partition("=")
+        out[k.strip()] = v.strip()
+    return out
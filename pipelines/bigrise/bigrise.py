@@ -3,73 +3,136 @@
 """
 BigRise 종합 파이프라인 (Prefect Orion 통합 버전)
 ------------------------------------------------
-① Naver 뉴스 → ② RISE ETF → ③ BigFinance → ④ ETF–산업 매칭
+① Naver 뉴스 → ② RISE ETF → ③ BigFinance → ④ ETF–산업 매칭 → ⑤ 로컬 분석 DB 적재
++ 장중 Naver 뉴스 증분 수집 (naver_intraday_pipeline)
++ 기간 backfill (bigrise_backfill)
++ 실행마다 단계별 성능 지표 → out/metrics/<flow>_<시각>/run_report.json + Prefect artifact
++ 단계 실행 순서는 산출물 의존성(PIPELINE_STAGES) 기준: 입력 산출물이 준비되는 즉시 시작, 실행마다 critical path 보고
 """
 
+import importlib
+import os
+import time
 from prefect import flow, get_run_logger
 from prefect.context import get_run_context
+from prefect.futures import as_completed
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
-from pipelines.common.tasks import run_script, notify
+from dotenv import load_dotenv
+from pipelines.common.dag import Stage, critical_path, submit_all, topo_order, upstream
+from pipelines.common.perf import new_run_dir
+from pipelines.common.tasks import notify, publish_perf_report, run_script, run_stage, task_run_times
 
 BASE_DIR = Path(__file__).resolve().parent
+RUN_MODES = ("inprocess", "subprocess")
+KST = timezone(timedelta(hours=9))
+
+# =====================================================
+# 단계 · 산출물 의존성 (실행 순서는 dag.topo_order 가 결정)
+# =====================================================
+# 각 단계는 읽는 산출물(consumes)의 생산 단계만 기다림
+#   → 매칭(bigrise_pre)은 Naver 본문 수집을 기다리지 않고 RISE · BigFinance 가 끝나는 즉시 시작
+# produces 첫 항목 = run() 반환 경로, args = in-process 모드에서 run() 인자로 넘기는 산출물
+PIPELINE_STAGES = [
+    Stage("naver_news", "pipelines.bigrise.naver_news", "naver_news", "naver_news.py",
+          produces=["naver"], dated=True),
+    Stage("riseetf", "pipelines.bigrise.riseetf", "riseetf", "riseetf.py",
+          produces=["rise"]),
+    Stage("bigfinance", "pipelines.bigrise.bigfinance", "bigfinance", "bigfinance.py",
+          produces=["industry", "companies", "chart_index"]),
+    Stage("bigrise_pre", "pipelines.bigrise.bigrise_pre", "bigrise", "bigrise_pre.py",
+          consumes=["rise", "industry", "companies", "chart_index"], produces=["bigrise"],
+          args={"rise_path": "rise", "industry_path": "industry"}),
+    Stage("warehouse", "pipelines.bigrise.warehouse", "warehouse", "warehouse.py",
+          consumes=["naver", "rise", "industry", "companies", "bigrise"], produces=["warehouse"],
+          args={"naver_path": "naver", "rise_path": "rise", "industry_path": "industry", "bigrise_path": "bigrise"},
+          dated=True, cache=False),
+]
 
 
 @flow(name="BigRise Pipeline", log_prints=True)
-def bigrise_pipeline(target_date: Optional[str] = None):
+def bigrise_pipeline(target_date: Optional[str] = None, run_mode: Optional[str] = None,
+                     force_refresh: bool = False):
     """
     BigRise 메인 파이프라인 (Prefect 3.6)
     ------------------------------------------------
     Args:
         target_date (str, optional): YYYYMMDD 형식의 기준일.
             - 미지정 시 Flow 실행 기준일의 '전일'로 자동 설정됨.
+        run_mode (str, optional): 단계 실행 방식 (미지정 시 .env PIPELINE_RUN_MODE, 기본 inprocess)
+            - inprocess : 각 스크립트의 run() 을 Prefect Task 로 직접 호출, 결과 경로를 다음 단계로 전달
+            - subprocess: 기존 방식 (스크립트마다 python3 프로세스 실행)
+        force_refresh (bool): 단계 캐시 무시하고 전 단계 재실행
+            - 기본은 같은 조건(코드 · 인자 · 기준일 · 입력)으로 이미 만든 산출물이 검증(존재 · 행 수 · checksum)을
+              통과하면 해당 단계 건너뜀 → flow 재시도 시 수집 단계는 다시 크롤링하지 않음
     """
     logger = get_run_logger()
     logger.info("🧭 BigRise 파이프라인 시작")
 
-    KST = timezone(timedelta(hours=9))
+    load_dotenv()
+    run_mode = (run_mode or os.getenv("PIPELINE_RUN_MODE", "inprocess")).lower()
+    if run_mode not in RUN_MODES:
+        raise ValueError(f"❌ 지원하지 않는 run_mode: {run_mode} (inprocess | subprocess)")
 
     # Prefect Context 기반 기준일 계산
+    # Prefect UTC context는 참고만 하고, 실제 기준은 현지시간 기준으로 계산
+    now_kst = datetime.now(KST)
+    run_date = now_kst.strftime("%Y%m%d")
     if target_date is None or not isinstance(target_date, str):
-        # Prefect UTC context는 참고만 하고, 실제 기준은 현지시간 기준으로 계산
-        now_kst = datetime.now(KST)
         target_date = (now_kst - timedelta(days=1)).strftime("%Y%m%d")
-        run_date = now_kst.strftime("%Y%m%d")
 
-    # ① Naver 뉴스 수집
-    logger.info(f"📰 Target 수집 시작 📅 기준일: {run_date}")
+    logger.info(f"📰 Target 수집 시작 📅 기준일: {run_date} (실행 방식: {run_mode}, force_refresh={force_refresh})")
     logger.info(f"📰 Naver 뉴스 수집 시작 📅 기준일: {target_date}")
-    naver_fut = run_script.submit(BASE_DIR / "naver_news.py", "--date", target_date)
-
-    # ② RISE ETF 수집
     logger.info("📈 RISE ETF 수집 시작")
-    riseetf_fut = run_script.submit(BASE_DIR / "riseetf.py")
-
-    # ③ BigFinance 산업 데이터 수집
     logger.info("💰 BigFinance 산업 데이터 수집 시작")
-    bigfinance_fut = run_script.submit(BASE_DIR / "bigfinance.py")
-
-    # ④ 종합 매칭 (위 세 작업 완료 후 실행)
     logger.info("🔗 BigRise 산업 매칭 시작")
-    bigrise_pre_fut = run_script.submit(
-        BASE_DIR / "bigrise_pre.py",
-        wait_for=[naver_fut, riseetf_fut, bigfinance_fut],
-    )
+    ups = upstream(PIPELINE_STAGES)
+    logger.info("🔗 단계 의존성: " + ", ".join(f"{n} ← {'+'.join(u) or '-'}" for n, u in ups.items()))
+
+    # 단계별 성능 지표 JSON 저장 폴더 (이번 실행 전용)
+    perf_dir = str(new_run_dir("bigrise"))
+
+    def submit(stage, deps):
+        # 읽는 산출물의 생산 단계만 기다림 (in-process 는 그 반환 경로를 인자로 전달)
+        wait_for = list({id(f): f for f in deps.values()}.values())
+        # 수집 · 매칭 단계는 결과 캐시 사용 (warehouse 적재는 분할 교체라 매번 실행)
+        opts = {"perf_dir": perf_dir, "cache": stage.cache, "force": force_refresh, "wait_for": wait_for}
+        if run_mode == "inprocess":
+            # 스냅샷 단계(RISE · BigFinance · 매칭)는 날짜 미지정 = 실행 시점 오늘 파일
+            args = (target_date,) if stage.dated else ()
+            kwargs = {k: deps[a] for k, a in stage.args.items()}
+            return run_stage.with_options(name=stage.name).submit(
+                stage.module, stage.log_name, *args, **kwargs, **opts)
+        args = ("--date", target_date) if stage.dated else ()
+        return run_script.with_options(name=stage.name).submit(BASE_DIR / stage.script, *args, **opts)
+
+    futs = submit_all(PIPELINE_STAGES, submit)
 
     # 완료 알림
     notify.submit(
         f"🎯 BigRise 파이프라인 완료 ({target_date})",
-        wait_for=[bigrise_pre_fut],
+        wait_for=[futs["warehouse"]],
     )
 
+    # critical path (일부 단계가 실패해도 실행된 단계까지)
+    for fut in futs.values():
+        fut.wait()
+    path_report = None
+    try:
+        path_report = critical_path(PIPELINE_STAGES, task_run_times(futs))
+        logger.info(f"🛤️ critical path: {' → '.join(path_report['path'])} (총 {path_report['total_s']}s)")
+    except Exception as e:
+        logger.warning(f"⚠️ critical path 계산 실패: {e}")
+
+    # 성능 리포트 (일부 단계가 실패해도 기록된 단계까지 게시)
+    publish_perf_report.submit(
+        perf_dir, target_date=target_date, run_mode=run_mode, force_refresh=force_refresh,
+        critical_path=path_report,
+    ).wait()
+
     # 결과 확인 및 실패 감지
-    results = [
-        naver_fut.result(),
-        riseetf_fut.result(),
-        bigfinance_fut.result(),
-        bigrise_pre_fut.result(),
-    ]
+    results = [futs[stage.name].result() for stage in PIPELINE_STAGES]
     if any(r is None for r in results):
         raise RuntimeError("❌ 일부 Task가 실패했습니다.")
 
@@ -77,5 +140,159 @@ def bigrise_pipeline(target_date: Optional[str] = None):
     return target_date
 
 
+@flow(name="Naver Intraday Pipeline", log_prints=True)
+def naver_intraday_pipeline(target_date: Optional[str] = None):
+    """
+    장중 Naver 뉴스 증분 수집 (naver_news.run(mode="incremental"), 10분 주기라 in-process 실행)
+    ------------------------------------------------
+    Args:
+        target_date (str, optional): YYYYMMDD 형식의 기준일. 미지정 시 당일(KST).
+    """
+    logger = get_run_logger()
+    if target_date is None or not isinstance(target_date, str):
+        target_date = datetime.now(KST).strftime("%Y%m%d")
+
+    logger.info(f"📡 Naver 뉴스 증분 수집 📅 기준일: {target_date}")
+    run_stage.with_options(name="naver_news_incremental")(
+        "pipelines.bigrise.naver_news", "naver_news", target_date, mode="incremental")
+    return target_date
+
+
+
+# =====================================================
+# 기간 backfill
+# =====================================================
+# (단계, 모듈, 로그 이름) — 실행 순서
+BACKFILL_STAGES = [(s.name, s.module, s.log_name) for s in topo_order(PIPELINE_STAGES)]
+# Prefect 태그 동시 실행 제한용 (여러 backfill/재실행 flow 간 전역 예산)
+#   prefect concurrency-limit create bigrise-backfill 4
+BACKFILL_TAG = "bigrise-backfill"
+
+
+def date_range(start_date: str, end_date: str) -> list:
+    start = datetime.strptime(start_date, "%Y%m%d")
+    end = datetime.strptime(end_date, "%Y%m%d")
+    if end < start:
+        raise ValueError(f"❌ end_date({end_date}) 가 start_date({start_date}) 보다 이전")
+    return [(start + timedelta(days=i)).strftime("%Y%m%d") for i in range((end - start).days + 1)]
+
+
+def plan_backfill_date(date: str, force: bool = False) -> dict:
+    """
+    날짜별 단계 계획 {stage: action}
+      run           : 실행
+      exists        : 산출물 있음 (force=True 면 재실행, 단 스냅샷 전용 단계의 과거 날짜 제외)
+      snapshot-only : 과거 날짜 수집 불가 (RISE · BigFinance 는 현재 시점만 제공)
+      no-input      : 매칭 입력 스냅샷이 없어 실행 불가
+    스냅샷 단계의 '오늘' 은 각 스크립트와 같은 로컬 시각 기준.
+    """
+    today = time.strftime("%Y%m%d")
+    plan = {}
+    for stage, module, _ in BACKFILL_STAGES:
+        mod = importlib.import_module(module)
+        exists = mod.find_output(date) is not None
+        if getattr(mod, "SNAPSHOT_ONLY", False) and date != today:
+            plan[stage] = "exists" if exists else "snapshot-only"
+        elif exists and not force:
+            plan[stage] = "exists"
+        else:
+            plan[stage] = "run"
+
+    if plan["bigrise_pre"] == "run" and any(plan[s] == "snapshot-only" for s in ("riseetf", "bigfinance")):
+        plan["bigrise_pre"] = "no-input"
+    # 앞 단계가 산출물을 새로 만들면 해당 날짜 분할 재적재
+    if any(plan[s] == "run" for s, _, _ in BACKFILL_STAGES[:-1]):
+        plan["warehouse"] = "run"
+    return plan
+
+
+def submit_backfill_date(date: str, plan: dict, perf_dir: Optional[str] = None) -> dict:
+    """plan 의 run 단계를 in-process Task 로 제출 → {stage: future} (warehouse 가 마지막)"""
+    modules = {stage: (module, log_name) for stage, module, log_name in BACKFILL_STAGES}
+    futs = {}
+
+    def submit(stage, *args, wait_for=(), **kwargs):
+        module, log_name = modules[stage]
+        futs[stage] = run_stage.with_options(name=f"{stage}-{date}", tags=[BACKFILL_TAG]).submit(
+            module, log_name, *args, perf_dir=perf_dir, wait_for=list(wait_for), **kwargs)
+
+    if plan["naver_news"] == "run":
+        submit("naver_news", date)
+    for stage in ("riseetf", "bigfinance"):
+        if plan[stage] == "run":
+            submit(stage, target_date=date)
+    if plan["bigrise_pre"] == "run":
+        submit("bigrise_pre", target_date=date,
+               wait_for=[futs[s] for s in ("riseetf", "bigfinance") if s in futs])
+    if plan["warehouse"] == "run":
+        submit("warehouse", date, snapshot_date=date, wait_for=list(futs.values()))
+    return futs
+
+
+def backfill_report(plans: dict) -> str:
+    stages = [s for s, _, _ in BACKFILL_STAGES]
+    lines = ["| date | " + " | ".join(stages) + " |", "|" + "---|" * (len(stages) + 1)]
+    for date, plan in plans.items():
+        lines.append(f"| {date} | " + " | ".join(plan[s] for s in stages) + " |")
+    return "\n".join(lines)
+
+
+@flow(name="BigRise Backfill", log_prints=True)
+def bigrise_backfill(start_date: str, end_date: Optional[str] = None,
+                     max_concurrency: Optional[int] = None, force: bool = False):
+    """
+    기간 backfill (in-process 실행)
+    ------------------------------------------------
+    Args:
+        start_date (str): YYYYMMDD 시작일
+        end_date (str, optional): YYYYMMDD 종료일 (포함, 미지정 시 start_date 하루)
+        max_concurrency (int, optional): 동시에 진행할 날짜 수 (미지정 시 .env BACKFILL_CONCURRENCY, 기본 3)
+        force (bool): 산출물이 있어도 재실행
+    - 날짜마다 산출물이 이미 있는 단계는 건너뜀
+    - Naver 만 과거 날짜 수집 가능, RISE · BigFinance 는 스냅샷 전용 (오늘 날짜만 수집)
+      과거 날짜의 매칭 · 적재는 그 날짜에 저장해 둔 스냅샷이 있을 때만 수행
+    - 결과: 날짜 × 단계 상태표 (run → done | failed | upstream-failed)
+    """
+    logger = get_run_logger()
+    load_dotenv()
+    limit = max(1, max_concurrency or int(os.getenv("BACKFILL_CONCURRENCY", "3")))
+    dates = date_range(start_date, end_date or start_date)
+    logger.info(f"🗓️ backfill {dates[0]} ~ {dates[-1]} ({len(dates)}일, 동시 {limit}일, force={force})")
+
+    perf_dir = str(new_run_dir("bigrise_backfill"))
+    plans, futures, inflight = {}, {}, []
+    for date in dates:
+        plan = plans[date] = plan_backfill_date(date, force)
+        if "run" not in plan.values():
+            logger.info(f"⏭️ {date}: 실행할 단계 없음 {plan}")
+            continue
+        for stage, action in plan.items():
+            if action in ("snapshot-only", "no-input"):
+                logger.warning(f"📸 {date} {stage}: {action} (과거 날짜 수집 불가)")
+
+        # 진행 중인 날짜가 limit 개면 하나가 끝날 때까지 대기
+        while len(inflight) >= limit:
+            inflight.remove(next(as_completed(inflight)))
+        futures[date] = submit_backfill_date(date, plan, perf_dir)
+        inflight.append(futures[date]["warehouse"])
+
+    failed = []
+    for date, futs in futures.items():
+        for stage, fut in futs.items():
+            fut.wait()
+            state = fut.state
+            if state.is_completed():
+                plans[date][stage] = "done"
+            else:
+                plans[date][stage] = "failed" if state.is_failed() else "upstream-failed"
+                failed.append(f"{date}:{stage}")
+
+    logger.info("📋 backfill 결과\n" + backfill_report(plans))
+    publish_perf_report(perf_dir, start_date=dates[0], end_date=dates[-1])
+    if failed:
+        raise RuntimeError(f"❌ 일부 단계 실패: {', '.join(failed)}")
+    return plans
+
+
 if __name__ == "__main__":
     bigrise_pipeline()
@@ -9,228 +9,372 @@ ETF–산업 매칭 스크립트 (Prefect 파이프라인 대응 버전)
       1) industry_update_date_raw
       2) industry_update_date_header
       3) chart_update_date
-- 최근 7일 내 산업 업데이트 ETF 저장
-- 최근 산업 관련 chart JSON도 자동 복사(out/bigRise/recent)
+- 최근 7일 내 산업 업데이트 ETF 저장 (기준: --date, 기본 오늘)
+- 입력 · 출력 파일 날짜: --date (backfill 에서 과거 날짜의 기존 스냅샷 재매칭 가능)
+- 최근 산업 관련 chart JSON 발행(out/bigRise/recent)
+  복사 대신 hardlink(기존 구조 JSON 이 있을 때) 또는 chart 저장소에서 복원,
+  chart 저장소에는 recent_YYYYMMDD ref 로 발행 시점 chart_hash 고정
+- 입력은 csv / parquet 모두 지원 (필요한 컬럼만 로드)
+- 출력 형식: .env OUTPUT_FORMAT(csv | parquet)
+- 성능 지표: load · match · write 구간별 소요시간 · 행 수 → out/metrics
+- 매칭 경로(prepare_industry → match_industry → recent_rows)는 파일 I/O 없는 함수
+  → benchmarks/bench_matching.py 가 합성 데이터 규모별로 같은 함수를 측정
 """
 
 import pandas as pd
 from pathlib import Path
-from tqdm import tqdm
-import logging, sys, time, shutil
+import argparse, logging, os, sys, time
 from datetime import datetime, timedelta
+from dotenv import load_dotenv
 
 
 # =====================================================
 # 경로 설정 (Prefect 환경 호환)
 # =====================================================
 BASE_DIR = Path(__file__).resolve().parents[2]
-OUT_DIR = BASE_DIR / "out"
-LOG_DIR = BASE_DIR / "logs"
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
 
-OUT_DIR.mkdir(parents=True, exist_ok=True)
-LOG_DIR.mkdir(parents=True, exist_ok=True)
+from pipelines.bigrise.chart_store import ChartStore, chart_key, link_or_copy
+from pipelines.bigrise.matching import first_matching_rows, match_by_code
+from pipelines.common.perf import StageMetrics
+from pipelines.common.runtime import ensure_dirs, setup_logging
+from pipelines.common.storage import find_table, read_table, table_path, write_table
 
-today = time.strftime("%Y%m%d")
-LOG_FILE = LOG_DIR / f"bigrise_{today}.log"
+OUT_DIR = BASE_DIR / "out"
+LOG_DIR = BASE_DIR / "logs"
 
 
 # =====================================================
-# 로깅
+# 로깅 (핸들러는 실행 시점에 setup_logging 으로 연결)
 # =====================================================
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[logging.FileHandler(LOG_FILE, encoding="utf-8"),
-              logging.StreamHandler(sys.stdout)],
-)
 log = logging.getLogger(__name__)
 
+load_dotenv()
+
 
 # =====================================================
-# 경로
+# 경로 (입출력 테이블은 확장자 없는 기준 경로, 날짜별)
 # =====================================================
-RISE_PATH = OUT_DIR / "riseETF" / f"rise_finder_{today}_with_holdings_flattened.csv"
-INDUSTRY_PATH = OUT_DIR / "bigfinance" / f"industry_categories_{today}_with_meta_companies.csv"
+def rise_base(date):
+    return OUT_DIR / "riseETF" / f"rise_finder_{date}_with_holdings_flattened"
+
+
+def industry_base(date):
+    return OUT_DIR / "bigfinance" / f"industry_categories_{date}_with_meta_companies"
+
+
+def companies_base(date):
+    return OUT_DIR / "bigfinance" / f"industry_companies_{date}"
+
+
 CHART_INDEX_PATH = OUT_DIR / "bigfinance" / "chart" / "chart_index.csv"
+CHART_STORE_PATH = Path(os.getenv("CHART_STORE_PATH", OUT_DIR / "bigfinance" / "chart" / "chart_store.sqlite"))
 
 OUTPUT_DIR = OUT_DIR / "bigRise"
-OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-
-OUTPUT_PATH = OUTPUT_DIR / f"bigrise_{today}.csv"
-RECENT_PATH = OUTPUT_DIR / f"bigrise_recent_{today}.csv"
 RECENT_CHART_DIR = OUTPUT_DIR / "recent"     # 🔥 추가된 폴더
-RECENT_CHART_DIR.mkdir(parents=True, exist_ok=True)
+RECENT_REFS_KEEP = 7                         # chart 저장소에 남길 recent_YYYYMMDD ref 수 (최근 7일 창)
+
+
+def output_base(date):
+    return OUTPUT_DIR / f"bigrise_{date}"
+
+
+def recent_base(date):
+    return OUTPUT_DIR / f"bigrise_recent_{date}"
+
+
+def find_output(date):
+    """date 의 전체 매칭 결과 (없으면 None)"""
+    return find_table(output_base(date))
+
+
+# 단계 캐시 (stage_cache): 입력 파일 내용이 바뀌면 다시 매칭
+def cache_inputs(date):
+    chart_index = CHART_INDEX_PATH if CHART_INDEX_PATH.exists() else None
+    return [find_table(rise_base(date)), find_table(industry_base(date)), find_table(companies_base(date)),
+            chart_index]
+
+
+def cache_artifacts(date):
+    return [find_output(date), find_table(recent_base(date))]
+
+
+# 산업 테이블에서 실제로 쓰는 컬럼
+INDUSTRY_COLUMNS = [
+    "main_code", "group_id", "sub_code", "data_code",
+    "sub_name", "data_name", "frequency", "source",
+    "update_date", "updateDate", "companies",
+]
 
 
 # =====================================================
 # 날짜 파서
 # =====================================================
-def parse_date(date_str):
-    if pd.isna(date_str):
-        return None
-    s = str(date_str).strip()
-    for fmt in ("%Y%m%d", "%Y-%m-%d"):
-        try:
-            return datetime.strptime(s, fmt)
-        except:
-            pass
-    return None
+def parse_dates(values):
+    """YYYYMMDD / YYYY-MM-DD 문자열 컬럼을 한 번에 datetime 으로 변환 (실패 시 NaT)"""
+    s = values.astype("string").str.strip()
+    dashed = s.str.contains("-", regex=False).fillna(False)
+    return pd.to_datetime(s.where(~dashed), format="%Y%m%d", errors="coerce").fillna(
+        pd.to_datetime(s.where(dashed), format="%Y-%m-%d", errors="coerce")
+    )
 
 
 # =====================================================
 # update_date 최종 선택
 # =====================================================
-def get_update_date(row):
-    for col in ["industry_update_date_raw", "industry_update_date_header", "chart_update_date"]:
-        v = row.get(col, None)
-        if pd.notna(v) and str(v).strip() != "":
-            return v
-    return ""
+UPDATE_DATE_COLUMNS = ["industry_update_date_raw", "industry_update_date_header", "chart_update_date"]
+
+
+def coalesce_update_date(df):
+    """UPDATE_DATE_COLUMNS 순서대로 비어 있지 않은 첫 값 (없으면 "")"""
+    out = pd.Series("", index=df.index, dtype=object)
+    for col in reversed(UPDATE_DATE_COLUMNS):
+        if col not in df.columns:
+            continue
+        v = df[col]
+        ok = v.notna() & (v.astype("string").str.strip() != "")
+        out = out.mask(ok.fillna(False), v)
+    return out
 
 
 # =====================================================
-# 최근 산업 chart 파일 복사 기능
+# ETF 구성종목 ↔ 산업 매칭
 # =====================================================
-def copy_recent_charts(csv_path):
+def match_positions_by_name(rise_df, industry_df):
     """
-    bigrise_recent_YYYYMMDD.csv 에 있는 industry_chart_path의 JSON 파일을
-    out/bigRise/recent/ 폴더에 복사한다.
+    각 종목명(item_name)이 companies 문자열에 처음 등장하는 산업 행 위치.
+    industry_companies 테이블이 없는 과거 데이터용 부분문자열 매칭.
     """
+    names = rise_df["item_name"].map(str)
+    if "companies" not in industry_df.columns:
+        return pd.Series(float("nan"), index=rise_df.index)
 
-    df = pd.read_csv(csv_path)
-
-    if "industry_chart_path" not in df.columns:
-        log.warning("⚠️ industry_chart_path 컬럼이 없어 chart 복사를 하지 않습니다.")
-        return
+    texts = [
+        c if c and c.lower() != "nan" else None
+        for c in industry_df["companies"].map(str)
+    ]
+    first = first_matching_rows(names, texts)
+    return names.map(first).astype("float64")
 
-    copied = 0
 
-    for path_str in df["industry_chart_path"]:
-        if pd.isna(path_str) or not str(path_str).strip():
-            continue
+def attach_industry_columns(rise_df, industry_df, pos):
+    """
+    pos(종목 행별 매칭 산업 위치)에 따라 industry_* 컬럼을 추가.
+    매칭이 하나도 없으면 rise_df 를 그대로 반환.
+    """
+    hit = pos.notna()
+    if not hit.any():
+        return rise_df
 
-        # industry_chart_path 는 "./out/..." 형태 → "./" 제거
-        rel = path_str.replace("./", "")
-        src = BASE_DIR / rel
+    ind = industry_df.iloc[pos[hit].astype(int).to_numpy()]
 
-        if not src.exists():
-            log.warning(f"⚠️ chart 파일 없음: {src}")
-            continue
+    def col(name):
+        if name in ind.columns:
+            return ind[name].to_numpy()
+        return ""
 
-        dst = RECENT_CHART_DIR / src.name
-        shutil.copy2(src, dst)
-        copied += 1
+    values = {
+        "industry_info": (ind["sub_name"].map(str) + "-" + ind["data_name"].map(str)).to_numpy(),
+        "industry_frequency": col("frequency"),
+        "industry_source": col("source"),
+        "industry_update_date": coalesce_update_date(ind).to_numpy(),
+        "industry_chart_path": col("chart_path"),
+    }
 
-    log.info(f"📁 최근 chart 파일 복사 완료: 총 {copied}개")
+    rise_df = rise_df.copy()
+    for name, v in values.items():
+        rise_df[name] = pd.Series(v, index=rise_df.index[hit], dtype="object")
+    return rise_df
 
 
 # =====================================================
-# 메인
+# 매칭 경로 (파일 I/O 없음, benchmarks/bench_matching.py 에서도 사용)
 # =====================================================
-def main():
-    log.info("🚀 ETF–산업 매칭 파이프라인 시작")
+CHART_INDEX_COLUMNS = ["main_code", "group_id", "sub_code", "data_code", "file_path", "update_date"]
 
-    if not RISE_PATH.exists():
-        log.error(f"❌ ETF 파일 없음: {RISE_PATH}")
-        sys.exit(1)
-
-    if not INDUSTRY_PATH.exists():
-        log.error(f"❌ 산업 파일 없음: {INDUSTRY_PATH}")
-        sys.exit(1)
 
-    rise_df = pd.read_csv(RISE_PATH)
-    industry_df = pd.read_csv(INDUSTRY_PATH)
-
-    # 산업 날짜 보호
+def prepare_industry(industry_df, chart_df=None):
+    """산업 날짜 컬럼 이름 보호 + chart_index 병합 (chart_path · chart_update_date)"""
     industry_df = industry_df.rename(columns={
         "update_date": "industry_update_date_raw",
         "updateDate": "industry_update_date_header"
     })
+    if chart_df is None:
+        return industry_df
+
+    chart_df = chart_df[CHART_INDEX_COLUMNS].rename(columns={
+        "update_date": "chart_update_date", "file_path": "chart_path"
+    })
+    return industry_df.merge(chart_df, on=["main_code", "group_id", "sub_code", "data_code"], how="left")
+
+
+def match_industry(rise_df, industry_df, companies_df=None):
+    """
+    종목 행마다 첫 매칭 산업의 industry_* 컬럼을 붙여 (rise_df, pos) 반환.
+    companies_df(industry_companies long 테이블)가 있으면 종목코드 해시 조인,
+    없으면 companies 문자열 부분문자열 매칭 (Aho-Corasick).
+    """
+    if companies_df is not None:
+        pos = match_by_code(rise_df["item_code"], companies_df, industry_df)
+        log.info(f"🔗 item_code 조인 매칭: {int(pos.notna().sum())}행")
+    else:
+        pos = match_positions_by_name(rise_df, industry_df)
+        log.info(f"🔗 종목명 부분문자열 매칭: {int(pos.notna().sum())}행")
+    return attach_industry_columns(rise_df, industry_df, pos), pos
+
+
+def recent_rows(rise_df, date):
+    """rise_df 에 parsed_date 추가 후 date 당일 포함 최근 7일(date-6 ~ date) 산업 업데이트 행"""
+    rise_df["parsed_date"] = parse_dates(rise_df["industry_update_date"])
+    cutoff = datetime.strptime(date, "%Y%m%d") - timedelta(days=6)
+    return rise_df[rise_df["parsed_date"].notna() & (rise_df["parsed_date"] >= cutoff)]
+
+
+# =====================================================
+# 최근 산업 chart 발행 (hardlink / 저장소 ref)
+# =====================================================
+def load_chart_keys():
+    """chart_index.csv → {file_path: (main, group, sub, data)}"""
+    if not CHART_INDEX_PATH.exists():
+        return {}
+    idx = pd.read_csv(CHART_INDEX_PATH, dtype=str, keep_default_na=False)
+    return {
+        r["file_path"]: chart_key(r["main_code"], r["group_id"], r["sub_code"], r["data_code"])
+        for r in idx.to_dict("records")
+    }
+
+
+def publish_recent_charts(table_file, date):
+    """
+    bigrise_recent_YYYYMMDD.(csv|parquet) 에 있는 industry_chart_path 의 chart 를
+    out/bigRise/recent/ 폴더에 발행한다.
+    - 기존 구조 JSON 파일이 있으면 hardlink (다른 파일시스템이면 복사)
+    - 없으면(CHART_EXPORT=false) chart 저장소에서 복원
+    - chart 저장소에 recent_{date} ref 로 발행 시점 hash 고정
+    """
 
-    # chart_index 병합
-    if CHART_INDEX_PATH.exists():
-        chart_df = pd.read_csv(CHART_INDEX_PATH)
-        chart_df = chart_df.rename(columns={"update_date": "chart_update_date"})
-
-        industry_df = industry_df.merge(
-            chart_df[
-                [
-                    "main_code",
-                    "group_id",
-                    "sub_code",
-                    "data_code",
-                    "file_path",
-                    "chart_update_date"
-                ]
-            ],
-            on=["main_code", "group_id", "sub_code", "data_code"],
-            how="left"
-        )
-
-        industry_df = industry_df.rename(columns={"file_path": "chart_path"})
-
-    # 매칭
-    matches = []
-
-    for _, row in tqdm(industry_df.iterrows(), total=len(industry_df), ncols=90):
-        comps = str(row.get("companies", ""))
-        if not comps or comps.lower() == "nan":
+    df = read_table(table_file, columns=["industry_chart_path"])
+
+    if "industry_chart_path" not in df.columns:
+        log.warning("⚠️ industry_chart_path 컬럼이 없어 chart 발행을 하지 않습니다.")
+        return
+
+    store = ChartStore(CHART_STORE_PATH) if CHART_STORE_PATH.exists() else None
+    path_keys = load_chart_keys()
+    counts = {"linked": 0, "copied": 0, "same": 0, "restored": 0}
+    keys = []
+
+    for path_str in df["industry_chart_path"].dropna().astype(str).str.strip().unique():
+        if not path_str:
             continue
 
-        matched = rise_df[rise_df["item_name"].astype(str).apply(lambda x: x in comps)]
-        if matched.empty:
+        # industry_chart_path 는 "./out/..." 형태 → "./" 제거
+        src = BASE_DIR / path_str.replace("./", "", 1)
+        dst = RECENT_CHART_DIR / src.name
+        key = path_keys.get(path_str)
+        if key:
+            keys.append(key)
+
+        if src.exists():
+            counts[link_or_copy(src, dst)] += 1
             continue
 
-        info = f"{row['sub_name']}-{row['data_name']}"
-
-        temp = matched.copy()
-        temp["industry_info"] = info
-        temp["industry_frequency"] = row.get("frequency", "")
-        temp["industry_source"] = row.get("source", "")
-        temp["industry_update_date"] = get_update_date(row)
-        temp["industry_chart_path"] = row.get("chart_path", "")
-
-        matches.append(temp)
-
-    # 매칭 반영
-    if matches:
-        merged_df = pd.concat(matches).drop_duplicates(subset=["item_name"])
-        rise_df = rise_df.merge(
-            merged_df[
-                [
-                    "item_name",
-                    "industry_info",
-                    "industry_frequency",
-                    "industry_source",
-                    "industry_update_date",
-                    "industry_chart_path"
-                ]
-            ],
-            on="item_name",
-            how="left",
-        )
-
-    # 전체 저장
-    rise_df.to_csv(OUTPUT_PATH, index=False, encoding="utf-8-sig")
-
-    # 최근 7일 필터링
-    rise_df["parsed_date"] = rise_df["industry_update_date"].apply(parse_date)
-    cutoff = datetime.now() - timedelta(days=7)
-
-    recent_df = rise_df[
-        rise_df["parsed_date"].notna() & (rise_df["parsed_date"] >= cutoff)
-    ]
+        entry = store.entry(key) if store and key else None
+        if entry and store.export(entry[0], dst):
+            counts["restored"] += 1
+        else:
+            log.warning(f"⚠️ chart 파일 없음: {src}")
 
-    if len(recent_df) > 0:
-        recent_df.to_csv(RECENT_PATH, index=False, encoding="utf-8-sig")
-        log.info(f"📆 최근 7일 산업 업데이트 ETF 저장 → {RECENT_PATH}")
+    if store:
+        published = store.publish(f"recent_{date}", keys)
+        # 최근 RECENT_REFS_KEEP 개 밖의 지난 recent_ ref 정리 → 그 ref 만 잡고 있던 blob 은 다음 gc 에서 삭제
+        pruned = store.prune_refs("recent_", keep=RECENT_REFS_KEEP)
+        log.info(f"🗄️ chart 저장소 ref recent_{date}: {published}개 (지난 ref {pruned}개 정리)")
+        store.close()
+    log.info(f"📁 최근 chart 발행 완료: {counts}")
 
-        # 🔥 최근 chart 파일 복사 실행
-        copy_recent_charts(RECENT_PATH)
-    else:
-        log.info("⚪ 최근 7일 내 산업 업데이트 없음")
 
+# =====================================================
+# 전체 실행
+# =====================================================
+def run(rise_path=None, industry_path=None, companies_path=None, target_date=None):
+    """
+    ETF–산업 매칭 전체 실행 (스크립트 / in-process Prefect task 공용).
+    입력 경로를 주면 그대로 사용 (in-process 모드에서 앞 단계 결과 전달),
+    없으면 target_date(기본 오늘) 기준 경로에서 검색. 전체 매칭 결과 경로 반환.
+    """
+    date = target_date or time.strftime("%Y%m%d")
+    log.info(f"🚀 ETF–산업 매칭 파이프라인 시작 ({date})")
+    ensure_dirs(OUTPUT_DIR, RECENT_CHART_DIR)
+
+    rise_path = rise_path or find_table(rise_base(date))
+    if rise_path is None:
+        raise FileNotFoundError(f"❌ ETF 파일 없음: {rise_base(date)}.(csv|parquet)")
+
+    industry_path = industry_path or find_table(industry_base(date))
+    if industry_path is None:
+        raise FileNotFoundError(f"❌ 산업 파일 없음: {industry_base(date)}.(csv|parquet)")
+
+    companies_path = companies_path or find_table(companies_base(date))
+
+    perf = StageMetrics("bigrise_pre", date)
+    with perf.phase("load") as p:
+        rise_df = read_table(rise_path)
+        # 코드 조인이 가능하면 무거운 companies JSON 컬럼은 읽지 않음
+        industry_cols = [c for c in INDUSTRY_COLUMNS if companies_path is None or c != "companies"]
+        industry_df = read_table(industry_path, columns=industry_cols)
+
+        # 산업 날짜 보호 + chart_index 병합
+        chart_df = pd.read_csv(CHART_INDEX_PATH) if CHART_INDEX_PATH.exists() else None
+        industry_df = prepare_industry(industry_df, chart_df)
+        p["rows"] = len(rise_df)
+
+    # 매칭 (companies 테이블이 있으면 종목코드 조인, 없으면 종목명 부분문자열)
+    with perf.phase("match") as p:
+        companies_df = None
+        if companies_path is not None:
+            companies_df = read_table(
+                companies_path,
+                columns=["main_code", "sub_code", "data_code", "company_code"],
+                dtype={"company_code": str},
+            )
+        rise_df, pos = match_industry(rise_df, industry_df, companies_df)
+        p["rows"] = int(pos.notna().sum())
+
+    # 전체 저장 + 최근 7일 발행
+    with perf.phase("write") as p:
+        output_path = write_table(rise_df, table_path(output_base(date)), schema="bigrise")
+        log.info(f"💾 전체 매칭 결과 저장 → {output_path}")
+
+        # 최근 7일 필터링 (date 당일 포함 7일: date-6 ~ date)
+        recent_df = recent_rows(rise_df, date)
+
+        if len(recent_df) > 0:
+            recent_path = write_table(recent_df, table_path(recent_base(date)), schema="bigrise")
+            log.info(f"📆 최근 7일 산업 업데이트 ETF 저장 → {recent_path}")
+
+            # 🔥 최근 chart 발행
+            publish_recent_charts(recent_path, date)
+        else:
+            log.info("⚪ 최근 7일 내 산업 업데이트 없음")
+        p["rows"] = len(recent_df)
+
+    log.info(f"⏱️ 성능 지표 → {perf.save()}")
     log.info("🎯 ETF–산업 매칭 파이프라인 완료")
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--date", type=str, default=None, help="YYYYMMDD 입력/출력 파일 날짜 (기본: 오늘)")
+    args = parser.parse_args()
+    setup_logging("bigrise", LOG_DIR)
+    try:
+        run(target_date=args.date)
+    except FileNotFoundError as e:
+        log.error(str(e))
+        sys.exit(1)
 
 
 # =====================================================
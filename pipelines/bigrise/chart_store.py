@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BigFinance chart 내용 주소 저장소 (bigfinance.py / bigrise_pre.py 에서 import)
+------------------------------------------------
+- blob : compact JSON(zlib 압축)을 sha256 으로 주소화 → 날짜가 달라도 같은 내용은 1번만 저장
+- index: (main_code, group_id, sub_code, data_code) → 현재 chart_hash + 호환 경로(file_path)
+- ref  : 이름 붙은 스냅샷 (ex. recent_YYYYMMDD) — 발행 시점의 hash 를 고정 보관
+  · prune_refs(prefix, keep): 같은 prefix 의 ref 는 최근 keep 개만 남김 (지난 ref 가 blob 을 계속 잡지 않도록)
+- 호환 export: 기존 out/bigfinance/{data_type}/... 구조의 pretty JSON 으로 내보내기
+  (임시 파일 → os.replace 로 교체하므로 hardlink 로 발행한 파일은 덮어쓰지 않음)
+- 저장: SQLite 단일 파일 (WAL, 스레드 안전)
+ex) python -m pipelines.bigrise.chart_store stats
+    python -m pipelines.bigrise.chart_store export          # index 전체를 기존 구조로
+    python -m pipelines.bigrise.chart_store export --ref recent_20251120 --dest out/tmp
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash       TEXT PRIMARY KEY,
+    body       BLOB NOT NULL,
+    size       INTEGER NOT NULL,
+    raw_size   INTEGER NOT NULL,
+    created_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS charts (
+    main_code  TEXT NOT NULL,
+    group_id   TEXT NOT NULL,
+    sub_code   TEXT NOT NULL,
+    data_code  TEXT NOT NULL,
+    hash       TEXT NOT NULL,
+    file_path  TEXT NOT NULL,
+    stored_at  REAL NOT NULL,
+    PRIMARY KEY (main_code, group_id, sub_code, data_code)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS refs (
+    name       TEXT NOT NULL,
+    main_code  TEXT NOT NULL,
+    group_id   TEXT NOT NULL,
+    sub_code   TEXT NOT NULL,
+    data_code  TEXT NOT NULL,
+    hash       TEXT NOT NULL,
+    file_path  TEXT NOT NULL,
+    published_at REAL NOT NULL,
+    PRIMARY KEY (name, main_code, group_id, sub_code, data_code)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_charts_hash ON charts(hash);
+CREATE INDEX IF NOT EXISTS idx_refs_hash ON refs(hash);
+"""
+
+Key = Tuple[str, str, str, str]
+
+
+def chart_key(main_code, group_id, sub_code, data_code) -> Key:
+    return tuple("" if v is None else str(v).strip() for v in (main_code, group_id, sub_code, data_code))
+
+
+def compact_json(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def write_json(path: Path, data):
+    """기존 chart 파일과 같은 형식(indent=2)으로 원자적 저장"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def link_or_copy(src: Path, dst: Path) -> str:
+    """dst 를 src 의 hardlink 로 교체 (다른 파일시스템이면 복사). 'linked' | 'copied' | 'same'"""
+    src, dst = Path(src), Path(dst)
+    if dst.exists() and os.path.samefile(src, dst):
+        return "same"
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}.tmp")
+    if tmp.exists():
+        tmp.unlink()
+    try:
+        os.link(src, tmp)
+        how = "linked"
+    except OSError:
+        shutil.copy2(src, tmp)
+        how = "copied"
+    os.replace(tmp, dst)
+    return how
+
+
+class ChartStore:
+    """스레드 안전 chart 내용 주소 저장소"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.writes = self.dedup = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    # =====================================================
+    # 저장
+    # =====================================================
+    def put(self, key: Key, data, file_path: str) -> str:
+        """chart JSON 저장 후 chart_hash 반환. 같은 내용의 blob 이 있으면 index 만 갱신"""
+        raw = compact_json(data)
+        digest = hashlib.sha256(raw).hexdigest()
+        now = time.time()
+        with self._lock:
+            exists = self._conn.execute("SELECT 1 FROM blobs WHERE hash=?", (digest,)).fetchone()
+            if exists:
+                self.dedup += 1
+            else:
+                body = zlib.compress(raw, 6)
+                self._conn.execute(
+                    "INSERT INTO blobs VALUES (?, ?, ?, ?, ?)",
+                    (digest, body, len(body), len(raw), now),
+                )
+                self.writes += 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO charts VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (*key, digest, file_path, now),
+            )
+        return digest
+
+    def import_file(self, key: Key, path: Path, file_path: str) -> Optional[str]:
+        """기존 구조의 chart JSON 파일을 저장소로 가져옴 (저장소 도입 전 수집분 이월용)"""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return self.put(key, data, file_path)
+
+    # =====================================================
+    # 조회
+    # =====================================================
+    def entry(self, key: Key) -> Optional[Tuple[str, str]]:
+        """key → (chart_hash, file_path) | None"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT hash, file_path FROM charts "
+                "WHERE main_code=? AND group_id=? AND sub_code=? AND data_code=?",
+                key,
+            ).fetchone()
+
+    def load(self, digest: str):
+        with self._lock:
+            row = self._conn.execute("SELECT body FROM blobs WHERE hash=?", (digest,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row[0]).decode("utf-8"))
+
+    def get(self, key: Key):
+        entry = self.entry(key)
+        return self.load(entry[0]) if entry else None
+
+    def items(self, ref: Optional[str] = None) -> List[Tuple[Key, str, str]]:
+        """[(key, chart_hash, file_path)] — ref 지정 시 해당 스냅샷"""
+        with self._lock:
+            if ref is None:
+                rows = self._conn.execute(
+                    "SELECT main_code, group_id, sub_code, data_code, hash, file_path FROM charts"
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT main_code, group_id, sub_code, data_code, hash, file_path FROM refs "
+                    "WHERE name=?", (ref,),
+                ).fetchall()
+        return [(tuple(r[:4]), r[4], r[5]) for r in rows]
+
+    # =====================================================
+    # 발행 / 내보내기
+    # =====================================================
+    def publish(self, name: str, keys: Iterable[Key]) -> int:
+        """현재 index 의 hash 를 이름 붙은 ref 로 고정 (같은 이름은 교체). 발행 건수 반환"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM refs WHERE name=?", (name,))
+            cur = self._conn.executemany(
+                "INSERT OR IGNORE INTO refs "
+                "SELECT ?, main_code, group_id, sub_code, data_code, hash, file_path, ? FROM charts "
+                "WHERE main_code=? AND group_id=? AND sub_code=? AND data_code=?",
+                [(name, now, *k) for k in set(keys)],
+            )
+            self._conn.execute("COMMIT")
+        return cur.rowcount
+
+    def prune_refs(self, prefix: str, keep: int) -> int:
+        """
+        prefix 로 시작하는 ref 중 이름순 최근 keep 개만 남기고 삭제, 삭제한 ref 이름 수 반환.
+        (recent_YYYYMMDD 처럼 이름이 날짜순으로 정렬되는 ref 용 — 풀린 blob 은 다음 gc 에서 정리)
+        """
+        with self._lock:
+            names = [r[0] for r in self._conn.execute(
+                "SELECT DISTINCT name FROM refs WHERE substr(name, 1, ?) = ? ORDER BY name DESC",
+                (len(prefix), prefix),
+            )]
+            drop = names[max(0, keep):]
+            if drop:
+                self._conn.execute("BEGIN")
+                self._conn.executemany("DELETE FROM refs WHERE name=?", [(n,) for n in drop])
+                self._conn.execute("COMMIT")
+        return len(drop)
+
+    def export(self, digest: str, dest: Path) -> bool:
+        data = self.load(digest)
+        if data is None:
+            return False
+        write_json(dest, data)
+        return True
+
+    def export_layout(self, base_dir: Path, ref: Optional[str] = None, flat: bool = False) -> int:
+        """
+        index(또는 ref) 전체를 기존 디렉토리 구조로 내보냄.
+        flat=True 면 base_dir 바로 아래에 파일명만으로 저장 (recent 폴더 형식).
+        같은 내용은 한 번만 만들고 나머지는 hardlink.
+        """
+        base_dir = Path(base_dir)
+        made = {}
+        count = 0
+        for _, digest, rel in self.items(ref):
+            rel_path = Path(rel.replace("./", "", 1))
+            dest = base_dir / (rel_path.name if flat else rel_path)
+            if digest in made:
+                link_or_copy(made[digest], dest)
+            elif self.export(digest, dest):
+                made[digest] = dest
+            else:
+                continue
+            count += 1
+        return count
+
+    # =====================================================
+    # 정리 / 통계
+    # =====================================================
+    def gc(self) -> int:
+        """index · ref 어디에서도 참조하지 않는 blob 삭제, 삭제 건수 반환"""
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM blobs WHERE hash NOT IN (SELECT hash FROM charts) "
+                "AND hash NOT IN (SELECT hash FROM refs)"
+            )
+        return cur.rowcount
+
+    def stats(self) -> dict:
+        with self._lock:
+            charts = self._conn.execute("SELECT COUNT(*) FROM charts").fetchone()[0]
+            blobs, size, raw = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(raw_size), 0) FROM blobs"
+            ).fetchone()
+            refs = self._conn.execute("SELECT COUNT(DISTINCT name) FROM refs").fetchone()[0]
+        return {
+            "charts": charts, "blobs": blobs, "refs": refs,
+            "bytes": size, "raw_bytes": raw,
+            "writes": self.writes, "dedup": self.dedup,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def main():
+    import argparse
+    import sys
+
+    base_dir = Path(__file__).resolve().parents[2]
+    default_path = os.getenv("CHART_STORE_PATH",
+                             base_dir / "out" / "bigfinance" / "chart" / "chart_store.sqlite")
+
+    ap = argparse.ArgumentParser(description="BigFinance chart 저장소")
+    ap.add_argument("command", choices=["stats", "export", "gc"])
+    ap.add_argument("--store", default=str(default_path))
+    ap.add_argument("--ref", default=None, help="export 할 ref 이름 (기본: 현재 index 전체)")
+    ap.add_argument("--dest", default=str(base_dir), help="export 기준 디렉토리 (기본: 프로젝트 루트)")
+    ap.add_argument("--flat", action="store_true", help="하위 디렉토리 없이 파일명만으로 export")
+    args = ap.parse_args()
+
+    if not Path(args.store).exists():
+        print(f"❌ 저장소 없음: {args.store}")
+        sys.exit(1)
+    store = ChartStore(Path(args.store))
+    if args.command == "stats":
+        print(json.dumps(store.stats(), ensure_ascii=False))
+    elif args.command == "export":
+        n = store.export_layout(Path(args.dest), ref=args.ref, flat=args.flat)
+        print(f"📁 {n}개 chart export → {args.dest}")
+    else:
+        print(f"🧹 blob {store.gc()}개 삭제")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RISE ETF × 종목 비중 희소 행렬 (노출 · 중복도 · 공통 보유종목 질의)
+------------------------------------------------
+- 입력: riseetf flatten 최종 파일 (name, item_code, item_name, ratio, value)
+- 행 = ETF(name), 열 = 종목(item_code) 인 CSR 행렬 2개
+  · weights : 비중(%) (ratio)        — "-" 등 숫자가 아닌 값은 제외, 같은 (ETF, 종목) 은 합산
+  · values  : 평가액(원) (value)     — "175,740,000" → 175740000
+- 질의 (문자열 groupby 없이 희소 행렬 연산)
+  · exposure()          : 종목별 전체 ETF 합산 노출 (보유 ETF 수 · 비중 합 · 평가액 합)
+  · holders(code)       : 종목을 담은 ETF 와 비중
+  · overlap(method)     : ETF 쌍별 중복도 — cosine(비중 벡터 코사인) | weighted(Σ min(비중), %)
+                          (현금설정액 · 선물 등 비종목 행도 item_code 가 있어 그대로 포함, 레버리지 ETF 는 100 초과 가능)
+  · top_overlaps(n)     : 중복도 상위 ETF 쌍
+  · common(a, b, n)     : 두 ETF 공통 보유종목 상위 n (양쪽 모두 보유한 종목만, min 비중 순)
+- out/riseETF/rise_holdings_matrix_YYYYMMDD.npz 로 저장, 원본 파일 sha256 이 같으면 다시 만들지 않고 재사용
+ex) hm = HoldingsMatrix.load_or_build("20251111")
+    hm.exposure().head(20)
+    hm.common("RISE 200", "RISE 코리아밸류업", n=10)
+    python -m pipelines.bigrise.holdings_matrix overlap --date 20251111 --method weighted --top 20
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from pipelines.common.stage_cache import file_digest
+from pipelines.common.storage import find_table, read_table
+
+OUT_DIR = BASE_DIR / "out" / "riseETF"
+COLUMNS = ["name", "item_code", "item_name", "ratio", "value"]
+METHODS = ("cosine", "weighted")
+PAIR_BATCH = 5_000_000      # weighted 중복도 계산 시 한 번에 만드는 (ETF, ETF) 쌍 수
+
+log = logging.getLogger(__name__)
+
+
+def holdings_base(date: str) -> Path:
+    return OUT_DIR / f"rise_finder_{date}_with_holdings_flattened"
+
+
+def matrix_path(date: str) -> Path:
+    return OUT_DIR / f"rise_holdings_matrix_{date}.npz"
+
+
+def to_number(s: pd.Series) -> np.ndarray:
+    """'175,740,000' · '27.63' → float, 숫자가 아니면 NaN"""
+    return pd.to_numeric(s.astype("string").str.replace(",", "", regex=False), errors="coerce").to_numpy(float)
+
+
+def _csr(rows: np.ndarray, cols: np.ndarray, vals: np.ndarray, shape) -> sparse.csr_matrix:
+    keep = np.isfinite(vals) & (vals != 0)
+    m = sparse.csr_matrix((vals[keep], (rows[keep], cols[keep])), shape=shape)
+    m.sum_duplicates()
+    return m
+
+
+class HoldingsMatrix:
+    """
+    etfs    : 행 라벨 (ETF 이름, 정렬)
+    codes   : 열 라벨 (item_code, 정렬) / names : 종목명 (codes 와 같은 순서, 첫 등장 기준)
+    weights : ETF × 종목 비중(%) CSR / values : 평가액(원) CSR
+    source  : 원본 파일 경로 · sha256 (재사용 판단)
+    """
+
+    def __init__(self, etfs, codes, names, weights, values, source: Optional[dict] = None):
+        self.etfs = np.asarray(etfs, dtype=str)
+        self.codes = np.asarray(codes, dtype=str)
+        self.names = np.asarray(names, dtype=str)
+        self.weights = sparse.csr_matrix(weights)
+        self.values = sparse.csr_matrix(values)
+        self.source = source or {}
+        self._etf_pos = {e: i for i, e in enumerate(self.etfs)}
+        self._code_pos = {c: j for j, c in enumerate(self.codes)}
+
+    def __repr__(self):
+        return f"HoldingsMatrix({len(self.etfs)} ETF × {len(self.codes)} 종목, nnz={self.weights.nnz})"
+
+    # -------------------------------------------------
+    # 생성 · 저장
+    # -------------------------------------------------
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, source: Optional[dict] = None) -> "HoldingsMatrix":
+        df = df[df["item_code"].notna() & (df["item_code"].astype("string").str.strip() != "")]
+        etf_idx, etfs = pd.factorize(df["name"].astype(str), sort=True)
+        code_idx, codes = pd.factorize(df["item_code"].astype(str), sort=True)
+        first = pd.Series(df["item_name"].astype(str).to_numpy()).groupby(code_idx).first()
+        shape = (len(etfs), len(codes))
+        return cls(etfs, codes, first.reindex(range(len(codes)), fill_value="").to_numpy(),
+                   _csr(etf_idx, code_idx, to_number(df["ratio"]), shape),
+                   _csr(etf_idx, code_idx, to_number(df["value"]), shape), source)
+
+    @classmethod
+    def from_table(cls, path: Path) -> "HoldingsMatrix":
+        path = Path(path)
+        df = read_table(path, columns=COLUMNS, dtype=str, keep_default_na=False)
+        return cls.from_frame(df, {"path": str(path), "sha256": file_digest(path)})
+
+    def save(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.stem + ".tmp.npz")
+        w, v = self.weights, self.values
+        np.savez_compressed(
+            tmp, etfs=self.etfs, codes=self.codes, names=self.names, shape=np.array(w.shape),
+            w_data=w.data, w_indices=w.indices, w_indptr=w.indptr,
+            v_data=v.data, v_indices=v.indices, v_indptr=v.indptr,
+            source_path=np.array(self.source.get("path", "")), source_sha256=np.array(self.source.get("sha256", "")),
+        )
+        tmp.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "HoldingsMatrix":
+        with np.load(path, allow_pickle=False) as z:
+            shape = tuple(z["shape"])
+            w = sparse.csr_matrix((z["w_data"], z["w_indices"], z["w_indptr"]), shape=shape)
+            v = sparse.csr_matrix((z["v_data"], z["v_indices"], z["v_indptr"]), shape=shape)
+            source = {"path": str(z["source_path"]), "sha256": str(z["source_sha256"])}
+            return cls(z["etfs"], z["codes"], z["names"], w, v, source)
+
+    @classmethod
+    def load_or_build(cls, date: str, source: Optional[Path] = None, force: bool = False) -> "HoldingsMatrix":
+        """저장된 행렬의 원본 sha256 이 현재 flatten 파일과 같으면 재사용, 아니면 다시 만들어 저장"""
+        source = Path(source) if source else find_table(holdings_base(date))
+        if source is None:
+            raise FileNotFoundError(f"❌ RISE flatten 파일 없음: {holdings_base(date)}.(csv|parquet)")
+        path = matrix_path(date)
+        if path.exists() and not force:
+            try:
+                hm = cls.load(path)
+                if hm.source.get("sha256") == file_digest(source):
+                    log.info(f"♻️ 비중 행렬 재사용: {path.name} ({hm})")
+                    return hm
+            except (OSError, ValueError, KeyError) as e:
+                log.warning(f"⚠️ 비중 행렬 로드 실패 → 다시 생성: {e}")
+        hm = cls.from_table(source)
+        hm.save(path)
+        log.info(f"💾 비중 행렬 저장: {path.name} ({hm})")
+        return hm
+
+    # -------------------------------------------------
+    # 질의
+    # -------------------------------------------------
+    def etf_index(self, etf: str) -> int:
+        try:
+            return self._etf_pos[etf]
+        except KeyError:
+            raise KeyError(f"ETF 없음: {etf}") from None
+
+    def code_index(self, code: str) -> int:
+        try:
+            return self._code_pos[code]
+        except KeyError:
+            raise KeyError(f"종목코드 없음: {code}") from None
+
+    def exposure(self, top: Optional[int] = None) -> pd.DataFrame:
+        """종목별 전체 ETF 합산 노출 (평가액 합 → 비중 합 순 내림차순)"""
+        out = pd.DataFrame({
+            "item_code": self.codes,
+            "item_name": self.names,
+            "n_etfs": np.diff(self.weights.tocsc().indptr),
+            "weight_sum": np.asarray(self.weights.sum(axis=0)).ravel(),
+            "value_sum": np.asarray(self.values.sum(axis=0)).ravel(),
+        })
+        out = out.sort_values(["value_sum", "weight_sum", "item_code"], ascending=[False, False, True],
+                              kind="stable", ignore_index=True)
+        return out.head(top) if top else out
+
+    def holders(self, code: str, top: Optional[int] = None) -> pd.DataFrame:
+        """종목을 담은 ETF 와 비중 · 평가액 (비중 내림차순)"""
+        j = self.code_index(code)
+        col = self.weights[:, [j]].tocoo()
+        rows = col.row
+        out = pd.DataFrame({
+            "etf": self.etfs[rows],
+            "weight": col.data,
+            "value": self.values[rows, j].toarray().ravel() if len(rows) else np.array([], float),
+        })
+        out = out.sort_values(["weight", "etf"], ascending=[False, True], kind="stable", ignore_index=True)
+        return out.head(top) if top else out
+
+    def overlap(self, method: str = "cosine") -> sparse.csr_matrix:
+        """
+        ETF × ETF 중복도 (대각 포함, 공통 종목이 없는 쌍은 0)
+        cosine   : 비중 벡터 코사인 유사도 (0~1)
+        weighted : Σ_종목 min(비중_a, 비중_b) (%) — 종목 열마다 보유 ETF 쌍에만 계산
+        """
+        w = self.weights
+        if method == "cosine":
+            norms = np.sqrt(np.asarray(w.multiply(w).sum(axis=1)).ravel())
+            inv = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+            wn = sparse.diags(inv) @ w
+            return (wn @ wn.T).tocsr()
+        if method != "weighted":
+            raise ValueError(f"method 는 {', '.join(METHODS)} 중 하나: {method}")
+
+        # 종목 열별 보유 ETF 쌍 (i, j) 과 min(비중) → 열 묶음마다 COO 로 모아 합산 (메모리 상한 PAIR_BATCH)
+        csc = w.tocsc()
+        counts = np.diff(csc.indptr).astype(np.int64)
+        pairs = counts ** 2
+        out = sparse.csr_matrix((w.shape[0], w.shape[0]))
+        ends = np.cumsum(pairs)
+        lo = 0
+        while lo < len(counts):
+            hi = max(lo + 1, int(np.searchsorted(ends, ends[lo] - pairs[lo] + PAIR_BATCH, side="right")))
+            k, n = counts[lo:hi], pairs[lo:hi]
+            start, kk = np.repeat(csc.indptr[lo:hi], n), np.repeat(k, n)
+            offset = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+            a, b = start + offset // kk, start + offset % kk
+            out = out + sparse.csr_matrix((np.minimum(csc.data[a], csc.data[b]), (csc.indices[a], csc.indices[b])),
+                                          shape=out.shape)
+            lo = hi
+        return out.tocsr()
+
+    def top_overlaps(self, n: int = 20, method: str = "cosine") -> pd.DataFrame:
+        """중복도 상위 n 개 ETF 쌍 (a < b, 중복도 0 제외)"""
+        m = sparse.triu(self.overlap(method), k=1).tocoo()
+        order = np.lexsort((m.col, m.row, -m.data))[:n]
+        return pd.DataFrame({"etf_a": self.etfs[m.row[order]], "etf_b": self.etfs[m.col[order]],
+                             method: m.data[order]})
+
+    def common(self, etf_a: str, etf_b: str, n: int = 10) -> pd.DataFrame:
+        """
+        두 ETF 공통 보유종목 상위 n (min 비중 내림차순).
+        공통 = 양쪽 모두 비중이 있는 종목 (희소 행렬 구조상 0 이 아닌 열의 교집합) —
+        한쪽에 없는 종목을 0 으로 보고 min 을 취하면 음수 비중 종목이 공통으로 잡히므로 교집합에서만 계산
+        """
+        ra, rb = self.weights[self.etf_index(etf_a)], self.weights[self.etf_index(etf_b)]
+        cols = np.intersect1d(ra.indices[ra.data != 0], rb.indices[rb.data != 0])
+        wa, wb = ra[:, cols].toarray().ravel(), rb[:, cols].toarray().ravel()
+        both = np.minimum(wa, wb)
+        order = np.lexsort((self.codes[cols], -both))[:n]
+        cols = cols[order]
+        return pd.DataFrame({
+            "item_code": self.codes[cols],
+            "item_name": self.names[cols],
+            "weight_a": wa[order],
+            "weight_b": wb[order],
+            "overlap": both[order],
+        })
+
+
+# =====================================================
+# CLI
+# =====================================================
+def main():
+    from dotenv import load_dotenv
+
+    from pipelines.common.runtime import setup_logging
+
+    load_dotenv()
+    ap = argparse.ArgumentParser(description="RISE ETF × 종목 비중 행렬 질의")
+    ap.add_argument("command", choices=["build", "exposure", "holders", "overlap", "common"])
+    ap.add_argument("--date", required=True, help="YYYYMMDD (rise_finder_<date>_with_holdings_flattened)")
+    ap.add_argument("--source", type=Path, default=None, help="flatten 파일 직접 지정")
+    ap.add_argument("--force", action="store_true", help="저장된 행렬을 무시하고 다시 생성")
+    ap.add_argument("--code", help="holders: 종목코드")
+    ap.add_argument("--etf", nargs=2, metavar=("A", "B"), help="common: 비교할 ETF 두 개")
+    ap.add_argument("--method", choices=METHODS, default="cosine", help="overlap 방식")
+    ap.add_argument("--top", type=int, default=20)
+    args = ap.parse_args()
+    setup_logging("holdings_matrix", BASE_DIR / "logs")
+
+    hm = HoldingsMatrix.load_or_build(args.date, source=args.source, force=args.force)
+    if args.command == "build":
+        print(f"{hm} → {matrix_path(args.date)}")
+        return
+    if args.command == "exposure":
+        out = hm.exposure(top=args.top)
+    elif args.command == "holders":
+        if not args.code:
+            ap.error("holders 는 --code 필요")
+        out = hm.holders(args.code, top=args.top)
+    elif args.command == "overlap":
+        out = hm.top_overlaps(args.top, method=args.method)
+    else:
+        if not args.etf:
+            ap.error("common 은 --etf A B 필요")
+        out = hm.common(*args.etf, n=args.top)
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(out.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BigFinance 산업 메타 가공 유틸 (bigfinance.py 에서 import)
+------------------------------------------------
+- header 메타 / companies 목록을 카테고리 DataFrame 에 컬럼 단위로 병합
+- (main_code, sub_code) 별 기업 목록 → data_code 단위 long 테이블
+- 네트워크 · 파일 I/O 없이 DataFrame 만 다룸
+"""
+
+import json
+
+import pandas as pd
+
+PAIR_KEYS = ["main_code", "sub_code"]
+COMPANY_COLUMNS = ["main_code", "sub_code", "data_code", "company_code", "company_name"]
+
+
+# =====================================================
+# header + companies 병합
+# =====================================================
+def merge_meta(df, cache_header, cache_comp):
+    """
+    cache_header: {(main_code, sub_code): header dict}
+    cache_comp:   {(main_code, sub_code): [{"code", "name"}, ...]}
+    header 키는 컬럼으로(처음 등장한 행 순서대로), companies 는 JSON 문자열 컬럼으로 추가.
+    """
+    pairs = list(df[PAIR_KEYS].drop_duplicates().itertuples(index=False, name=None))
+
+    # 셀 단위 대입 시 컬럼이 생기던 순서 (행 순서대로 header 키 → companies)
+    order = list(df.columns)
+    for k in pairs:
+        for c in [*cache_header.get(k, {}), "companies"]:
+            if c not in order:
+                order.append(c)
+
+    # header 메타 → DataFrame merge
+    records = [
+        {**cache_header[k], "main_code": k[0], "sub_code": k[1]}
+        for k in pairs if cache_header.get(k)
+    ]
+    if records:
+        header_df = pd.DataFrame.from_records(records)
+        new_cols = [c for c in header_df.columns if c not in PAIR_KEYS]
+        overlap = [c for c in new_cols if c in df.columns]
+
+        merged = df.merge(header_df, on=PAIR_KEYS, how="left", suffixes=("", "__hdr"))
+        for c in overlap:
+            merged[c] = merged.pop(f"{c}__hdr").combine_first(merged[c])
+
+        # 셀 단위 대입과 같은 dtype: 정수 → float, bool → object
+        for c in new_cols:
+            if c in overlap:
+                continue
+            if pd.api.types.is_bool_dtype(merged[c]):
+                merged[c] = merged[c].astype(object)
+            elif pd.api.types.is_integer_dtype(merged[c]):
+                merged[c] = merged[c].astype("float64")
+        df = merged
+
+    # companies → JSON 문자열
+    comp_json = {k: json.dumps(cache_comp.get(k, []), ensure_ascii=False) for k in pairs}
+    keys = pd.MultiIndex.from_frame(df[PAIR_KEYS])
+    df["companies"] = pd.Series(keys.map(comp_json.get), index=df.index, dtype=object)
+    return df[order]
+
+
+# =====================================================
+# 기업 long 테이블
+# =====================================================
+def build_companies_table(df, cache_comp):
+    """(main_code, sub_code) 별 기업 목록을 data_code 단위 long 테이블로 변환"""
+    comp_rows = [
+        {"main_code": a, "sub_code": b,
+         "company_code": c.get("code"), "company_name": c.get("name")}
+        for (a, b), comps in cache_comp.items()
+        for c in comps
+    ]
+    if not comp_rows:
+        return pd.DataFrame(columns=COMPANY_COLUMNS)
+
+    keys = df[["main_code", "sub_code", "data_code"]].drop_duplicates()
+    comp_df = pd.DataFrame(comp_rows)
+    return keys.merge(comp_df, on=PAIR_KEYS, how="inner")[COMPANY_COLUMNS]
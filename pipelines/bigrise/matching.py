@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ETF 구성종목 ↔ BigFinance 산업 기업 매칭 엔진
+------------------------------------------------
+- 보유종목명 전체로 Aho-Corasick 오토마톤을 한 번 구성
+- 산업별 companies 문자열을 한 번씩만 스캔해 (종목, 산업) 쌍 생성
+- 동일한 companies 문자열(같은 sub_code 의 data_code 들)은 한 번만 스캔
+- 결과는 기존 `item_name in companies` 부분문자열 매칭과 동일
+- industry_companies 테이블이 있으면 item_code 해시 조인으로 정확 매칭
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+import pandas as pd
+
+INDUSTRY_KEYS = ["main_code", "sub_code", "data_code"]
+
+
+# =====================================================
+# Aho-Corasick 오토마톤
+# =====================================================
+class AhoCorasick:
+    """여러 패턴을 텍스트 한 번 순회로 모두 찾는 오토마톤"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self._empty: List[int] = []
+
+        for p in patterns:
+            self._add(p)
+        self._build()
+
+    def _add(self, word: str):
+        idx = len(self.patterns)
+        self.patterns.append(word)
+        if not word:
+            # 빈 문자열은 모든 텍스트의 부분문자열
+            self._empty.append(idx)
+            return
+
+        state = 0
+        for ch in word:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(idx)
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                cand = self._goto[f].get(ch, 0)
+                self._fail[nxt] = cand if cand != nxt else 0
+                self._out[nxt].extend(self._out[self._fail[nxt]])
+
+    def find_all(self, text: str) -> Set[int]:
+        """text 안에 등장하는 패턴 인덱스 집합"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set(self._empty) if text else set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+# =====================================================
+# 종목명 → 첫 매칭 산업 위치
+# =====================================================
+def first_matching_rows(names: Iterable[str], texts: Sequence[Optional[str]]) -> Dict[str, int]:
+    """
+    각 종목명이 부분문자열로 처음 등장하는 texts 의 위치(0-based)를 반환.
+    빈 값/None 인 text 는 건너뛴다.
+    """
+    unique_names = list(dict.fromkeys(names))
+    if not unique_names:
+        return {}
+
+    ac = AhoCorasick(unique_names)
+    first: Dict[str, int] = {}
+    scanned: Set[str] = set()
+
+    for pos, text in enumerate(texts):
+        # 앞에서 이미 스캔한 문자열은 더 이른 위치에서 매칭이 끝났음
+        if not text or text in scanned:
+            continue
+        scanned.add(text)
+        for i in ac.find_all(text):
+            first.setdefault(unique_names[i], pos)
+        if len(first) == len(unique_names):
+            break
+
+    return first
+
+
+# =====================================================
+# 종목코드 정규화 + 해시 조인
+# =====================================================
+def normalize_stock_code(codes: pd.Series) -> pd.Series:
+    """ISIN(KR7005930003) · A005930 · 5930 형태를 6자리 단축코드(005930)로 통일"""
+    s = codes.astype("string").str.strip().str.upper()
+    isin = s.str.fullmatch(r"KR[0-9A-Z]{10}").fillna(False)
+    s = s.where(~isin, s.str.slice(3, 9))
+    s = s.str.replace(r"^A(?=\d{6}$)", "", regex=True)
+    digits = s.str.fullmatch(r"\d{1,6}").fillna(False)
+    return s.where(~digits, s.str.zfill(6))
+
+
+def match_by_code(item_codes: pd.Series, companies_df: pd.DataFrame,
+                  industry_df: pd.DataFrame) -> pd.Series:
+    """
+    item_code 별 첫 매칭 산업 행 위치(0-based, 없으면 NaN).
+    companies_df: (main_code, sub_code, data_code, company_code, company_name) long 테이블
+    """
+    keys = industry_df[INDUSTRY_KEYS].copy()
+    keys["_pos"] = range(len(keys))
+
+    pairs = companies_df[INDUSTRY_KEYS + ["company_code"]].merge(keys, on=INDUSTRY_KEYS, how="inner")
+    pairs["_code"] = normalize_stock_code(pairs["company_code"])
+    first = pairs.dropna(subset=["_code"]).groupby("_code")["_pos"].min()
+
+    return normalize_stock_code(item_codes).map(first).astype("float64")
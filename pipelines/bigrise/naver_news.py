@@ -4,20 +4,30 @@
 Naver Finance 뉴스(101/258) 섹션 다건 수집기 (Prefect 파이프라인 대응 버전)
 ------------------------------------------------
 - 섹션: 401(시황), 402(기업), 403(해외), 404(채권), 406(공시), 429(환율)
-- 기능: HTML 저장 → CSV 집계 → 기사 본문(contents) 추가
+- 기능: 목록 수집·파싱(스트리밍) → CSV 집계 → 기사 본문(contents) 추가
+- 목록: --list-mode stream(기본, 메모리에서 바로 파싱) | files(HTML 저장 → 재파싱, 기존 방식)
+- 디버그: --dump-html 지정 시 stream 모드에서도 html_dump/ 에 목록 HTML 보존
 - 경로 구조: project-root/out/naver/, project-root/logs/, project-root/html_dump/
 - 제어: .env에서 KEEP_TEMP=true 설정 시 중간 CSV 보존
+- 제어: .env OUTPUT_FORMAT(csv | parquet) 로 본문 포함 최종 파일 형식 선택
+- 캐시: 기사 본문을 (office_id, article_id) 키로 디스크 캐시 (ARTICLE_CACHE=true)
+- 엔진: --engine async(기본, 호스트별 동시성/초당 요청 제한) | threaded(기존 방식)
+- 증분: --mode incremental 은 섹션별 최신 기사(high-water mark) 이후의 새 기사만
+  1페이지부터 넘기며 수집, 당일 본문 포함 파일에 이어쓰기 (장중 주기 실행용)
+- 성능 지표: 목록(list) · 본문(articles) 구간별 HTTP · 파싱 시간 · 행 수 → out/metrics (perf.StageMetrics)
+- 체크포인트: 본문 수집은 입력을 NAVER_ENRICH_CHUNK 행씩 읽어 완료 행을 저널
+  (naver_news_YYYYMMDD_with_contents.journal.jsonl)에 바로 기록, 재시작 시 남은 기사만 수집 후 최종 파일 생성
+- 파싱 분리: 목록 · 본문 수집 스레드는 응답 bytes 만 받고 디코딩 · 파싱은 프로세스 풀(parse_pool)이 담당
+  (.env PARSE_WORKERS 워커 수, 0 이면 수집 스레드에서 파싱 / PARSE_QUEUE 대기 작업 상한)
 """
 
-import os, re, csv, html, time, random, shutil, logging, sys
+import os, re, csv, html, json, time, shutil, logging, sys, threading
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from urllib.parse import urlencode, urljoin, urlparse, parse_qs
 from typing import List, Optional, Tuple
 
-import requests
 import argparse
-from bs4 import BeautifulSoup
 from tqdm import tqdm
 from dotenv import load_dotenv
 import urllib3
@@ -28,25 +38,26 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 # 경로 설정 (Prefect 환경 호환)
 # =====================================================
 BASE_DIR = Path(__file__).resolve().parents[2]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from pipelines.bigrise.article_cache import ArticleCache
+from pipelines.common.async_fetch import AsyncFetchEngine
+from pipelines.common.html_extract import first_node, max_link_number, node_text, parse_html
+from pipelines.common.http_client import HttpClient
+from pipelines.common.parse_pool import ParsePool, completed, decode_body, default_workers
+from pipelines.common.journal import Journal
+from pipelines.common.perf import StageMetrics, Timer
+from pipelines.common.runtime import ensure_dirs, setup_logging
+from pipelines.common.storage import append_rows, count_rows, find_table, read_table, table_path, write_row_stream
+
 OUT_DIR = BASE_DIR / "out" / "naver"
 LOG_DIR = BASE_DIR / "logs"
 HTML_DUMP_DIR = BASE_DIR / "html_dump"
+# 날짜 지정 수집 가능 (backfill 대상)
+SNAPSHOT_ONLY = False
 
-OUT_DIR.mkdir(parents=True, exist_ok=True)
-LOG_DIR.mkdir(parents=True, exist_ok=True)
-
-# =====================================================
-# 로깅 설정
-# =====================================================
-log_path = LOG_DIR / f"naver_news_{time.strftime('%Y%m%d')}.log"
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler(log_path, encoding="utf-8"),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# 로깅 핸들러 · 디렉토리는 실행 시점에 설정 (import 부작용 없음)
 log = logging.getLogger(__name__)
 
 # =====================================================
@@ -54,11 +65,25 @@ log = logging.getLogger(__name__)
 # =====================================================
 load_dotenv()
 KEEP_TEMP = os.getenv("KEEP_TEMP", "false").lower() in ("1", "true", "yes")
+NAVER_ENGINE = os.getenv("NAVER_ENGINE", "async").lower()          # async | threaded
+NAVER_CONCURRENCY = int(os.getenv("NAVER_CONCURRENCY", "6"))       # 호스트별 동시 요청 수
+NAVER_RATE = float(os.getenv("NAVER_RATE", "5"))                   # 호스트별 초기 초당 요청 수 (이후 AIMD 조절)
+ARTICLE_CACHE = os.getenv("ARTICLE_CACHE", "true").lower() in ("1", "true", "yes")
+ARTICLE_CACHE_PATH = Path(os.getenv("ARTICLE_CACHE_PATH", BASE_DIR / "cache" / "naver_articles.sqlite"))
+ARTICLE_CACHE_MAX_MB = int(os.getenv("ARTICLE_CACHE_MAX_MB", "512"))
+ARTICLE_CACHE_MAX_DAYS = float(os.getenv("ARTICLE_CACHE_MAX_DAYS", "180"))
+NAVER_STATE_PATH = Path(os.getenv("NAVER_STATE_PATH", BASE_DIR / "cache" / "naver_hwm.json"))
+INCREMENTAL_MAX_PAGES = int(os.getenv("NAVER_INCREMENTAL_MAX_PAGES", "30"))   # 증분 1회 섹션별 최대 페이지
+ENRICH_CHUNK = int(os.getenv("NAVER_ENRICH_CHUNK", "500"))   # 본문 수집 시 한 번에 메모리에 올리는 입력 행 수
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", default_workers()))   # 파싱 프로세스 수 (0 = 수집 스레드에서 파싱)
+PARSE_QUEUE = int(os.getenv("PARSE_QUEUE", "64"))                   # 파싱 대기 작업 상한 (가득 차면 수집 대기)
 
 # =====================================================
 # 기본 상수
 # =====================================================
-BASE = "https://finance.naver.com"
+# 로컬 stand-in 서버 등으로 바꿀 때만 지정 (benchmarks/bench_crawlers.py)
+BASE = os.getenv("NAVER_BASE_URL", "https://finance.naver.com").rstrip("/")
+ARTICLE_BASE = os.getenv("NAVER_ARTICLE_BASE_URL", "https://n.news.naver.com").rstrip("/")
 PATH = "/news/news_list.naver"
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -73,6 +98,18 @@ SECTION3_MAP = {
     404: "채권", 406: "공시", 429: "환율",
 }
 
+LIST_WORKERS = int(os.getenv("NAVER_LIST_WORKERS", "4"))          # threaded 엔진 목록 수집 스레드
+ARTICLE_WORKERS = int(os.getenv("NAVER_ARTICLE_WORKERS", "6"))    # threaded 엔진 본문 수집 스레드
+
+# 목록 · 본문 HTML 파싱 누적 시간 (성능 지표용)
+PARSE_TIMER = Timer()
+# 목록 · 본문 디코딩 + 파싱 프로세스 풀 (첫 작업 시 워커 생성)
+PARSER = ParsePool(PARSE_WORKERS, PARSE_QUEUE, timer=PARSE_TIMER)
+
+# 목록/본문 공용 keep-alive 풀 (재시도 · Retry-After · 통계 · 호스트별 속도 제한은 HttpClient 담당)
+CLIENT = HttpClient(pool_size=max(LIST_WORKERS, ARTICLE_WORKERS, NAVER_CONCURRENCY), headers=HEADERS,
+                    rate=NAVER_RATE)
+
 PATTERN = re.compile(
     r'<dd class="articleSubject">\s*'
     r'<a href="([^"]+)"[^>]*title="([^"]+)">[^<]+</a>\s*</dd>\s*'
@@ -92,17 +129,15 @@ def build_url(date: str, page: int, section3: int) -> str:
     return f"{BASE}{PATH}?{urlencode({'mode':'LSS3D','section_id':'101','section_id2':'258','section_id3':str(section3),'date':date,'page':page})}"
 
 def parse_max_page(html_text: str) -> int:
-    soup = BeautifulSoup(html_text, "lxml")
-    nums = [int(m.group(1)) for a in soup.find_all("a", href=re.compile(r"page=\d+"))
-            if (m := re.search(r"page=(\d+)", a.get("href", "")))]
-    return max(set(nums)) if nums else 1
+    with PARSE_TIMER.time():
+        return max_link_number(html_text, r"page=(\d+)")
 
 def normalize_news_url(raw_href: str) -> Tuple[str, str, str]:
     href = html.unescape(raw_href or "")
     m = re.search(r"/mnews/article/(\d{3})/(\d+)", href)
     if m:
         oid, aid = m.group(1), m.group(2)
-        return oid, aid, f"https://n.news.naver.com/mnews/article/{oid}/{aid}"
+        return oid, aid, f"{ARTICLE_BASE}/mnews/article/{oid}/{aid}"
     p = urlparse(href)
     qs = parse_qs(p.query)
     for oid, aid in [
@@ -110,30 +145,25 @@ def normalize_news_url(raw_href: str) -> Tuple[str, str, str]:
         (qs.get("office_id", [None])[0], qs.get("article_id", [None])[0]),
     ]:
         if oid and aid:
-            return oid, aid, f"https://n.news.naver.com/mnews/article/{oid}/{aid}"
+            return oid, aid, f"{ARTICLE_BASE}/mnews/article/{oid}/{aid}"
     return "", "", urljoin(BASE, href)
 
 # =====================================================
 # HTML 수집
 # =====================================================
-def fetch_one(date: str, page: int, section3: int, timeout=(5, 15), verify=False, retries: int = 3) -> str:
+def fetch_list_page(date: str, page: int, section3: int, timeout=(5, 15), verify=False) -> bytes:
+    """목록 1페이지 응답 bytes (디코딩 · 파싱은 호출 측)"""
     url = build_url(date, page, section3)
-    backoff = 1.0
-    for attempt in range(retries):
-        try:
-            resp = requests.get(url, headers=HEADERS, timeout=timeout, verify=verify)
-            if resp.status_code in (429,) or 500 <= resp.status_code < 600:
-                time.sleep(backoff + random.random())
-                backoff *= 2
-                continue
-            resp.raise_for_status()
-            return decode_euckr(resp.content)
-        except Exception as e:
-            log.warning(f"[WARN] attempt {attempt+1} fail {url}: {e}")
-            if attempt == retries - 1:
-                raise
-            time.sleep(backoff + random.random())
-            backoff *= 2
+    try:
+        resp = CLIENT.get(url, timeout=timeout, verify=verify)
+        resp.raise_for_status()
+    except Exception as e:
+        log.warning(f"[WARN] fetch fail {url}: {e}")
+        raise
+    return resp.content
+
+def fetch_one(date: str, page: int, section3: int, timeout=(5, 15), verify=False) -> str:
+    return decode_euckr(fetch_list_page(date, page, section3, timeout=timeout, verify=verify))
 
 def save_html(html_text: str, date: str, page: int, section3: int, out_dir: Path = HTML_DUMP_DIR) -> str:
     out_dir.mkdir(parents=True, exist_ok=True)
@@ -145,14 +175,21 @@ def save_html(html_text: str, date: str, page: int, section3: int, out_dir: Path
 # =====================================================
 # HTML 저장 및 CSV 집계
 # =====================================================
-def save_all_with_sleep_multi(date: str, section3_list: List[int], out_dir: Path = HTML_DUMP_DIR, concurrency: int = 4):
+def make_engine() -> AsyncFetchEngine:
+    """
+    공용 limiter 가 켜져 있으면 초당 요청 수는 limiter(AIMD) 에 맡기고 engine 은 동시성만 제한.
+    (engine 의 고정 rate 까지 걸면 limiter 가 올린 속도를 쓰지 못함)
+    """
+    return AsyncFetchEngine(NAVER_CONCURRENCY, 0 if CLIENT.limiter is not None else NAVER_RATE)
+
+def save_all_with_sleep_multi(date: str, section3_list: List[int], out_dir: Path = HTML_DUMP_DIR, concurrency: int = LIST_WORKERS):
     out_dir.mkdir(parents=True, exist_ok=True)
     saved_all = []
     max_pages_map = {}
     for s in section3_list:
         html_text = fetch_one(date, 1, s)
         max_page = parse_max_page(html_text)
-        save_html(html_text, date, 1, section3=s)
+        save_html(html_text, date, 1, section3=s, out_dir=out_dir)
         max_pages_map[s] = max_page
         log.info(f"Section {s}({SECTION3_MAP.get(s)}) → {max_page} pages")
 
@@ -163,16 +200,43 @@ def save_all_with_sleep_multi(date: str, section3_list: List[int], out_dir: Path
             s, p = futs[fut]
             try:
                 html_text = fut.result()
-                saved_all.append(save_html(html_text, date, p, section3=s))
+                saved_all.append(save_html(html_text, date, p, section3=s, out_dir=out_dir))
             except Exception as e:
                 log.warning(f"[WARN] s{s} p{p} fail: {e}")
     return saved_all
 
-def parse_one_file(path: Path) -> list[dict]:
-    m = re.search(r"_s(\d+)_p(\d+)\.html$", path.name)
-    section3 = int(m.group(1)) if m else None
+def save_all_async(date: str, section3_list: List[int], out_dir: Path = HTML_DUMP_DIR,
+                   engine: Optional[AsyncFetchEngine] = None):
+    """save_all_with_sleep_multi 의 asyncio 버전 (섹션 1페이지도 동시에 수집)"""
+    engine = engine or make_engine()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    saved_all = []
+
+    firsts = engine.map(fetch_one, [(build_url(date, 1, s), (date, 1, s)) for s in section3_list],
+                        desc="fetch first pages")
+    tasks = []
+    for s, html_text in zip(section3_list, firsts):
+        if isinstance(html_text, Exception):
+            raise html_text
+        max_page = parse_max_page(html_text)
+        saved_all.append(save_html(html_text, date, 1, section3=s, out_dir=out_dir))
+        tasks.extend((s, p) for p in range(2, max_page + 1))
+        log.info(f"Section {s}({SECTION3_MAP.get(s)}) → {max_page} pages")
+
+    pages = engine.map(fetch_one, [(build_url(date, p, s), (date, p, s)) for s, p in tasks],
+                       desc="fetch pages")
+    for (s, p), html_text in zip(tasks, pages):
+        if isinstance(html_text, Exception):
+            log.warning(f"[WARN] s{s} p{p} fail: {html_text}")
+            continue
+        saved_all.append(save_html(html_text, date, p, section3=s, out_dir=out_dir))
+    return saved_all
+
+def list_source_name(date: str, page: int, section3: int) -> str:
+    return f"naver_news_list_{date}_s{section3}_p{page}.html"
+
+def list_rows(text: str, section3: Optional[int], source_name: str) -> list[dict]:
     section_name = SECTION3_MAP.get(section3, "")
-    text = path.read_text(encoding="euc-kr", errors="replace")
     items = []
     for href, title, press, wdate in PATTERN.findall(text):
         oid, aid, norm_url = normalize_news_url(href)
@@ -180,94 +244,487 @@ def parse_one_file(path: Path) -> list[dict]:
             "section_name": section_name, "section_id3": section3,
             "office_id": oid, "article_id": aid, "url": norm_url,
             "title": html.unescape(title).strip(), "press": html.unescape(press).strip(),
-            "wdate": html.unescape(wdate).strip(), "source_file": path.name,
+            "wdate": html.unescape(wdate).strip(), "source_file": source_name,
         })
     return items
 
-def aggregate_news_multi(date: str, in_dir: Path, out_dir: Path) -> str:
+def parse_list_html(text: str, section3: Optional[int], source_name: str) -> list[dict]:
+    with PARSE_TIMER.time():
+        return list_rows(text, section3, source_name)
+
+def parse_list_page(content: bytes, date: str, page: int, section3: int) -> Tuple[int, list[dict]]:
+    """목록 응답 bytes → (max_page, rows) — 파싱 풀 워커에서 실행, max_page 는 1페이지에서만 계산"""
+    text = decode_euckr(content)
+    max_page = max_link_number(text, r"page=(\d+)") if page == 1 else 0
+    return max_page, list_rows(text, section3, list_source_name(date, page, section3))
+
+def parse_one_file(path: Path) -> list[dict]:
+    m = re.search(r"_s(\d+)_p(\d+)\.html$", path.name)
+    section3 = int(m.group(1)) if m else None
+    text = path.read_text(encoding="euc-kr", errors="replace")
+    return parse_list_html(text, section3, path.name)
+
+NEWS_FIELDS = [
+    "section_name","section_id3","office_id","article_id","url",
+    "title","press","wdate","source_file"
+]
+
+def write_news_csv(all_rows: List[dict], date: str, out_dir: Path) -> str:
     out_dir.mkdir(parents=True, exist_ok=True)
-    files = sorted(in_dir.glob(f"naver_news_list_{date}_s*_p*.html"))
-    all_rows = []
-    for fp in tqdm(files, desc="parse html", unit="file"):
-        all_rows.extend(parse_one_file(fp))
     deduped = { (r["url"], r["title"]): r for r in all_rows }.values()
     out_path = out_dir / f"naver_news_{date}.csv"
     with out_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=[
-            "section_name","section_id3","office_id","article_id","url",
-            "title","press","wdate","source_file"
-        ])
+        writer = csv.DictWriter(f, fieldnames=NEWS_FIELDS)
         writer.writeheader()
         writer.writerows(deduped)
     log.info(f"[DONE] {len(deduped)} rows → {out_path}")
     return str(out_path)
 
+def aggregate_news_multi(date: str, in_dir: Path, out_dir: Path) -> str:
+    files = sorted(in_dir.glob(f"naver_news_list_{date}_s*_p*.html"))
+    all_rows = []
+    for fp in tqdm(files, desc="parse html", unit="file"):
+        all_rows.extend(parse_one_file(fp))
+    return write_news_csv(all_rows, date, out_dir)
+
 # =====================================================
-# 기사 본문 수집 + 정리
+# 목록 스트리밍 수집 (html_dump 왕복 없이 수집 즉시 파싱)
 # =====================================================
-def fetch_article_text(url: str, retries=3) -> str:
-    for _ in range(retries):
+def fetch_and_parse(date: str, page: int, section3: int, dump_dir: Optional[Path] = None) -> Future:
+    """목록 1페이지를 받아 파싱 풀에 넘김 → (max_page, rows) Future (수집 스레드는 바로 다음 요청)"""
+    content = fetch_list_page(date, page, section3)
+    if dump_dir is not None:
+        save_html(decode_euckr(content), date, page, section3=section3, out_dir=dump_dir)
+    return PARSER.submit(parse_list_page, content, date, page, section3)
+
+def _fetch_parse_many(jobs: List[Tuple[int, int]], date: str, dump_dir: Optional[Path],
+                      engine: Optional[AsyncFetchEngine], desc: str) -> list:
+    """jobs=[(section3, page)] → 입력 순서대로 (max_page, rows) 또는 Exception"""
+    if engine is not None:
+        futs = engine.map(fetch_and_parse,
+                          [(build_url(date, p, s), (date, p, s, dump_dir)) for s, p in jobs], desc=desc)
+    else:
+        futs = [None] * len(jobs)
+        with ThreadPoolExecutor(max_workers=LIST_WORKERS) as ex:
+            fetches = {ex.submit(fetch_and_parse, date, p, s, dump_dir): i for i, (s, p) in enumerate(jobs)}
+            for fut in tqdm(as_completed(fetches), total=len(fetches), desc=desc):
+                try:
+                    futs[fetches[fut]] = fut.result()
+                except Exception as e:
+                    futs[fetches[fut]] = e
+    results = []
+    for fut in futs:
         try:
-            res = requests.get(url, headers=HEADERS, timeout=(5, 15), verify=False)
-            if res.status_code >= 400:
-                return ""
-            res.encoding = res.apparent_encoding or "utf-8"
-            soup = BeautifulSoup(res.text, "lxml")
-            dic = soup.select_one("div#dic_area") or soup.find("article")
-            return dic.get_text(" ", strip=True) if dic else ""
-        except Exception:
-            time.sleep(1)
-    return ""
+            results.append(fut if isinstance(fut, Exception) else fut.result())
+        except Exception as e:
+            results.append(e)
+    return results
 
-def enrich_csv_with_contents_threaded(input_csv: str) -> str:
+def stream_news_rows(date: str, section3_list: List[int], engine: Optional[AsyncFetchEngine] = None,
+                     dump_dir: Optional[Path] = None) -> List[dict]:
+    """
+    전 섹션 목록 페이지를 수집하면서 파싱한 행 목록.
+    행 순서는 html_dump 파일명 정렬 순서와 동일 (aggregate_news_multi 와 같은 dedup 결과).
+    dump_dir 를 주면 디버그용으로 HTML 도 저장.
+    """
+    pages = {}
+    firsts = _fetch_parse_many([(s, 1) for s in section3_list], date, dump_dir, engine, "fetch first pages")
+    tasks = []
+    for s, res in zip(section3_list, firsts):
+        if isinstance(res, Exception):
+            raise res
+        max_page, rows = res
+        pages[list_source_name(date, 1, s)] = rows
+        tasks.extend((s, p) for p in range(2, max_page + 1))
+        log.info(f"Section {s}({SECTION3_MAP.get(s)}) → {max_page} pages")
+
+    for (s, p), res in zip(tasks, _fetch_parse_many(tasks, date, dump_dir, engine, "fetch+parse pages")):
+        if isinstance(res, Exception):
+            log.warning(f"[WARN] s{s} p{p} fail: {res}")
+            continue
+        pages[list_source_name(date, p, s)] = res[1]
+
+    return [r for name in sorted(pages) for r in pages[name]]
+
+# =====================================================
+# 기사 본문 수집 + 정리
+# =====================================================
+def fetch_article_bytes(url: str) -> Optional[bytes]:
+    """기사 응답 bytes (요청 실패 · 4xx/5xx 는 None)"""
+    try:
+        res = CLIENT.get(url, timeout=(5, 15))
+    except Exception as e:
+        log.warning(f"[WARN] article fail {url}: {e}")
+        return None
+    if res.status_code >= 400:
+        return None
+    return res.content
+
+def extract_article(content: bytes) -> str:
+    """기사 응답 bytes → 본문 텍스트 (인코딩은 내용으로 추정) — 파싱 풀 워커에서 실행"""
+    dic = first_node(parse_html(decode_body(content)), "//div[@id='dic_area']", "//article")
+    return node_text(dic, sep=" ")
+
+def fetch_article_text(url: str) -> str:
+    content = fetch_article_bytes(url)
+    if content is None:
+        return ""
+    with PARSE_TIMER.time():
+        return extract_article(content)
+
+def fetch_article_future(url: str, then=None) -> Future:
+    """기사를 받아 본문 추출은 파싱 풀에 넘김 → 본문 Future (실패는 빈 본문)"""
+    content = fetch_article_bytes(url)
+    if content is None:
+        if then is not None:
+            then("")
+        return completed("")
+    return PARSER.submit(extract_article, content, then=then)
+
+def article_text(fut) -> str:
+    """engine.map · 스레드 결과(Future 또는 Exception) → 본문 (파싱 실패도 빈 본문)"""
+    try:
+        return "" if isinstance(fut, Exception) else fut.result()
+    except Exception as e:
+        log.warning(f"[WARN] article parse fail: {e}")
+        return ""
+
+# =====================================================
+# 기사 본문 캐시
+# =====================================================
+def open_article_cache() -> Optional[ArticleCache]:
+    if not ARTICLE_CACHE:
+        return None
+    return ArticleCache(ARTICLE_CACHE_PATH, max_bytes=ARTICLE_CACHE_MAX_MB * 1024 * 1024,
+                        max_age_days=ARTICLE_CACHE_MAX_DAYS)
+
+def fill_from_cache(rows: List[dict], cache: Optional[ArticleCache]) -> List[int]:
+    """캐시에 있는 본문은 채우고, 네트워크로 받아야 할 행 인덱스를 반환"""
+    todo = []
+    for i, r in enumerate(rows):
+        text = cache.get(r.get("office_id"), r.get("article_id")) if cache else None
+        if text is None:
+            r["contents"] = ""
+            todo.append(i)
+        else:
+            r["contents"] = text
+    return todo
+
+def store_to_cache(rows: List[dict], idx: List[int], cache: Optional[ArticleCache]):
+    """받아 온 본문만 저장 (실패한 빈 본문은 다음 실행에서 다시 수집)"""
+    if not cache:
+        return
+    for i in idx:
+        if rows[i]["contents"]:
+            cache.put(rows[i].get("office_id"), rows[i].get("article_id"), rows[i]["contents"])
+
+def close_article_cache(cache: Optional[ArticleCache]):
+    if not cache:
+        return
+    cache.evict()
+    log.info(f"🗃 기사 캐시 {cache.stats()}")
+    cache.close()
+
+def fetch_into(row: dict, done) -> Future:
+    """row 에 본문을 채우고 done(row) 호출 (저널 기록 — 파싱이 끝나는 즉시) → 완료 Future"""
+    def fill(text: str):
+        row["contents"] = text
+        done(row)
+    return fetch_article_future(row["url"], then=fill)
+
+def fetch_contents(rows: List[dict], engine: Optional[AsyncFetchEngine] = None) -> List[dict]:
+    """rows 에 기사 본문(contents) 채움 — 캐시 우선, engine 없으면 기존 스레드 방식"""
+    cache = open_article_cache()
+    todo = fill_from_cache(rows, cache)
+    if engine is not None:
+        futs = engine.map(fetch_article_future, [(rows[i]["url"], (rows[i]["url"],)) for i in todo],
+                          desc="fetch articles")
+    else:
+        with ThreadPoolExecutor(max_workers=ARTICLE_WORKERS) as ex:
+            futs = list(tqdm(ex.map(fetch_article_future, [rows[i]["url"] for i in todo]),
+                             total=len(todo), desc="fetch articles"))
+    for i, fut in zip(todo, futs):
+        rows[i]["contents"] = article_text(fut)
+    store_to_cache(rows, todo, cache)
+    close_article_cache(cache)
+    return rows
+
+# =====================================================
+# 본문 포함 파일 (체크포인트 저널 → 최종 파일)
+# =====================================================
+def row_key(r: dict) -> str:
+    """목록 dedup 키와 동일 (url, title)"""
+    return f"{r['url']}\t{r['title']}"
+
+def journal_path(out_path: Path) -> Path:
+    return out_path.with_name(f"{out_path.stem}.journal.jsonl")
+
+def read_chunks(path: Path, size: int = ENRICH_CHUNK):
+    """입력 CSV 를 size 행씩 (fieldnames, rows) 로 읽음"""
+    with path.open("r", newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        chunk = []
+        for r in reader:
+            chunk.append(r)
+            if len(chunk) >= size:
+                yield reader.fieldnames, chunk
+                chunk = []
+        yield reader.fieldnames or NEWS_FIELDS, chunk
+
+def _enrich_csv(input_csv: str, engine: Optional[AsyncFetchEngine]) -> str:
+    """
+    입력 CSV 를 ENRICH_CHUNK 행씩 읽어 저널에 없는 기사만 본문 수집 → 완료 행은 저널에 바로 기록.
+    재시작(Prefect 재시도 · 수동 재실행) 시 저널 완료분은 건너뛰고, 끝나면 입력 순서대로 최종 파일 생성.
+    본문을 받지 못한 행은 저널에 남기지 않음 (재시작 시 다시 수집, 최종 파일에는 빈 contents)
+    """
     in_path = Path(input_csv)
-    out_path = in_path.with_name(in_path.stem + "_with_contents.csv")
-    rows = list(csv.DictReader(in_path.open("r", encoding="utf-8")))
-    for r in rows:
-        r["contents"] = ""
-    with ThreadPoolExecutor(max_workers=6) as ex:
-        fut_map = {ex.submit(fetch_article_text, r["url"]): i for i, r in enumerate(rows)}
-        for fut in tqdm(as_completed(fut_map), total=len(fut_map), desc="fetch articles"):
-            i = fut_map[fut]
-            rows[i]["contents"] = fut.result()
-            time.sleep(random.uniform(0.3, 1.0))
-    fieldnames = list(rows[0].keys())
-    with out_path.open("w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
-    log.info(f"[DONE] 본문 포함 CSV 완료 → {out_path}")
+    out_path = table_path(in_path.with_name(in_path.stem + "_with_contents"))
+    journal = Journal(journal_path(out_path), key=row_key, meta={"input": in_path.name})
+    if journal.resumed:
+        log.info(f"♻️ 저널 재개: 본문 {journal.resumed}건 완료 → 나머지만 수집")
+
+    def done(r: dict):
+        if r["contents"]:
+            journal.append(r)
+
+    try:
+        cache = open_article_cache()
+        for fieldnames, chunk in read_chunks(in_path):
+            rows = [r for r in chunk if row_key(r) not in journal]
+            todo = fill_from_cache(rows, cache)
+            for r in rows:
+                done(r)                 # 캐시 적중분 (빈 본문은 done 에서 제외)
+            fetched = [rows[i] for i in todo]
+            if engine is not None:
+                futs = engine.map(fetch_into, [(r["url"], (r, done)) for r in fetched], desc="fetch articles")
+            else:
+                with ThreadPoolExecutor(max_workers=ARTICLE_WORKERS) as ex:
+                    fetches = [ex.submit(fetch_into, r, done) for r in fetched]
+                    for fut in tqdm(as_completed(fetches), total=len(fetches), desc="fetch articles"):
+                        fut.result()
+                    futs = [f.result() for f in fetches]
+            # 파싱 · 저널 기록 완료 대기 (파싱 실패 행은 빈 본문 → 다음 실행에서 다시 수집)
+            for r, fut in zip(fetched, futs):
+                if isinstance(fut, Future) and fut.exception() is not None:
+                    log.warning(f"[WARN] article parse fail {r['url']}: {fut.exception()}")
+            store_to_cache(fetched, range(len(fetched)), cache)
+        close_article_cache(cache)
+
+        # 저널 → 최종 파일 (입력 순서, 메모리에는 ENRICH_CHUNK 행 이하)
+        fieldnames = [*fieldnames, *(["contents"] if "contents" not in fieldnames else [])]
+        rows = (journal.get(row_key(r)) or {**r, "contents": ""}
+                for _, chunk in read_chunks(in_path) for r in chunk)
+        write_row_stream(rows, out_path, fieldnames, schema="naver_news", encoding="utf-8")
+        journal.remove()
+    finally:
+        journal.close()       # 실패 시 완료분은 저널에 남아 다음 실행이 이어받음
+    log.info(f"[DONE] 본문 포함 파일 완료 → {out_path}")
     return str(out_path)
 
+def enrich_csv_with_contents_threaded(input_csv: str) -> str:
+    return _enrich_csv(input_csv, engine=None)
+
+def enrich_csv_with_contents_async(input_csv: str, engine: Optional[AsyncFetchEngine] = None) -> str:
+    """enrich_csv_with_contents_threaded 의 asyncio 버전 (속도 제어는 engine limiter 가 담당)"""
+    return _enrich_csv(input_csv, engine=engine or make_engine())
+
+# =====================================================
+# 증분 수집 (섹션별 high-water mark 이후 새 기사만)
+# =====================================================
+def contents_path(date: str, out_dir: Path = OUT_DIR) -> Path:
+    return table_path(out_dir / f"naver_news_{date}_with_contents")
+
+
+def find_output(date: str) -> Optional[Path]:
+    """date 의 본문 포함 최종 파일 (형식 무관, 없으면 None)"""
+    return find_table(OUT_DIR / f"naver_news_{date}_with_contents")
+
+# backfill 로 여러 날짜를 한 프로세스에서 동시에 수집할 때 상태 파일 갱신 직렬화
+_HWM_LOCK = threading.Lock()
+
+def load_hwm(path: Path = NAVER_STATE_PATH) -> dict:
+    """{date: {section3: {office_id, article_id, url, wdate}}}"""
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception as e:
+        log.warning(f"[WARN] high-water mark 로드 실패 → 처음부터 수집: {e}")
+        return {}
+
+def save_hwm(state: dict, path: Path = NAVER_STATE_PATH, keep_days: int = 7):
+    state = {d: state[d] for d in sorted(state)[-keep_days:]}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+def update_hwm(state: dict, date: str, rows: List[dict]) -> dict:
+    """섹션별 가장 최신(wdate 최대, 동률이면 목록상 앞선) 기사를 기록"""
+    marks = state.setdefault(date, {})
+    newest = {}
+    for r in rows:
+        sec = str(r["section_id3"])
+        if sec not in newest or r["wdate"] > newest[sec]["wdate"]:
+            newest[sec] = r
+    for sec, r in newest.items():
+        if sec not in marks or r["wdate"] >= marks[sec]["wdate"]:
+            marks[sec] = {k: r[k] for k in ("office_id", "article_id", "url", "wdate")}
+    return state
+
+def known_urls(path: Path) -> set:
+    if not path.exists():
+        return set()
+    return set(read_table(path, columns=["url"], dtype=str)["url"].dropna())
+
+def poll_section(date: str, section3: int, mark: Optional[dict], known: set,
+                 max_pages: int = INCREMENTAL_MAX_PAGES) -> Tuple[List[dict], int]:
+    """
+    1페이지(최신)부터 넘기며 이미 본 기사(mark 또는 known)를 만나면 중단.
+    (새 기사 행, 요청 페이지 수) 반환
+    """
+    new_rows, last_page, page = [], max_pages, 0
+    while page < last_page:
+        page += 1
+        html_text = fetch_one(date, page, section3)
+        if page == 1:
+            last_page = min(max_pages, parse_max_page(html_text))
+        rows = parse_list_html(html_text, section3, list_source_name(date, page, section3))
+        if not rows:
+            break
+        for r in rows:
+            if mark and (r["url"] == mark["url"] or r["wdate"] < mark["wdate"]):
+                return new_rows, page
+            if r["url"] in known:
+                return new_rows, page
+            new_rows.append(r)
+    return new_rows, page
+
+def run_incremental(date: str, section3_list: List[int], engine: Optional[AsyncFetchEngine] = None,
+                    out_dir: Path = OUT_DIR, perf: Optional[StageMetrics] = None) -> Tuple[str, int]:
+    """새 기사만 목록 수집 → 본문 수집 → 당일 본문 포함 파일에 이어쓰기. (경로, 추가 행 수) 반환"""
+    perf = perf or StageMetrics("naver_news_incremental", date, client=CLIENT, parse=PARSE_TIMER)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_path = contents_path(date, out_dir)
+    state = load_hwm()
+    marks = state.get(date, {})
+    known = known_urls(out_path)
+
+    new_rows = []
+    with perf.phase("list") as p:
+        for s in section3_list:
+            rows, pages = poll_section(date, s, marks.get(str(s)), known)
+            seen = set()
+            rows = [r for r in rows if (r["url"], r["title"]) not in seen and not seen.add((r["url"], r["title"]))]
+            known.update(r["url"] for r in rows)
+            new_rows.extend(rows)
+            log.info(f"📡 Section {s}({SECTION3_MAP.get(s)}) → +{len(rows)} rows ({pages} pages)")
+        p["rows"] = len(new_rows)
+
+    if new_rows:
+        with perf.phase("articles") as p:
+            fetch_contents(new_rows, engine=engine)
+            append_rows(new_rows, out_path, NEWS_FIELDS + ["contents"], schema="naver_news", encoding="utf-8")
+            p["rows"] = len(new_rows)
+        save_hwm(update_hwm(state, date, new_rows))
+    log.info(f"[DONE] 증분 {len(new_rows)} rows → {out_path}")
+    return str(out_path), len(new_rows)
+
 def cleanup_html_dump(dump_dir: Path = HTML_DUMP_DIR):
     if dump_dir.exists():
         shutil.rmtree(dump_dir)
         log.info(f"[CLEANUP] Deleted folder: {dump_dir}")
 
+# =====================================================
+# 전체 실행
+# =====================================================
+def run(target_date: str, engine_name: str = NAVER_ENGINE, list_mode: str = "stream",
+        dump_html: bool = False, mode: str = "daily") -> str:
+    """
+    Naver 뉴스 수집 전체 실행 (스크립트 / in-process Prefect task 공용).
+    본문 포함 최종 파일 경로 반환.
+    파싱 풀은 모듈 전역 공유 → backfill 로 동시에 도는 run 이 모두 끝날 때 (실패해도) 워커 종료.
+    """
+    with PARSER.session():
+        return _run(target_date, engine_name, list_mode, dump_html, mode)
+
+
+def _run(target_date: str, engine_name: str, list_mode: str, dump_html: bool, mode: str) -> str:
+    ensure_dirs(OUT_DIR)
+    sections = list(SECTION3_MAP)
+    log.info(f"⚙️ 수집 엔진: {engine_name}")
+    engine = make_engine() if engine_name == "async" else None
+
+    if mode == "incremental":
+        perf = StageMetrics("naver_news_incremental", target_date, client=CLIENT, parse=PARSE_TIMER)
+        final_path, _ = run_incremental(target_date, sections, engine=engine, perf=perf)
+        log.info(f"🌐 HTTP {CLIENT.metrics.summary()}")
+        log.info(f"🚦 {CLIENT.rate_summary()}")
+        log.info(f"🧩 {PARSER.summary()}")
+        log.info(f"⏱️ 성능 지표 → {perf.save()}")
+        log.info(f"[✅] Naver 뉴스 증분 수집 완료 ({target_date})")
+        return final_path
+
+    perf = StageMetrics("naver_news", target_date, client=CLIENT, parse=PARSE_TIMER)
+    with perf.phase("list") as p:
+        if list_mode == "stream":
+            dump_dir = HTML_DUMP_DIR if dump_html else None
+            rows = stream_news_rows(target_date, sections, engine=engine, dump_dir=dump_dir)
+            csv_path = write_news_csv(rows, target_date, out_dir=OUT_DIR)
+        else:
+            if engine is not None:
+                save_all_async(target_date, sections, engine=engine)
+            else:
+                save_all_with_sleep_multi(target_date, sections)
+            csv_path = aggregate_news_multi(target_date, in_dir=HTML_DUMP_DIR, out_dir=OUT_DIR)
+        p["rows"] = n_rows = count_rows(csv_path)
+
+    with perf.phase("articles") as p:
+        if engine is not None:
+            final_csv = enrich_csv_with_contents_async(csv_path, engine=engine)
+        else:
+            final_csv = enrich_csv_with_contents_threaded(csv_path)
+        p["rows"] = n_rows
+
+    # 이후 증분 수집이 일괄 수집 결과 이후부터 이어지도록 기록
+    with open(csv_path, newline="", encoding="utf-8") as f, _HWM_LOCK:
+        save_hwm(update_hwm(load_hwm(), target_date, list(csv.DictReader(f))))
+
+    if list_mode == "files":
+        cleanup_html_dump()
+    elif dump_html:
+        log.info(f"🐞 목록 HTML 보존 (--dump-html): {HTML_DUMP_DIR}")
+
+    # ✅ 중간 CSV 삭제/보존 제어
+    if KEEP_TEMP:
+        log.info(f"🗂 중간 파일 보존 (.env KEEP_TEMP=true): {Path(csv_path).name}")
+    else:
+        os.remove(csv_path)
+        log.info(f"🧹 중간 파일 삭제 완료: {Path(csv_path).name}")
+
+    log.info(f"🌐 HTTP {CLIENT.metrics.summary()}")
+    log.info(f"🚦 {CLIENT.rate_summary()}")
+    log.info(f"🧩 {PARSER.summary()}")
+    log.info(f"⏱️ 성능 지표 → {perf.save()}")
+    log.info(f"[✅] Naver 뉴스 파이프라인 완료 ({target_date})")
+    return final_csv
+
 # =====================================================
 # 메인 실행
 # =====================================================
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--date", type=str, default=time.strftime("%Y%m%d"))
+    parser.add_argument("--engine", choices=["async", "threaded"], default=NAVER_ENGINE)
+    parser.add_argument("--list-mode", choices=["stream", "files"], default="stream")
+    parser.add_argument("--dump-html", action="store_true", help="목록 HTML 을 html_dump/ 에 저장 (디버그)")
+    parser.add_argument("--mode", choices=["daily", "incremental"], default="daily",
+                        help="incremental: 섹션별 high-water mark 이후 새 기사만 당일 파일에 추가")
     args = parser.parse_args()
+    setup_logging("naver_news", LOG_DIR)
     try:
-        target_date = args.date
-        sections = [401, 402, 403, 404, 406, 429]
-        save_all_with_sleep_multi(target_date, sections)
-        csv_path = aggregate_news_multi(target_date, in_dir=HTML_DUMP_DIR, out_dir=OUT_DIR)
-        final_csv = enrich_csv_with_contents_threaded(csv_path)
-        cleanup_html_dump()
-
-        # ✅ 중간 CSV 삭제/보존 제어
-        if KEEP_TEMP:
-            log.info(f"🗂 중간 파일 보존 (.env KEEP_TEMP=true): {Path(csv_path).name}")
-        else:
-            os.remove(csv_path)
-            log.info(f"🧹 중간 파일 삭제 완료: {Path(csv_path).name}")
-
-        log.info(f"[✅] Naver 뉴스 파이프라인 완료 ({target_date})")
-
+        run(args.date, engine_name=args.engine, list_mode=args.list_mode,
+            dump_html=args.dump_html, mode=args.mode)
     except Exception as e:
         log.exception(f"❌ 실행 중 오류 발생: {e}")
         sys.exit(1)
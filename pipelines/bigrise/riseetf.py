@@ -6,17 +6,21 @@ RISE ETF 구성내역 크롤러 (Prefect 파이프라인 대응 버전)
 - ETF Finder 페이지에서 목록 및 각 ETF 보유 종목(tab3) 크롤링
 - 구성내역 JSON → flatten CSV 변환
 - .env 기반 KEEP_TEMP 설정 지원 (중간파일 자동삭제)
+- .env 기반 OUTPUT_FORMAT(csv | parquet) 로 최종 flatten 파일 형식 선택
 - 경로 구조: project-root/out/riseETF/, project-root/logs/
+- 스냅샷 전용: 사이트가 현재 구성내역만 제공 → 오늘 이외의 --date 는 SnapshotOnlyError
+- 성능 지표: 목록(list) · 구성내역(holdings) · flatten 구간별 HTTP · 파싱 시간 · 행 수 → out/metrics
+- 파싱 분리: 구성내역 수집 스레드는 응답 bytes 만 받고 디코딩 · 파싱은 프로세스 풀(parse_pool)이 담당
+  (.env PARSE_WORKERS · PARSE_QUEUE, naver_news 와 동일)
 """
 
-import os, csv, json, time, logging, sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import argparse, os, csv, json, logging, sys
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from urllib.parse import urljoin
-from datetime import datetime
 from pathlib import Path
+from typing import Optional
 from tqdm import tqdm
 from dotenv import load_dotenv
-import requests
 from bs4 import BeautifulSoup
 import urllib3
 
@@ -24,24 +28,22 @@ import urllib3
 # 경로 설정 (Prefect 환경 호환)
 # =====================================================
 BASE_DIR = Path(__file__).resolve().parents[2]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from pipelines.common.html_extract import table_rows
+from pipelines.common.http_client import HttpClient
+from pipelines.common.parse_pool import ParsePool, completed, decode_body, default_workers
+from pipelines.common.perf import StageMetrics, Timer
+from pipelines.common.runtime import ensure_dirs, setup_logging, snapshot_date
+from pipelines.common.storage import count_rows, find_table, table_path, write_rows
+
 OUT_DIR = BASE_DIR / "out" / "riseETF"
 LOG_DIR = BASE_DIR / "logs"
+# 과거 날짜 수집 불가 (backfill 에서 snapshot-only 로 표시)
+SNAPSHOT_ONLY = True
 
-OUT_DIR.mkdir(parents=True, exist_ok=True)
-LOG_DIR.mkdir(parents=True, exist_ok=True)
-
-# =====================================================
-# 로깅 설정
-# =====================================================
-log_path = LOG_DIR / f"riseetf_{time.strftime('%Y%m%d')}.log"
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler(log_path, encoding="utf-8"),
-        logging.StreamHandler(sys.stdout),
-    ]
-)
+# 로깅 핸들러 · 디렉토리는 실행 시점에 설정 (import 부작용 없음)
 log = logging.getLogger(__name__)
 
 # =====================================================
@@ -55,7 +57,8 @@ KEEP_TEMP = os.getenv("KEEP_TEMP", "false").lower() in ("1", "true", "yes")
 # =====================================================
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-BASE = "https://riseetf.co.kr"
+# 로컬 stand-in 서버 등으로 바꿀 때만 지정 (benchmarks/bench_crawlers.py)
+BASE = os.getenv("RISE_BASE_URL", "https://riseetf.co.kr").rstrip("/")
 URL = f"{BASE}/prod/finder"
 HEADERS = {
     "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
@@ -64,51 +67,61 @@ HEADERS = {
     "connection": "keep-alive",
     "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36"
 }
+HOLDINGS_WORKERS = int(os.getenv("RISE_WORKERS", "10"))   # 구성내역 동시 요청 수 (속도는 공용 limiter 가 조절)
+HOLDINGS_TBODY = "//tbody[@data-class='tab3PdfList']"
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", default_workers()))   # 파싱 프로세스 수 (0 = 수집 스레드에서 파싱)
+PARSE_QUEUE = int(os.getenv("PARSE_QUEUE", "64"))                   # 파싱 대기 작업 상한 (가득 차면 수집 대기)
+
+# 목록/상세 공용 keep-alive 풀 (재시도 · Retry-After · 통계 · 호스트별 속도 제한은 HttpClient 담당)
+CLIENT = HttpClient(pool_size=HOLDINGS_WORKERS, headers=HEADERS)
+# 목록 · 구성내역 HTML 파싱 누적 시간 (성능 지표용)
+PARSE_TIMER = Timer()
+# 구성내역 디코딩 + 파싱 프로세스 풀 (첫 작업 시 워커 생성)
+PARSER = ParsePool(PARSE_WORKERS, PARSE_QUEUE, timer=PARSE_TIMER)
 
 # =====================================================
 # ① ETF 기본 목록 수집
 # =====================================================
-def scrape_rise_finder() -> Path:
+def scrape_rise_finder(date: str) -> Path:
     log.info("[*] ETF Finder 페이지 수집 중 ...")
-    session = requests.Session()
     try:
-        r = session.get(URL, headers=HEADERS, timeout=20, verify=False)
+        r = CLIENT.get(URL, timeout=20)
         r.raise_for_status()
     except Exception as e:
         log.exception(f"❌ RISE ETF 페이지 요청 실패: {e}")
-        sys.exit(1)
+        raise
 
-    soup = BeautifulSoup(r.text, "html.parser")
     rows = []
-    for tr in soup.select("table tbody tr"):
-        th = tr.select_one("th")
-        if not th:
-            continue
-        name = th.get_text(strip=True)
-        onclick = th.get("onclick", "")
-        detail_path = onclick.split("'")[1] if "'" in onclick else ""
-        detail_url = urljoin(BASE, detail_path)
-
-        tds = tr.select("td")
-        if len(tds) >= 2:
-            price = tds[0].get_text(strip=True)
-            change_tag = tds[1]
-            direction = change_tag.select_one("span.blind")
-            direction_text = direction.get_text(strip=True) if direction else ""
-            change_val = change_tag.get_text(strip=True).replace(direction_text, "")
-            change = f"{direction_text} {change_val}".strip()
-        else:
-            price = change = ""
-
-        rows.append({
-            "name": name,
-            "price": price,
-            "change": change,
-            "detail_url": detail_url
-        })
-
-    today = datetime.now().strftime("%Y%m%d")
-    out_csv = OUT_DIR / f"rise_finder_{today}.csv"
+    with PARSE_TIMER.time():
+        soup = BeautifulSoup(r.text, "html.parser")
+        for tr in soup.select("table tbody tr"):
+            th = tr.select_one("th")
+            if not th:
+                continue
+            name = th.get_text(strip=True)
+            onclick = th.get("onclick", "")
+            detail_path = onclick.split("'")[1] if "'" in onclick else ""
+            detail_url = urljoin(BASE, detail_path)
+
+            tds = tr.select("td")
+            if len(tds) >= 2:
+                price = tds[0].get_text(strip=True)
+                change_tag = tds[1]
+                direction = change_tag.select_one("span.blind")
+                direction_text = direction.get_text(strip=True) if direction else ""
+                change_val = change_tag.get_text(strip=True).replace(direction_text, "")
+                change = f"{direction_text} {change_val}".strip()
+            else:
+                price = change = ""
+
+            rows.append({
+                "name": name,
+                "price": price,
+                "change": change,
+                "detail_url": detail_url
+            })
+
+    out_csv = OUT_DIR / f"rise_finder_{date}.csv"
 
     with open(out_csv, "w", newline="", encoding="utf-8-sig") as f:
         writer = csv.DictWriter(f, fieldnames=rows[0].keys())
@@ -121,40 +134,51 @@ def scrape_rise_finder() -> Path:
 # =====================================================
 # ② ETF 구성내역(tab3) 수집
 # =====================================================
-def fetch_holdings(detail_url: str):
-    """상세 페이지의 tab3 구성내역을 리스트[dict]로 반환"""
+def fetch_holdings_page(detail_url: str):
+    """상세 페이지 tab3 응답 (bytes, 헤더 인코딩) — 요청 실패면 None"""
     url = detail_url if "?" in detail_url else detail_url + "?searchFlag=viewtab3"
     try:
-        r = requests.get(url, headers=HEADERS, timeout=15, verify=False)
+        r = CLIENT.get(url, timeout=15)
         r.raise_for_status()
     except Exception as e:
         log.warning(f"⚠️ 요청 실패: {url} ({e})")
-        return []
-
-    soup = BeautifulSoup(r.text, "html.parser")
-    tbody = soup.select_one('tbody[data-class="tab3PdfList"]')
-    if not tbody:
-        return []
+        return None
+    return r.content, r.encoding
 
+def parse_holdings(content: bytes, encoding: Optional[str]) -> list:
+    """tab3 응답 bytes → 구성내역 리스트[dict] — 파싱 풀 워커에서 실행"""
     holdings = []
-    for tr in tbody.select("tr"):
-        th = tr.select_one("th")
-        tds = tr.select("td")
+    for th, tds in table_rows(decode_body(content, encoding), HOLDINGS_TBODY):
         if len(tds) == 5:
             holdings.append({
-                "번호": th.get_text(strip=True) if th else "",
-                "종목명": tds[0].get_text(strip=True),
-                "종목코드": tds[1].get_text(strip=True),
-                "기준가": tds[2].get_text(strip=True),
-                "비중(%)": tds[3].get_text(strip=True),
-                "평가액": tds[4].get_text(strip=True),
+                "번호": th,
+                "종목명": tds[0],
+                "종목코드": tds[1],
+                "기준가": tds[2],
+                "비중(%)": tds[3],
+                "평가액": tds[4],
             })
     return holdings
 
+def fetch_holdings(detail_url: str):
+    """상세 페이지의 tab3 구성내역을 리스트[dict]로 반환"""
+    page = fetch_holdings_page(detail_url)
+    if page is None:
+        return []
+    with PARSE_TIMER.time():
+        return parse_holdings(*page)
+
+def fetch_holdings_future(detail_url: str) -> Future:
+    """구성내역을 받아 파싱은 파싱 풀에 넘김 → 리스트[dict] Future (수집 스레드는 바로 다음 요청)"""
+    page = fetch_holdings_page(detail_url)
+    if page is None:
+        return completed([])
+    return PARSER.submit(parse_holdings, *page)
+
 # =====================================================
 # ③ ThreadPoolExecutor 병렬 크롤링
 # =====================================================
-def enrich_with_holdings_threaded(csv_path: Path, max_workers: int = 10) -> Path:
+def enrich_with_holdings_threaded(csv_path: Path, max_workers: int = HOLDINGS_WORKERS) -> Path:
     out_csv = OUT_DIR / (csv_path.stem + "_with_holdings.csv")
 
     with open(csv_path, newline="", encoding="utf-8-sig") as f:
@@ -164,17 +188,16 @@ def enrich_with_holdings_threaded(csv_path: Path, max_workers: int = 10) -> Path
 
     results = []
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_row = {executor.submit(fetch_holdings, row["detail_url"]): row for row in rows}
+        future_to_row = {executor.submit(fetch_holdings_future, row["detail_url"]): row for row in rows}
         for future in tqdm(as_completed(future_to_row), total=len(rows), desc="Fetching holdings"):
             row = future_to_row[future]
             try:
-                holdings = future.result()
+                holdings = future.result().result()
                 row["holdings"] = json.dumps(holdings, ensure_ascii=False)
             except Exception as e:
                 row["holdings"] = "[]"
                 log.warning(f"⚠️ {row['name']} 실패: {e}")
             results.append(row)
-            time.sleep(0.1)
 
     fieldnames = list(results[0].keys())
     with open(out_csv, "w", newline="", encoding="utf-8-sig") as f:
@@ -189,7 +212,7 @@ def enrich_with_holdings_threaded(csv_path: Path, max_workers: int = 10) -> Path
 # ④ holdings 풀어서 flatten CSV 생성
 # =====================================================
 def flatten_holdings(input_csv: Path) -> Path:
-    out_csv = OUT_DIR / (input_csv.stem + "_flattened.csv")
+    out_csv = table_path(OUT_DIR / (input_csv.stem + "_flattened"))
 
     with open(input_csv, newline="", encoding="utf-8-sig") as f:
         reader = csv.DictReader(f)
@@ -217,38 +240,73 @@ def flatten_holdings(input_csv: Path) -> Path:
             })
 
     fieldnames = ["name","price","change","detail_url","number","item_name","item_code","base_price","ratio","value"]
-    with open(out_csv, "w", newline="", encoding="utf-8-sig") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(flat_rows)
+    write_rows(flat_rows, out_csv, fieldnames, schema="rise_holdings", encoding="utf-8-sig")
 
-    log.info(f"✅ Flattened CSV 생성 완료 → {out_csv} ({len(flat_rows)}행)")
+    log.info(f"✅ Flattened 파일 생성 완료 → {out_csv} ({len(flat_rows)}행)")
     return out_csv
 
 # =====================================================
-# ⑤ 메인 실행 (KEEP_TEMP 기반 중간 파일 정리)
+# ⑤ 전체 실행 (KEEP_TEMP 기반 중간 파일 정리)
 # =====================================================
-if __name__ == "__main__":
-    try:
-        log.info("🚀 RISE ETF 크롤링 시작")
-
-        csv_path = scrape_rise_finder()                         # ① 기본 ETF 리스트
+def find_output(date: str) -> Optional[Path]:
+    """date 의 flatten 최종 파일 (없으면 None)"""
+    return find_table(OUT_DIR / f"rise_finder_{date}_with_holdings_flattened")
+
+
+def run(target_date: Optional[str] = None) -> Path:
+    """
+    RISE ETF 수집 전체 실행 (스크립트 / in-process Prefect task 공용). flatten 최종 파일 경로 반환.
+    target_date 는 오늘만 허용 (스냅샷 전용).
+    파싱 풀은 모듈 전역 공유 → 동시에 도는 run 이 모두 끝날 때 (실패해도) 워커 종료.
+    """
+    date = snapshot_date("riseetf", target_date)
+    with PARSER.session():
+        return _run(date)
+
+
+def _run(date: str) -> Path:
+    ensure_dirs(OUT_DIR)
+    log.info(f"🚀 RISE ETF 크롤링 시작 (스냅샷 {date})")
+
+    perf = StageMetrics("riseetf", date, client=CLIENT, parse=PARSE_TIMER)
+    with perf.phase("list") as p:
+        csv_path = scrape_rise_finder(date)                     # ① 기본 ETF 리스트
+        p["rows"] = count_rows(csv_path)
+    with perf.phase("holdings") as p:
         enriched_csv = enrich_with_holdings_threaded(csv_path)   # ② holdings 추가
+        p["rows"] = count_rows(enriched_csv)
+    with perf.phase("flatten") as p:
         final_csv = flatten_holdings(enriched_csv)               # ③ flatten 최종본 생성
+        p["rows"] = count_rows(final_csv)
 
-        if KEEP_TEMP:
-            log.info("🗂 중간 파일 보존 (.env KEEP_TEMP=true)")
-        else:
-            for fp in [csv_path, enriched_csv]:
-                try:
-                    if Path(fp).exists():
-                        Path(fp).unlink()
-                        log.info(f"🧹 중간 파일 삭제 완료: {Path(fp).name}")
-                except Exception as e:
-                    log.warning(f"[WARN] 중간 파일 삭제 실패: {fp} ({e})")
+    if KEEP_TEMP:
+        log.info("🗂 중간 파일 보존 (.env KEEP_TEMP=true)")
+    else:
+        for fp in [csv_path, enriched_csv]:
+            try:
+                if Path(fp).exists():
+                    Path(fp).unlink()
+                    log.info(f"🧹 중간 파일 삭제 완료: {Path(fp).name}")
+            except Exception as e:
+                log.warning(f"[WARN] 중간 파일 삭제 실패: {fp} ({e})")
 
-        log.info(f"✅ RISE ETF 파이프라인 완료 → {Path(final_csv).name}")
+    log.info(f"🌐 HTTP {CLIENT.metrics.summary()}")
+    log.info(f"🚦 {CLIENT.rate_summary()}")
+    log.info(f"🧩 {PARSER.summary()}")
+    log.info(f"⏱️ 성능 지표 → {perf.save()}")
+    log.info(f"✅ RISE ETF 파이프라인 완료 → {Path(final_csv).name}")
+    return final_csv
 
+# =====================================================
+# ⑥ 메인 실행
+# =====================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--date", type=str, default=None, help="YYYYMMDD (스냅샷 전용: 오늘만 가능)")
+    args = parser.parse_args()
+    setup_logging("riseetf", LOG_DIR)
+    try:
+        run(args.date)
     except Exception as e:
         log.exception(f"❌ 실행 중 오류 발생: {e}")
         sys.exit(1)
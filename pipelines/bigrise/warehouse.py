@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BigRise 로컬 분석 DB 적재 (Prefect 파이프라인 마지막 단계)
+------------------------------------------------
+- 각 단계 일자별 산출물(csv | parquet)을 SQLite 단일 파일(out/warehouse/bigrise.sqlite)에 적재
+  rise_holdings / industry_meta / industry_companies / naver_news / bigrise
+- 모든 테이블은 target_date 컬럼으로 일자 분할, 같은 일자 재적재 시 해당 일자만 교체 (멱등)
+  · naver_news : 기사 기준일(target_date)
+  · 스냅샷 테이블(rise_holdings · industry_meta · industry_companies · bigrise) : 스냅샷 파일 날짜(snapshot_date)
+    (일일 파이프라인의 전일 target_date 로 넣으면 다음 날 스냅샷이 하루 앞 분할에 들어가고,
+     backfill 로 넣은 같은 날짜 분할을 다음 날 스냅샷이 덮어씀)
+- 인덱스: item_code · (main_code, sub_code) · article_id (+ target_date)
+- 적재 이력: ingest_log (테이블, 분할 일자, 원본 파일, 행 수, 적재 시각)
+- 조회 헬퍼: holdings_history / etf_holdings / industries_updated / news_mentions
+- 성능 지표: ingest 소요시간 · 적재 행 수 → out/metrics
+- 입력: naver 는 target_date 파일, 스냅샷 단계(riseetf · bigfinance · bigrise_pre)는 snapshot_date 파일
+  (일일 파이프라인: target_date=전일, snapshot_date=실행일 / backfill: 둘 다 같은 날짜)
+ex) python pipelines/bigrise/warehouse.py --date 20251110
+    wh = Warehouse(WAREHOUSE_PATH); wh.holdings_history("KR7000660001")
+"""
+
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+from dotenv import load_dotenv
+
+
+# =====================================================
+# 경로 설정
+# =====================================================
+BASE_DIR = Path(__file__).resolve().parents[2]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from pipelines.bigrise import bigfinance, bigrise_pre, naver_news, riseetf
+from pipelines.bigrise.bigrise_pre import parse_dates
+from pipelines.common.perf import StageMetrics
+from pipelines.common.runtime import setup_logging
+from pipelines.common.storage import SCHEMAS, apply_schema, find_table, read_table
+
+OUT_DIR = BASE_DIR / "out"
+LOG_DIR = BASE_DIR / "logs"
+
+log = logging.getLogger(__name__)
+
+load_dotenv()
+WAREHOUSE_PATH = Path(os.getenv("WAREHOUSE_PATH", OUT_DIR / "warehouse" / "bigrise.sqlite"))
+
+
+# =====================================================
+# 테이블 정의 (컬럼/타입은 storage.SCHEMAS 재사용)
+# =====================================================
+SQL_TYPES = {"Int64": "INTEGER", "float64": "REAL", "string": "TEXT"}
+
+# dated=True 인 테이블만 target_date 분할, 나머지는 snapshot_date 분할
+TABLES: Dict[str, dict] = {
+    "rise_holdings": {"schema": "rise_holdings", "indexes": [("item_code",), ("name",)]},
+    # companies 문자열은 industry_companies 와 중복이므로 제외, 정규화 날짜(update_day) 추가
+    "industry_meta": {"schema": "industry_meta", "drop": ["companies"], "extra": {"update_day": "TEXT"},
+                      "indexes": [("main_code", "sub_code"), ("update_day",)]},
+    "industry_companies": {"schema": "industry_companies",
+                           "indexes": [("main_code", "sub_code"), ("company_code",)]},
+    "naver_news": {"schema": "naver_news", "dated": True, "indexes": [("article_id",), ("office_id", "article_id")]},
+    "bigrise": {"schema": "bigrise", "indexes": [("item_code",)]},
+}
+
+
+def table_columns(name: str) -> Dict[str, str]:
+    spec = TABLES[name]
+    cols = {c: SQL_TYPES[t] for c, t in SCHEMAS[spec["schema"]].items() if c not in spec.get("drop", [])}
+    return {**cols, **spec.get("extra", {})}
+
+
+def build_ddl() -> str:
+    stmts = ["""
+CREATE TABLE IF NOT EXISTS ingest_log (
+    table_name  TEXT NOT NULL,
+    target_date TEXT NOT NULL,
+    source_file TEXT NOT NULL,
+    rows        INTEGER NOT NULL,
+    ingested_at TEXT NOT NULL,
+    PRIMARY KEY (table_name, target_date)
+)"""]
+    for name, spec in TABLES.items():
+        cols = ",\n    ".join(f'"{c}" {t}' for c, t in table_columns(name).items())
+        stmts.append(f"CREATE TABLE IF NOT EXISTS {name} (\n    target_date TEXT NOT NULL,\n    {cols}\n)")
+        stmts.append(f"CREATE INDEX IF NOT EXISTS idx_{name}_date ON {name}(target_date)")
+        for idx in spec["indexes"]:
+            stmts.append(
+                f"CREATE INDEX IF NOT EXISTS idx_{name}_{'_'.join(idx)} "
+                f"ON {name}({', '.join(idx)}, target_date)"
+            )
+    return ";\n".join(stmts) + ";"
+
+
+# =====================================================
+# 적재용 변환
+# =====================================================
+def load_frame(name: str, path: Path) -> pd.DataFrame:
+    """산출물 → 테이블 컬럼 순서의 DataFrame (없는 컬럼은 NULL)"""
+    spec = TABLES[name]
+    schema = SCHEMAS[spec["schema"]]
+    text_cols = [c for c, t in schema.items() if t == "string"]
+    df = read_table(path, columns=schema, dtype={c: str for c in text_cols}, keep_default_na=False)
+    df = apply_schema(df, spec["schema"])
+
+    if name == "industry_meta":
+        # update_date(원본) → updateDate(header) 순서로 YYYY-MM-DD 정규화
+        raw = df["update_date"] if "update_date" in df.columns else pd.Series(pd.NA, index=df.index)
+        day = parse_dates(raw)
+        if "updateDate" in df.columns:
+            day = day.fillna(parse_dates(df["updateDate"]))
+        df["update_day"] = day.dt.strftime("%Y-%m-%d")
+
+    return df.reindex(columns=list(table_columns(name)))
+
+
+def to_records(df: pd.DataFrame, target_date: str):
+    """sqlite3 바인딩용 (numpy/NA → 파이썬 기본형/None)"""
+    obj = df.astype(object).where(df.notna(), None)
+    for row in obj.itertuples(index=False, name=None):
+        yield (target_date, *(v.item() if hasattr(v, "item") else v for v in row))
+
+
+# =====================================================
+# Warehouse
+# =====================================================
+class Warehouse:
+    """일자 분할 SQLite 분석 DB (적재 + 조회 헬퍼)"""
+
+    def __init__(self, path: Path = WAREHOUSE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(build_ddl())
+
+    # =====================================================
+    # 적재
+    # =====================================================
+    def ingest(self, name: str, target_date: str, path: Path) -> int:
+        """path 를 name 테이블의 target_date 분할로 교체 적재, 행 수 반환"""
+        df = load_frame(name, path)
+        cols = ", ".join(f'"{c}"' for c in ["target_date", *df.columns])
+        sql = f"INSERT INTO {name} ({cols}) VALUES ({', '.join('?' * (len(df.columns) + 1))})"
+
+        conn = self._conn
+        conn.execute("BEGIN")
+        try:
+            conn.execute(f"DELETE FROM {name} WHERE target_date=?", (target_date,))
+            conn.executemany(sql, to_records(df, target_date))
+            conn.execute(
+                "INSERT OR REPLACE INTO ingest_log VALUES (?, ?, ?, ?, ?)",
+                (name, target_date, str(path), len(df), datetime.now().isoformat(timespec="seconds")),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(df)
+
+    # =====================================================
+    # 조회 헬퍼
+    # =====================================================
+    def query(self, sql: str, params=()) -> pd.DataFrame:
+        return pd.read_sql_query(sql, self._conn, params=params)
+
+    def ingested(self, target_date: str) -> list:
+        """해당 일자 분할에 적재된 테이블 이름 (naver 는 기준일, 스냅샷 테이블은 스냅샷 일자)"""
+        rows = self._conn.execute(
+            "SELECT table_name FROM ingest_log WHERE target_date=? ORDER BY table_name", (target_date,)
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def partitions(self) -> pd.DataFrame:
+        return self.query("SELECT * FROM ingest_log ORDER BY target_date, table_name")
+
+    def holdings_history(self, item_code: str, start: Optional[str] = None,
+                         end: Optional[str] = None) -> pd.DataFrame:
+        """종목(item_code)을 담은 ETF 와 비중의 스냅샷 일자별 변화 (start · end 도 스냅샷 일자)"""
+        return self.query(
+            "SELECT target_date AS snapshot_date, name AS etf_name, item_name, ratio, value FROM rise_holdings "
+            "WHERE item_code=? AND target_date BETWEEN ? AND ? ORDER BY target_date, ratio DESC",
+            (item_code, start or "00000000", end or "99999999"),
+        )
+
+    def etf_holdings(self, etf_name: str, snapshot_date: Optional[str] = None) -> pd.DataFrame:
+        """ETF 구성종목 (snapshot_date 미지정 시 가장 최근 스냅샷)"""
+        return self.query(
+            "SELECT target_date AS snapshot_date, number, item_name, item_code, ratio, value FROM rise_holdings "
+            "WHERE name=? AND target_date=COALESCE(?, (SELECT MAX(target_date) FROM rise_holdings WHERE name=?)) "
+            "ORDER BY number",
+            (etf_name, snapshot_date, etf_name),
+        )
+
+    def industries_updated(self, days: int = 7, as_of: Optional[str] = None) -> pd.DataFrame:
+        """as_of(YYYYMMDD, 기본 오늘) 기준 최근 days 일 내 업데이트된 산업 (가장 최근 적재분 기준)"""
+        as_of_day = datetime.strptime(as_of, "%Y%m%d") if as_of else datetime.now()
+        since = (as_of_day - timedelta(days=days)).strftime("%Y-%m-%d")
+        return self.query(
+            "SELECT main_code, main_name, sub_code, sub_name, data_code, data_name, update_day, "
+            "frequency, source FROM industry_meta "
+            "WHERE target_date=(SELECT MAX(target_date) FROM industry_meta) "
+            "AND update_day BETWEEN ? AND ? ORDER BY update_day DESC, main_code, sub_code",
+            (since, as_of_day.strftime("%Y-%m-%d")),
+        )
+
+    def news_mentions(self, keyword: str, start: Optional[str] = None,
+                      end: Optional[str] = None) -> pd.DataFrame:
+        """제목에 keyword 가 들어간 기사"""
+        return self.query(
+            "SELECT target_date, wdate, press, title, url FROM naver_news "
+            "WHERE title LIKE ? AND target_date BETWEEN ? AND ? ORDER BY wdate",
+            (f"%{keyword}%", start or "00000000", end or "99999999"),
+        )
+
+    def close(self):
+        self._conn.close()
+
+
+# =====================================================
+# 전체 실행
+# =====================================================
+def default_sources(target_date: str, snapshot_date: str) -> Dict[str, Optional[Path]]:
+    """입력 경로를 주지 않았을 때의 기본 산출물 (naver: target_date, 스냅샷 단계: snapshot_date)"""
+    return {
+        "rise_holdings": riseetf.find_output(snapshot_date),
+        "industry_meta": bigfinance.find_output(snapshot_date),
+        "industry_companies": find_table(bigfinance.companies_base(snapshot_date)),
+        "naver_news": naver_news.find_output(target_date),
+        "bigrise": bigrise_pre.find_output(snapshot_date),
+    }
+
+
+def find_output(target_date: str) -> Optional[Path]:
+    """해당 일자 분할(테이블 무관)이 적재돼 있으면 DB 경로 (없으면 None)"""
+    if not WAREHOUSE_PATH.exists():
+        return None
+    wh = Warehouse(WAREHOUSE_PATH)
+    try:
+        return WAREHOUSE_PATH if wh.ingested(target_date) else None
+    finally:
+        wh.close()
+
+
+def run(target_date: str, naver_path=None, rise_path=None, industry_path=None,
+        companies_path=None, bigrise_path=None, snapshot_date=None) -> Path:
+    """
+    각 단계 산출물 적재 (스크립트 / in-process Prefect task 공용).
+    naver_news 는 target_date 분할, 스냅샷 테이블은 snapshot_date(기본 오늘) 분할.
+    경로를 주면 그대로 사용 (in-process 모드에서 앞 단계 결과 전달 — 스냅샷 단계는 snapshot_date 파일),
+    없으면 기본 경로 검색. 없는 산출물은 건너뛰고, 하나도 없으면 FileNotFoundError. DB 경로 반환.
+    """
+    snapshot_date = snapshot_date or time.strftime("%Y%m%d")
+    sources = default_sources(target_date, snapshot_date)
+    if industry_path and not companies_path:
+        # 같은 날짜의 기업 long 테이블 (industry_categories_D_with_meta_companies → industry_companies_D)
+        day = Path(industry_path).name.split("_")[2]
+        companies_path = find_table(Path(industry_path).parent / f"industry_companies_{day}")
+    given = {
+        "naver_news": naver_path, "rise_holdings": rise_path, "industry_meta": industry_path,
+        "industry_companies": companies_path, "bigrise": bigrise_path,
+    }
+    sources.update({k: Path(v) for k, v in given.items() if v})
+
+    perf = StageMetrics("warehouse", target_date)
+    wh = Warehouse(WAREHOUSE_PATH)
+    loaded = 0
+    try:
+        with perf.phase("ingest") as p:
+            p["rows"] = 0
+            for name, path in sources.items():
+                if path is None or not Path(path).exists():
+                    log.warning(f"⚠️ {name}: 산출물 없음 → 건너뜀")
+                    continue
+                day = target_date if TABLES[name].get("dated") else snapshot_date
+                n = wh.ingest(name, day, Path(path))
+                loaded += 1
+                p["rows"] += n
+                log.info(f"🗄️ {name} [{day}] {n}행 적재 ← {Path(path).name}")
+    finally:
+        wh.close()
+
+    if not loaded:
+        raise FileNotFoundError(f"❌ 적재할 산출물 없음 ({target_date} / 스냅샷 {snapshot_date})")
+    log.info(f"⏱️ 성능 지표 → {perf.save()}")
+    log.info(f"✅ warehouse 적재 완료 → {WAREHOUSE_PATH}")
+    return WAREHOUSE_PATH
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BigRise 로컬 분석 DB 적재")
+    parser.add_argument("--date", type=str, default=None, help="YYYYMMDD naver_news 기준일 (기본: 전일)")
+    parser.add_argument("--snapshot-date", type=str, default=None,
+                        help="YYYYMMDD 스냅샷 단계 파일 날짜 = 스냅샷 테이블 분할 (기본: 오늘)")
+    args = parser.parse_args()
+    target_date = args.date or (datetime.now() - timedelta(days=1)).strftime("%Y%m%d")
+
+    setup_logging("warehouse", LOG_DIR)
+    try:
+        run(target_date, snapshot_date=args.snapshot_date)
+    except FileNotFoundError as e:
+        log.error(str(e))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
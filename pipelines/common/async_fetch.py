@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+asyncio 기반 요청 스케줄러 (크롤러 공용)
+------------------------------------------------
+- 호스트별 동시성 상한(Semaphore) + 초당 요청 수 상한(토큰 버킷)
+- 실제 요청은 HttpClient(keep-alive 풀 · 재시도 정책 공유)를 전용 스레드 풀에서 실행
+- 수집 루프에서 sleep 하지 않음: 속도 제어는 전부 limiter 가 담당
+ex) engine = AsyncFetchEngine(concurrency=6, rate=5.0)
+    results = engine.map(fetch_article_text, [(url, (url,)) for url in urls], desc="articles")
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from tqdm import tqdm
+
+
+# =====================================================
+# 토큰 버킷
+# =====================================================
+class AsyncRateLimiter:
+    """초당 rate 회, 최대 burst 회까지 몰아서 허용하는 토큰 버킷"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1, int(rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# =====================================================
+# 엔진
+# =====================================================
+class AsyncFetchEngine:
+    """
+    concurrency : 호스트별 동시 요청 수
+    rate        : 호스트별 초당 요청 수 (0 이면 무제한)
+    """
+
+    def __init__(self, concurrency: int = 6, rate: float = 5.0, burst: Optional[int] = None):
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self._sems: Dict[str, asyncio.Semaphore] = {}
+        self._limiters: Dict[str, AsyncRateLimiter] = {}
+
+    def _limits(self, host: str):
+        if host not in self._sems:
+            self._sems[host] = asyncio.Semaphore(self.concurrency)
+            self._limiters[host] = AsyncRateLimiter(self.rate, self.burst)
+        return self._sems[host], self._limiters[host]
+
+    async def call(self, executor, url: str, fn: Callable, *args) -> Any:
+        sem, limiter = self._limits(urlparse(url).netloc)
+        async with sem:
+            await limiter.acquire()
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, fn, *args)
+
+    async def _run(self, fn: Callable, jobs: Sequence[Tuple[str, tuple]], desc: str) -> List[Any]:
+        results: List[Any] = [None] * len(jobs)
+        hosts = {urlparse(url).netloc for url, _ in jobs} or {""}
+        self._sems, self._limiters = {}, {}
+
+        with ThreadPoolExecutor(max_workers=self.concurrency * len(hosts)) as executor:
+            async def one(i, url, args):
+                try:
+                    results[i] = await self.call(executor, url, fn, *args)
+                except Exception as e:          # 개별 실패는 결과 슬롯에 예외로 기록
+                    results[i] = e
+
+            tasks = [asyncio.create_task(one(i, url, args)) for i, (url, args) in enumerate(jobs)]
+            for t in tqdm(asyncio.as_completed(tasks), total=len(tasks), desc=desc):
+                await t
+        return results
+
+    def map(self, fn: Callable, jobs: Sequence[Tuple[str, tuple]], desc: str = "fetch") -> List[Any]:
+        """
+        jobs: [(url, args), ...] — url 은 호스트 판별용, fn(*args) 를 실행.
+        입력 순서대로 결과 반환 (실패한 항목은 Exception 객체).
+        """
+        if not jobs:
+            return []
+        return asyncio.run(self._run(fn, jobs, desc))
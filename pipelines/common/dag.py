@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+산출물 기반 단계 의존성 (bigrise_pipeline 에서 사용)
+------------------------------------------------
+- 단계마다 읽는 산출물(consumes) · 만드는 산출물(produces)을 선언
+  → 각 단계는 자신이 읽는 산출물의 생산 단계만 기다림 (고정 wait_for 목록 없음)
+  · produces 첫 항목 = run() 반환 경로 (in-process 모드에서 args 로 다음 단계 인자에 전달)
+  · 산출물마다 생산 단계는 정확히 하나, 순환 의존은 ValueError
+- 실행 후 단계별 (시작, 종료) 시각으로 critical path 계산
+  · 가장 늦게 끝난 단계에서 시작해, 매번 '가장 늦게 끝난 선행 단계'를 따라 거슬러 올라감
+  · 단계별 대기(wait: 입력 준비 후 실제 시작까지) · 여유(slack: 종료 후 후속 단계 시작까지)
+ex) order = topo_order(STAGES)
+    futs = submit_all(STAGES, lambda stage, deps: task.submit(..., wait_for=list(deps.values())))
+    report = critical_path(STAGES, {"naver_news": (t0, t1), ...})
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class Stage:
+    """
+    name     : 단계 이름 (Prefect task 이름)
+    module   : run() 이 있는 모듈 (in-process) / script : 스크립트 파일명 (subprocess)
+    log_name : 로그 파일 이름
+    consumes : 읽는 산출물 / produces : 만드는 산출물 (첫 항목 = run() 반환값)
+    args     : in-process 모드에서 run() 에 넘길 산출물 {인자 이름: 산출물}
+    dated    : target_date 를 받는 단계 (아니면 스냅샷 단계 = 실행 시점 오늘)
+    cache    : 단계 결과 캐시(stage_cache) 사용 여부
+    """
+
+    def __init__(self, name: str, module: str, log_name: str, script: str,
+                 consumes: Iterable[str] = (), produces: Iterable[str] = (),
+                 args: Optional[Dict[str, str]] = None, dated: bool = False, cache: bool = True):
+        self.name = name
+        self.module = module
+        self.log_name = log_name
+        self.script = script
+        self.consumes = tuple(consumes)
+        self.produces = tuple(produces)
+        self.args = dict(args or {})
+        self.dated = dated
+        self.cache = cache
+
+    def __repr__(self):
+        return f"Stage({self.name}: {','.join(self.consumes) or '-'} → {','.join(self.produces) or '-'})"
+
+
+# =====================================================
+# 의존성
+# =====================================================
+def producers(stages: List[Stage]) -> Dict[str, Stage]:
+    """산출물 → 생산 단계 (선언 검증 포함)"""
+    out = {}
+    for s in stages:
+        for a in s.produces:
+            if a in out:
+                raise ValueError(f"❌ 산출물 {a} 를 두 단계가 생산: {out[a].name}, {s.name}")
+            out[a] = s
+    for s in stages:
+        missing = [a for a in s.consumes if a not in out]
+        if missing:
+            raise ValueError(f"❌ {s.name} 입력의 생산 단계 없음: {', '.join(missing)}")
+        bad = {k: a for k, a in s.args.items() if a not in s.consumes or out[a].produces[0] != a}
+        if bad:
+            raise ValueError(f"❌ {s.name} args 는 읽는 산출물 중 생산 단계 반환값만 가능: {bad}")
+    return out
+
+
+def upstream(stages: List[Stage]) -> Dict[str, List[str]]:
+    """단계 → 선행 단계 이름 (읽는 산출물의 생산 단계, 선언 순서)"""
+    prod = producers(stages)
+    return {s.name: list(dict.fromkeys(prod[a].name for a in s.consumes)) for s in stages}
+
+
+def topo_order(stages: List[Stage]) -> List[Stage]:
+    """선행 단계가 항상 먼저 오는 순서 (동률은 선언 순서), 순환이면 ValueError"""
+    ups = upstream(stages)
+    by_name = {s.name: s for s in stages}
+    done, order = set(), []
+    while len(order) < len(stages):
+        ready = [s for s in stages if s.name not in done and all(u in done for u in ups[s.name])]
+        if not ready:
+            left = [s.name for s in stages if s.name not in done]
+            raise ValueError(f"❌ 순환 의존: {', '.join(left)}")
+        for s in ready:
+            done.add(s.name)
+            order.append(by_name[s.name])
+    return order
+
+
+def submit_all(stages: List[Stage], submit: Callable[[Stage, Dict[str, object]], object]) -> Dict[str, object]:
+    """
+    의존성 순서대로 submit(stage, deps) 호출 → {단계: future}
+    deps: 읽는 산출물 → 생산 단계 future (해당 단계만 기다리도록 wait_for · 인자로 사용)
+    """
+    prod = producers(stages)
+    futs = {}
+    for s in topo_order(stages):
+        futs[s.name] = submit(s, {a: futs[prod[a].name] for a in s.consumes})
+    return futs
+
+
+# =====================================================
+# critical path
+# =====================================================
+def critical_path(stages: List[Stage], times: Dict[str, Tuple[float, float]]) -> dict:
+    """
+    times: 단계 → (시작, 종료) epoch 초 (실행되지 않은 단계는 생략)
+    → {"path": [단계...], "total_s", "stages": [{stage, start_s, end_s, wall_s, wait_s, slack_s, critical}]}
+    """
+    ups = upstream(stages)
+    ran = [s.name for s in topo_order(stages) if s.name in times]
+    if not ran:
+        return {"path": [], "total_s": 0.0, "stages": []}
+    t0 = min(times[n][0] for n in ran)
+    t_end = max(times[n][1] for n in ran)
+    downs = {n: [d for d in ran if n in ups[d]] for n in ran}
+
+    # 가장 늦게 끝난 단계 → 가장 늦게 끝난 선행 단계 …
+    path = [max(ran, key=lambda n: times[n][1])]
+    while True:
+        prev = [u for u in ups[path[-1]] if u in times]
+        if not prev:
+            break
+        path.append(max(prev, key=lambda u: times[u][1]))
+    path.reverse()
+
+    rows = []
+    for n in ran:
+        start, end = times[n]
+        ready = max((times[u][1] for u in ups[n] if u in times), default=t0)
+        next_start = min((times[d][0] for d in downs[n]), default=t_end)
+        rows.append({
+            "stage": n,
+            "start_s": round(start - t0, 3),
+            "end_s": round(end - t0, 3),
+            "wall_s": round(end - start, 3),
+            "wait_s": round(max(0.0, start - ready), 3),
+            "slack_s": round(max(0.0, next_start - end), 3),
+            "critical": n in path,
+        })
+    return {"path": path, "total_s": round(t_end - t0, 3), "stages": rows}
+
+
+def critical_path_markdown(report: dict, title: str = "") -> str:
+    lines = [f"## 🛤️ critical path {title}".rstrip(), "",
+             f"`{' → '.join(report['path']) or '-'}` (총 {report['total_s']}s)", "",
+             "| stage | start(s) | end(s) | wall(s) | wait(s) | slack(s) | critical |", "|---|---|---|---|---|---|---|"]
+    lines += [f"| {r['stage']} | {r['start_s']} | {r['end_s']} | {r['wall_s']} | {r['wait_s']} | "
+              f"{r['slack_s']} | {'✅' if r['critical'] else ''} |" for r in report["stages"]]
+    return "\n".join(lines)
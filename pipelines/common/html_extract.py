@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+공통 HTML 추출 유틸 (크롤러에서 import)
+------------------------------------------------
+- BeautifulSoup 트리 대신 lxml(C 파서) + xpath 로 필요한 부분만 추출
+- 텍스트 추출 규칙은 BeautifulSoup get_text 와 동일
+  (주석 · script · style · template 내부 문자열 제외, strip 후 빈 문자열 제외)
+ex) root = parse_html(text)
+    body = node_text(first_node(root, "//div[@id='dic_area']", "//article"), sep=" ")
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+from lxml import etree, html as lxml_html
+
+_PARSER = lxml_html.HTMLParser(encoding="utf-8")
+_SKIP_TAGS = {"script", "style", "template"}
+
+
+# =====================================================
+# 파싱
+# =====================================================
+def parse_html(text) -> Optional[etree._Element]:
+    """str/bytes → lxml 루트 (빈 문서면 None). str 은 utf-8 로 넘겨 meta charset 무시"""
+    if not text:
+        return None
+    data = text.encode("utf-8") if isinstance(text, str) else text
+    try:
+        return etree.fromstring(data, _PARSER)
+    except etree.XMLSyntaxError:
+        return None
+
+
+def first_node(root, *xpaths: str):
+    """xpath 후보를 순서대로 시도해 첫 번째로 찾은 노드 반환"""
+    if root is None:
+        return None
+    for xp in xpaths:
+        found = root.xpath(xp)
+        if found:
+            return found[0]
+    return None
+
+
+# =====================================================
+# 텍스트
+# =====================================================
+def _strings(el):
+    if isinstance(el.tag, str) and el.tag not in _SKIP_TAGS and el.text:
+        yield el.text
+    for child in el:
+        # 주석/PI 는 본문 제외, 태그 뒤 tail 문자열은 부모 소속이라 포함
+        if isinstance(child.tag, str):
+            yield from _strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def node_text(el, sep: str = "", strip: bool = True) -> str:
+    """BeautifulSoup Tag.get_text(sep, strip=strip) 와 같은 결과"""
+    if el is None:
+        return ""
+    parts = _strings(el)
+    if strip:
+        parts = (s.strip() for s in parts)
+        parts = (s for s in parts if s)
+    return sep.join(parts)
+
+
+# =====================================================
+# 용도별 추출
+# =====================================================
+def max_link_number(text: str, pattern: str = r"page=(\d+)") -> int:
+    """href 가 pattern 에 맞는 <a> 들 중 가장 큰 번호 (없으면 1)"""
+    root = parse_html(text)
+    if root is None:
+        return 1
+    rx = re.compile(pattern)
+    nums = [int(m.group(1)) for href in root.xpath("//a/@href") if (m := rx.search(href))]
+    return max(nums) if nums else 1
+
+
+def table_rows(text: str, tbody_xpath: str) -> List[Tuple[str, List[str]]]:
+    """
+    tbody_xpath 로 찾은 첫 tbody 의 행별 (th 텍스트, [td 텍스트, ...]) 목록.
+    tbody 가 없으면 빈 목록.
+    """
+    tbody = first_node(parse_html(text), tbody_xpath)
+    if tbody is None:
+        return []
+    rows = []
+    for tr in tbody.iter("tr"):
+        ths = tr.xpath(".//th")
+        rows.append((
+            node_text(ths[0]) if ths else "",
+            [node_text(td) for td in tr.xpath(".//td")],
+        ))
+    return rows
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+공통 HTTP 클라이언트 (모든 크롤러에서 import)
+------------------------------------------------
+- 호스트별 keep-alive 커넥션 풀 (풀 크기 = 워커 수)
+- 단일 재시도/백오프 정책: 429 · 5xx · 연결 오류, Retry-After 헤더 준수
+  (POST 등 비멱등 요청은 연결 오류만 재시도 — 로그인 폼 POST 를 서버가 처리한 뒤 다시 보내지 않도록)
+- 요청별 소요시간 · 바이트 · 오류/재시도 카운터
+- 호스트별 적응형 속도 제한 (rate_limit.HostRateLimiter, 프로세스 간 공유): 요청 전 토큰 획득,
+  응답 후 429 · 5xx · 연결 오류 / 지연시간을 limiter 에 전달
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from pipelines.common.rate_limit import THROTTLE_STATUS, HostRateLimiter, default_limiter
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+DEFAULT_LIMITER = object()      # 첫 요청 시 default_limiter() 사용
+
+
+# =====================================================
+# 요청 통계
+# =====================================================
+class HttpMetrics:
+    """스레드 안전 요청 카운터"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes = 0
+        self.status: Dict[int, int] = {}
+        self.latencies: List[float] = []
+        self.hosts = set()
+
+    def record(self, elapsed: float, nbytes: int = 0, status: Optional[int] = None,
+               retries: int = 0, error: bool = False):
+        with self._lock:
+            self.requests += 1
+            self.bytes += nbytes
+            self.retries += retries
+            self.latencies.append(elapsed)
+            if status is not None:
+                self.status[status] = self.status.get(status, 0) + 1
+            if error or (status is not None and status >= 400):
+                self.errors += 1
+
+    def mark(self) -> dict:
+        """현재 누적값 (snapshot(since=mark) 로 구간 통계 계산)"""
+        with self._lock:
+            return {"requests": self.requests, "errors": self.errors, "retries": self.retries,
+                    "bytes": self.bytes, "status": dict(self.status), "n": len(self.latencies)}
+
+    def snapshot(self, since: Optional[dict] = None) -> dict:
+        """누적 통계, since(mark() 결과)를 주면 그 이후 구간만"""
+        base = since or {"requests": 0, "errors": 0, "retries": 0, "bytes": 0, "status": {}, "n": 0}
+        with self._lock:
+            lat = sorted(self.latencies[base["n"]:])
+            counts = {k: getattr(self, k) - base[k] for k in ("requests", "errors", "retries", "bytes")}
+            status = {k: v - base["status"].get(k, 0) for k, v in self.status.items()
+                      if v - base["status"].get(k, 0)}
+
+        def pct(p):
+            return round(lat[min(len(lat) - 1, int(p * len(lat)))], 4) if lat else None
+
+        return {
+            **counts,
+            "status": status,
+            "latency_p50": pct(0.50),
+            "latency_p90": pct(0.90),
+            "latency_p99": pct(0.99),
+            "latency_total": round(sum(lat), 3),
+        }
+
+    def summary(self) -> str:
+        s = self.snapshot()
+        return (f"requests={s['requests']} errors={s['errors']} retries={s['retries']} "
+                f"bytes={s['bytes']:,} p50={s['latency_p50']}s p90={s['latency_p90']}s")
+
+
+def retry_after(r: requests.Response) -> Optional[float]:
+    """Retry-After 헤더(초 단위)만 해석, 없거나 날짜 형식이면 None"""
+    try:
+        return max(0.0, float(r.headers.get("Retry-After", "")))
+    except ValueError:
+        return None
+
+
+# =====================================================
+# 클라이언트
+# =====================================================
+class HttpClient:
+    """
+    requests.Session 래퍼. get()/post() 는 requests 와 같은 인자를 받는다.
+    limiter : 호스트별 속도 제한 (기본: .env 설정의 공용 limiter, None 이면 제한 없음)
+    rate    : 이 클라이언트가 처음 접속하는 호스트의 초기 초당 요청 수 (None 이면 RATE_LIMIT_RATE)
+    ex) client = HttpClient(pool_size=6, headers=HEADERS, rate=5)
+        r = client.get(url, timeout=(5, 15))
+    """
+
+    def __init__(self, pool_size: int = 10, headers: Optional[dict] = None,
+                 retries: int = 3, backoff: float = 1.0, timeout=(5, 15),
+                 verify: bool = False, session: Optional[requests.Session] = None,
+                 limiter=DEFAULT_LIMITER, rate: Optional[float] = None):
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.verify = verify
+        self.metrics = HttpMetrics()
+        self.rate = rate
+        self._limiter = limiter
+
+        if headers:
+            self.session.headers.update(headers)
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUS,
+            # allowed_methods 는 urllib3 기본(멱등 메서드)만 — POST 는 5xx · 읽기 오류로 재전송하지 않음
+            # (adapter 재시도는 limiter.acquire() 를 거치지 않으므로 범위를 넓히지 않음)
+            respect_retry_after_header=True,
+            raise_on_status=False,         # 재시도 소진 시 마지막 응답 반환
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                              max_retries=retry, pool_block=False)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @property
+    def limiter(self) -> Optional[HostRateLimiter]:
+        if self._limiter is DEFAULT_LIMITER:
+            self._limiter = default_limiter()
+        return self._limiter
+
+    def rate_summary(self) -> str:
+        """이 클라이언트가 요청한 호스트들의 현재 rate (로그용)"""
+        if self.limiter is None:
+            return "rate limit off"
+        return " | ".join(self.limiter.summary(h) for h in sorted(self.metrics.hosts)) or "요청 없음"
+
+    @property
+    def headers(self):
+        return self.session.headers
+
+    @property
+    def cookies(self):
+        return self.session.cookies
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        kwargs.setdefault("verify", self.verify)
+
+        host = urlparse(url).netloc
+        limiter = self.limiter
+        if limiter is not None:
+            if self.rate is not None:
+                limiter.rates.setdefault(host, self.rate)
+            limiter.acquire(host)
+        self.metrics.hosts.add(host)
+
+        t0 = time.perf_counter()
+        try:
+            r = self.session.request(method, url, **kwargs)
+        except requests.RequestException:
+            elapsed = time.perf_counter() - t0
+            self.metrics.record(elapsed, error=True)
+            if limiter is not None:
+                limiter.feedback(host, None, elapsed)
+            raise
+
+        elapsed = time.perf_counter() - t0
+        history = getattr(getattr(r.raw, "retries", None), "history", None) or ()
+        self.metrics.record(
+            elapsed,
+            nbytes=len(r.content),
+            status=r.status_code,
+            retries=len(history),
+        )
+        if limiter is not None:
+            # 내부 재시도 중 429/5xx 를 받았으면 최종 응답이 성공이어도 감속 신호
+            throttled = [h.status for h in history if h.status in THROTTLE_STATUS or h.error]
+            status = r.status_code if r.status_code in THROTTLE_STATUS or not throttled else throttled[-1]
+            limiter.feedback(host, status, elapsed, retry_after(r))
+        return r
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+append-only 체크포인트 저널 (naver_news 본문 수집 · bigfinance chart 수집에서 import)
+------------------------------------------------
+- 완료된 레코드를 JSON 한 줄씩 바로 이어씀 (flush) → 중간에 죽어도 완료분은 남음
+- 메모리에는 키 → 파일 위치(offset)만 보관, 레코드는 필요할 때 seek 로 읽음
+- 재시작 시 기존 저널을 이어받아 완료 키는 건너뜀
+  · 첫 줄 meta(입력 파일 등)가 다르면 다른 실행의 저널 → 버리고 새로 시작
+  · 마지막 줄이 잘려 있으면(쓰는 도중 종료) 그 줄만 잘라냄
+- 같은 키를 다시 쓰면 마지막 레코드가 유효
+- 최종 파일을 만든 뒤 remove() 로 삭제
+ex) journal = Journal(out_dir / "x.journal.jsonl", key=lambda r: r["url"], meta={"input": "x.csv"})
+    if row["url"] not in journal:
+        journal.append({**row, "contents": text})
+    rows = (journal.get(r["url"]) or r for r in input_rows)
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional
+
+log = logging.getLogger(__name__)
+
+
+class Journal:
+    """
+    path : 저널 파일 (.jsonl)
+    key  : 레코드 → 키 문자열
+    meta : 이 저널을 이어받을 수 있는 조건 (다르면 기존 저널 폐기)
+    """
+
+    def __init__(self, path: Path, key: Callable[[dict], str], meta: Optional[dict] = None):
+        self.path = Path(path)
+        self.key = key
+        self.meta = meta or {}
+        self.resumed = 0
+        self._offsets: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            self._load()
+        if not self.path.exists():
+            self.path.write_text(json.dumps({"_meta": self.meta}, ensure_ascii=False) + "\n", encoding="utf-8")
+        self._fh = open(self.path, "ab")
+        self._reader = open(self.path, "rb")
+
+    def _load(self):
+        good = 0
+        with open(self.path, "rb") as f:
+            first = f.readline()
+            try:
+                meta = json.loads(first).get("_meta")
+            except ValueError:
+                meta = None
+            if meta != self.meta:
+                log.info(f"🧾 저널 조건 불일치 → 새로 시작: {self.path.name}")
+                f.close()
+                self.path.unlink()
+                return
+            good = f.tell()
+            while True:
+                line = f.readline()
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    break
+                self._offsets[self.key(rec)] = good
+                good = f.tell()
+        if good < self.path.stat().st_size:
+            log.warning(f"⚠️ 저널 끝의 불완전한 줄 제거: {self.path.name}")
+            os.truncate(self.path, good)
+        self.resumed = len(self._offsets)
+
+    # =====================================================
+    # 조회 / 기록
+    # =====================================================
+    def __contains__(self, key: str) -> bool:
+        return key in self._offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def append(self, record: dict):
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            offset = self._fh.tell()
+            self._fh.write(line)
+            self._fh.flush()
+            self._offsets[self.key(record)] = offset
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            offset = self._offsets.get(key)
+            if offset is None:
+                return None
+            self._reader.seek(offset)
+            return json.loads(self._reader.readline())
+
+    def records(self) -> Iterator[dict]:
+        """키별 유효 레코드 (기록 순서)"""
+        for key in list(self._offsets):
+            yield self.get(key)
+
+    # =====================================================
+    # 종료
+    # =====================================================
+    def close(self):
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.flush()
+                os.fsync(self._fh.fileno())
+                self._fh.close()
+                self._reader.close()
+
+    def remove(self):
+        """최종 파일 생성 후 호출"""
+        self.close()
+        self.path.unlink(missing_ok=True)
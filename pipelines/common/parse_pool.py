@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTML 디코딩 · 파싱 전용 프로세스 풀 (크롤러 공용)
+------------------------------------------------
+- 수집 스레드는 응답 bytes 만 넘기고 바로 다음 요청으로 → 파싱이 GIL 을 잡고 있어도 요청이 끊기지 않음
+- 대기 큐 상한(queue_size): 파싱이 밀려 대기 작업이 상한에 닿으면 submit 이 블록 (메모리 상한 · backpressure)
+- workers=0 이면 호출 스레드에서 바로 파싱 (기존 동작, 결과 동일)
+- 워커는 spawn 으로 시작 (수집 스레드가 도는 중에 fork 하지 않음), 첫 submit 시점에 생성
+  · 부모가 강제 종료(SIGKILL 등)되면 워커도 스스로 종료 (고아 프로세스 방지)
+- 파싱 함수는 모듈 최상위 함수 + picklable 인자 (bytes · str · int), 결과도 picklable
+- 워커에서 쓴 파싱 시간은 결과와 함께 돌려받아 호출 측 Timer(성능 지표 parse)에 누적
+- 모듈 전역 풀을 여러 run 이 동시에 쓰는 경우(backfill 여러 날짜) session() 으로 사용 구간을 잡음
+  · 마지막 session 이 끝날 때만 워커 종료 (예외로 끝나도 종료) — 다른 run 이 쓰는 중인 풀을 닫지 않음
+  · submit 과 shutdown 은 같은 lock 안에서 풀을 꺼내므로, 종료 중인 풀에 제출되는 일 없음 (다음 submit 은 새 풀)
+ex) PARSER = ParsePool(workers=2, queue_size=64, timer=PARSE_TIMER)
+    with PARSER.session():
+        fut = PARSER.submit(parse_list_page, resp.content, date, page, s)   # Future
+        fut = PARSER.submit(extract_article, content, then=lambda text: save(text))
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from pipelines.common.perf import Timer
+
+
+def default_workers() -> int:
+    """코어 1개는 수집 · 기록 스레드 몫으로 남김 (최대 4)"""
+    return max(0, min(4, (os.cpu_count() or 1) - 1))
+
+
+def decode_body(content: bytes, encoding: Optional[str] = None) -> str:
+    """
+    requests Response.text 와 같은 디코딩 (워커에서 실행)
+    encoding 이 없으면 내용으로 추정(apparent_encoding), 추정 실패 시 utf-8
+    """
+    if not content:
+        return ""
+    if encoding is None:
+        from requests.compat import chardet
+        encoding = (chardet.detect(content)["encoding"] if chardet is not None else None) or "utf-8"
+    try:
+        return str(content, encoding, errors="replace")
+    except (LookupError, TypeError):
+        return str(content, errors="replace")
+
+
+def _watch_parent(ppid: int):
+    """워커 initializer: 부모 프로세스가 사라지면 종료"""
+    def watch():
+        while os.getppid() == ppid:
+            time.sleep(1)
+        os._exit(0)
+    threading.Thread(target=watch, daemon=True).start()
+
+
+def _timed(fn: Callable, args: tuple):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def completed(value) -> Future:
+    """이미 결과가 정해진 Future (요청 실패 등 파싱할 것이 없을 때)"""
+    fut = Future()
+    fut.set_result(value)
+    return fut
+
+
+class ParsePool:
+    """
+    workers    : 파싱 프로세스 수 (0 = 호출 스레드에서 파싱)
+    queue_size : 제출 후 아직 끝나지 않은 파싱 작업 상한
+    timer      : 파싱 시간을 누적할 Timer (크롤러 PARSE_TIMER)
+    """
+
+    def __init__(self, workers: int = 0, queue_size: int = 64, timer: Optional[Timer] = None):
+        self.workers = max(0, workers)
+        self.queue_size = max(1, queue_size)
+        self.timer = timer or Timer()
+        self._slots = threading.BoundedSemaphore(self.queue_size)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()   # 풀 생성 · 제출 · 종료 (통계용 _lock 과 분리)
+        self._sessions = 0
+        self._lock = threading.Lock()
+        self._depth = 0
+        self.peak_depth = 0
+        self.blocked = 0.0       # 큐가 가득 차 수집 스레드가 기다린 시간 합(초)
+        self.jobs = 0
+
+    def _submit(self, fn: Callable, args: tuple) -> Future:
+        """풀이 없으면 만들고 제출 (shutdown 과 같은 lock 안에서 → 종료 중인 풀에는 제출하지 않음)"""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                                 initializer=_watch_parent, initargs=(os.getpid(),))
+            return self._pool.submit(_timed, fn, args)
+
+    def submit(self, fn: Callable, *args, then: Optional[Callable] = None) -> Future:
+        """
+        fn(*args) 를 파싱 풀에서 실행 → Future.
+        then(result) 는 Future 가 완료되기 전에 실행 (결과 기록이 wait() 보다 먼저 끝나도록),
+        fn 이 예외면 then 은 호출하지 않고 Future 에 예외 전달.
+        """
+        out = Future()
+        if self.workers == 0:
+            try:
+                with self.timer.time():
+                    result = fn(*args)
+                if then is not None:
+                    then(result)
+            except Exception as e:
+                out.set_exception(e)
+            else:
+                out.set_result(result)
+            return out
+
+        if not self._slots.acquire(blocking=False):
+            t0 = time.perf_counter()
+            self._slots.acquire()
+            with self._lock:
+                self.blocked += time.perf_counter() - t0
+        with self._lock:
+            self._depth += 1
+            self.jobs += 1
+            self.peak_depth = max(self.peak_depth, self._depth)
+
+        def finish(f: Future):
+            with self._lock:
+                self._depth -= 1
+            self._slots.release()
+            try:
+                result, elapsed = f.result()
+                self.timer.add(elapsed)
+                if then is not None:
+                    then(result)
+            except Exception as e:
+                out.set_exception(e)
+            else:
+                out.set_result(result)
+
+        try:
+            self._submit(fn, args).add_done_callback(finish)
+        except Exception as e:
+            finish_error = Future()
+            finish_error.set_exception(e)
+            finish(finish_error)
+        return out
+
+    def summary(self) -> str:
+        if self.workers == 0:
+            return "parse inline"
+        return (f"parse workers={self.workers} jobs={self.jobs} queue={self.queue_size} "
+                f"peak={self.peak_depth} blocked={self.blocked:.2f}s")
+
+    @contextmanager
+    def session(self):
+        """run 한 번의 사용 구간: 마지막 session 이 끝날 때 워커 종료 (예외로 끝나도)"""
+        with self._pool_lock:
+            self._sessions += 1
+        try:
+            yield self
+        finally:
+            with self._pool_lock:
+                self._sessions -= 1
+                last = self._sessions == 0
+            if last:
+                self.shutdown()
+
+    def shutdown(self):
+        """
+        워커 종료 (다음 submit 시 다시 생성).
+        이미 제출한 작업은 끝까지 처리, 종료 중에 들어온 submit 은 새 풀로 감.
+        """
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
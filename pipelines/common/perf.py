@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+단계별 성능 지표 (모든 파이프라인 스크립트에서 import)
+------------------------------------------------
+- 단계(stage) 안의 구간(phase)마다 기록:
+  소요시간 · HTTP 요청/바이트/지연 p50·p90·p99/오류/재시도 (HttpClient.metrics 의 구간 차이)
+  · 파싱 시간(Timer 누적) · 행 수 등 구간별 값
+- 단계가 끝나면 JSON 1개 저장
+  · flow 실행 중 (run_dir 지정) : {run_dir}/{stage}_{date}.json
+  · 스크립트 단독 실행          : out/metrics/{stage}_{date}_{HHMMSS}.json
+- flow 는 collect_run() 으로 단계 JSON 을 모아 run_report.json 과 표 · markdown 을 만듦
+  (직전 실행 보고서와 구간별 소요시간 비교)
+ex) perf = StageMetrics("naver_news", target_date, client=CLIENT, parse=PARSE_TIMER)
+    with perf.phase("list") as p:
+        rows = stream_news_rows(...)
+        p["rows"] = len(rows)
+    perf.save()
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+METRICS_DIR = Path(os.getenv("METRICS_DIR", BASE_DIR / "out" / "metrics"))
+REPORT_FILE = "run_report.json"
+
+# in-process 실행: run_stage 가 설정 / subprocess 실행: run_script 가 PERF_RUN_DIR 환경변수로 전달
+_RUN_DIR: contextvars.ContextVar[Optional[Path]] = contextvars.ContextVar("perf_run_dir", default=None)
+
+
+# =====================================================
+# 누적 타이머
+# =====================================================
+class Timer:
+    """여러 스레드에서 공유하는 누적 타이머 (파싱 시간 등)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.total = 0.0
+        self.count = 0
+
+    @contextmanager
+    def time(self):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            with self._lock:
+                self.total += elapsed
+                self.count += 1
+
+    def add(self, elapsed: float):
+        """다른 프로세스에서 잰 시간 누적 (파싱 풀 워커)"""
+        with self._lock:
+            self.total += elapsed
+            self.count += 1
+
+    def mark(self) -> tuple:
+        with self._lock:
+            return self.total, self.count
+
+
+# =====================================================
+# 단계 지표
+# =====================================================
+class StageMetrics:
+    """
+    stage  : 단계 이름 (naver_news · riseetf · bigfinance · bigrise_pre · warehouse)
+    client : 구간별 HTTP 통계를 뽑을 HttpClient (없으면 http 항목 생략)
+    parse  : 구간별 파싱 시간을 뽑을 Timer
+    ※ client · parse 는 모듈 공용이라 같은 프로세스에서 같은 단계가 동시에 돌면 (backfill)
+      구간 값에 서로의 요청이 섞일 수 있음
+    """
+
+    def __init__(self, stage: str, target_date: Optional[str] = None, client=None,
+                 parse: Optional[Timer] = None):
+        self.stage = stage
+        self.target_date = target_date or time.strftime("%Y%m%d")
+        self.client = client
+        self.parse = parse
+        self.started = datetime.now()
+        self._t0 = time.perf_counter()
+        self.phases: List[dict] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        """구간 측정. yield 되는 dict 에 rows 등 구간별 값을 넣으면 그대로 기록"""
+        info: dict = {"phase": name}
+        http_mark = self.client.metrics.mark() if self.client is not None else None
+        parse_mark = self.parse.mark() if self.parse is not None else None
+        t0 = time.perf_counter()
+        try:
+            yield info
+        finally:
+            info["wall"] = round(time.perf_counter() - t0, 3)
+            if http_mark is not None:
+                info["http"] = self.client.metrics.snapshot(since=http_mark)
+            if parse_mark is not None:
+                total, count = self.parse.mark()
+                info["parse"] = round(total - parse_mark[0], 3)
+                info["parse_calls"] = count - parse_mark[1]
+            self.phases.append(info)
+
+    def to_dict(self) -> dict:
+        return {
+            "stage": self.stage,
+            "target_date": self.target_date,
+            "started_at": self.started.strftime("%Y-%m-%d %H:%M:%S"),
+            "wall": round(time.perf_counter() - self._t0, 3),
+            "phases": self.phases,
+        }
+
+    def save(self, run_dir: Optional[Path] = None) -> Path:
+        run_dir = run_dir or current_run_dir()
+        if run_dir is not None:
+            path = Path(run_dir) / f"{self.stage}_{self.target_date}.json"
+        else:
+            path = METRICS_DIR / f"{self.stage}_{self.target_date}_{self.started.strftime('%H%M%S')}.json"
+        write_json(path, self.to_dict())
+        return path
+
+
+def write_json(path: Path, data: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# =====================================================
+# flow 실행 단위
+# =====================================================
+def new_run_dir(name: str = "bigrise") -> Path:
+    """flow 1회 실행의 지표 폴더 (이름 정렬 = 실행 순서)"""
+    return METRICS_DIR / f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+
+def current_run_dir() -> Optional[Path]:
+    run_dir = _RUN_DIR.get() or os.getenv("PERF_RUN_DIR")
+    return Path(run_dir) if run_dir else None
+
+
+@contextmanager
+def run_dir_scope(run_dir: Optional[Path]):
+    """in-process 단계 실행 동안 StageMetrics.save() 기본 저장 폴더 지정"""
+    token = _RUN_DIR.set(Path(run_dir) if run_dir else None)
+    try:
+        yield
+    finally:
+        _RUN_DIR.reset(token)
+
+
+def previous_report(run_dir: Path) -> Optional[dict]:
+    """같은 이름의 직전 실행 run_report.json (없으면 None)"""
+    run_dir = Path(run_dir)
+    name = run_dir.name.rsplit("_", 2)[0]
+    older = sorted(p for p in run_dir.parent.glob(f"{name}_*/{REPORT_FILE}")
+                   if p.parent.name.rsplit("_", 2)[0] == name and p.parent.name < run_dir.name)
+    if not older:
+        return None
+    return json.loads(older[-1].read_text(encoding="utf-8"))
+
+
+def collect_run(run_dir: Path, **extra) -> dict:
+    """run_dir 의 단계 JSON 을 모아 run_report.json 저장 후 반환 (직전 실행 대비 소요시간 포함)"""
+    run_dir = Path(run_dir)
+    stages = [json.loads(p.read_text(encoding="utf-8"))
+              for p in sorted(run_dir.glob("*.json")) if p.name != REPORT_FILE]
+
+    prev = previous_report(run_dir)
+    prev_wall: Dict[tuple, float] = {}
+    if prev:
+        for s in prev["stages"]:
+            prev_wall[(s["stage"], "")] = s["wall"]
+            prev_wall.update({(s["stage"], p["phase"]): p["wall"] for p in s["phases"]})
+
+    for s in stages:
+        s["prev_wall"] = prev_wall.get((s["stage"], ""))
+        for p in s["phases"]:
+            p["prev_wall"] = prev_wall.get((s["stage"], p["phase"]))
+
+    report = {
+        "run": run_dir.name,
+        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "previous_run": prev["run"] if prev else None,
+        **extra,
+        "stages": stages,
+    }
+    write_json(run_dir / REPORT_FILE, report)
+    return report
+
+
+# =====================================================
+# 표 / markdown
+# =====================================================
+def report_rows(report: dict) -> List[dict]:
+    """단계 × 구간 1행 (Prefect table artifact 용)"""
+    rows = []
+    for s in report["stages"]:
+        for p in s["phases"]:
+            http = p.get("http") or {}
+            rows.append({
+                "stage": s["stage"],
+                "date": s["target_date"],
+                "phase": p["phase"],
+                "wall_s": p["wall"],
+                "prev_wall_s": p.get("prev_wall"),
+                "rows": p.get("rows"),
+                "requests": http.get("requests"),
+                "bytes": http.get("bytes"),
+                "p50_s": http.get("latency_p50"),
+                "p90_s": http.get("latency_p90"),
+                "p99_s": http.get("latency_p99"),
+                "errors": http.get("errors"),
+                "retries": http.get("retries"),
+                "parse_s": p.get("parse"),
+            })
+    return rows
+
+
+def _delta(cur, prev) -> str:
+    if prev in (None, 0) or cur is None:
+        return "-"
+    return f"{(cur - prev) / prev * 100:+.0f}%"
+
+
+def report_markdown(report: dict) -> str:
+    def fmt(v):
+        return "-" if v is None else (f"{v:,}" if isinstance(v, int) else str(v))
+
+    lines = [f"## ⏱️ 단계별 성능 ({report['run']})", ""]
+    if report.get("previous_run"):
+        lines += [f"직전 실행 대비: `{report['previous_run']}`", ""]
+    lines += ["| stage | wall(s) | vs prev |", "|---|---|---|"]
+    lines += [f"| {s['stage']} ({s['target_date']}) | {s['wall']} | {_delta(s['wall'], s.get('prev_wall'))} |"
+              for s in report["stages"]]
+
+    cols = ["stage", "phase", "wall_s", "rows", "requests", "bytes", "p50_s", "p90_s", "p99_s",
+            "errors", "retries", "parse_s"]
+    lines += ["", "| " + " | ".join(cols) + " | vs prev |", "|" + "---|" * (len(cols) + 1)]
+    for r in report_rows(report):
+        lines.append("| " + " | ".join(fmt(r[c]) for c in cols) + f" | {_delta(r['wall_s'], r['prev_wall_s'])} |")
+    return "\n".join(lines)
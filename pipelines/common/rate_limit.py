@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+호스트별 적응형 요청 속도 제한 (HttpClient 에서 사용, 모든 크롤러 공용)
+------------------------------------------------
+- 토큰 버킷 상태를 SQLite 파일 한 곳에 저장 → 같은 호스트를 수집하는 여러 프로세스
+  (일일 flow + backfill + 수동 재실행)가 하나의 속도 한도를 나눠 씀
+  (BEGIN IMMEDIATE 로 프로세스 간 잠금, 스레드 간은 threading.Lock)
+- AIMD 속도 조절
+  · 429 / 5xx / 연결 오류 → rate × RATE_LIMIT_BACKOFF (초당 1회까지만 감소), Retry-After 동안 정지
+  · 정상 응답 + 지연 ≤ RATE_LIMIT_LATENCY → 요청 1건마다 RATE_LIMIT_STEP / rate 증가
+    (한도로 계속 요청하면 초당 약 RATE_LIMIT_STEP 씩 상승)
+  · 정상이지만 느린 응답 → 유지
+- 학습한 rate 는 파일에 남아 다음 실행이 그 값에서 시작
+- DB 는 첫 요청 시점에 열림 (import 부작용 없음)
+ex) limiter = default_limiter()
+    limiter.acquire("finance.naver.com")            # 토큰이 생길 때까지 대기
+    limiter.feedback("finance.naver.com", 200, 0.3)
+    python -m pipelines.common.rate_limit stats
+    python -m pipelines.common.rate_limit reset [--host finance.naver.com]
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    host        TEXT PRIMARY KEY,
+    rate        REAL NOT NULL,
+    tokens      REAL NOT NULL,
+    updated     REAL NOT NULL,
+    paused_until REAL NOT NULL DEFAULT 0,
+    last_cut    REAL NOT NULL DEFAULT 0,
+    ok          INTEGER NOT NULL DEFAULT 0,
+    throttled   INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+"""
+
+THROTTLE_STATUS = (429, 500, 502, 503, 504)
+CUT_INTERVAL = 1.0      # 동시에 진행 중이던 요청들의 실패로 연속 감소하지 않도록
+
+
+def env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+
+class HostRateLimiter:
+    """
+    rate     : 처음 보는 호스트의 초기 초당 요청 수 (호스트별 rates 로 덮어쓰기 가능)
+    min_rate / max_rate : AIMD 하한 / 상한
+    burst    : 몰아서 허용하는 최대 요청 수 (기본 = max(1, rate))
+    """
+
+    def __init__(self, path: Path, rate: float = 10.0, min_rate: float = 0.5, max_rate: float = 50.0,
+                 backoff: float = 0.5, step: float = 1.0, latency_target: float = 2.0,
+                 rates: Optional[Dict[str, float]] = None):
+        self.path = Path(path)
+        self.rate, self.min_rate, self.max_rate = rate, min_rate, max_rate
+        self.backoff, self.step, self.latency_target = backoff, step, latency_target
+        self.rates = dict(rates or {})
+        self.waited = 0.0
+
+        self._lock = threading.Lock()
+        self._conn = None
+
+    # -------------------------------------------------
+    def set_rate(self, host: str, rate: float):
+        """host 의 초기 rate 지정 (DB 에 아직 없는 호스트에만 적용)"""
+        self.rates[host] = rate
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False,
+                                         isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def _row(self, conn, host: str, now: float):
+        row = conn.execute("SELECT rate, tokens, updated, paused_until, last_cut FROM buckets WHERE host=?",
+                           (host,)).fetchone()
+        if row is None:
+            rate = min(self.max_rate, max(self.min_rate, self.rates.get(host, self.rate)))
+            row = (rate, 1.0, now, 0.0, 0.0)
+            conn.execute("INSERT INTO buckets (host, rate, tokens, updated) VALUES (?, ?, ?, ?)",
+                         (host, rate, 1.0, now))
+        return row
+
+    def _transact(self, fn):
+        """threading.Lock + BEGIN IMMEDIATE(프로세스 간 쓰기 잠금) 안에서 fn(conn, now) 실행"""
+        with self._lock:
+            conn = self._db()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                out = fn(conn, time.time())
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            return out
+
+    # =====================================================
+    # 토큰
+    # =====================================================
+    def acquire(self, host: str):
+        """토큰 1개를 얻을 때까지 대기 (대기는 잠금 밖에서)"""
+        while True:
+            wait = self._transact(lambda conn, now: self._take(conn, host, now))
+            if wait <= 0:
+                return
+            self.waited += wait
+            time.sleep(wait)
+
+    def _take(self, conn, host: str, now: float) -> float:
+        rate, tokens, updated, paused_until, _ = self._row(conn, host, now)
+        if now < paused_until:
+            return paused_until - now
+        capacity = max(1.0, rate)
+        tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0.0
+        else:
+            wait = (1 - tokens) / rate
+        conn.execute("UPDATE buckets SET tokens=?, updated=? WHERE host=?", (tokens, now, host))
+        return wait
+
+    # =====================================================
+    # AIMD
+    # =====================================================
+    def feedback(self, host: str, status: Optional[int], latency: float, retry_after: Optional[float] = None):
+        """
+        응답 결과로 rate 조정. status=None 은 연결 오류/타임아웃.
+        retry_after(초)가 있으면 그 시간 동안 해당 호스트 요청을 멈춤.
+        """
+        throttled = status is None or status in THROTTLE_STATUS
+
+        def update(conn, now):
+            rate, _, _, paused_until, last_cut = self._row(conn, host, now)
+            if throttled:
+                if now - last_cut >= max(CUT_INTERVAL, 1.0 / rate):
+                    rate = max(self.min_rate, rate * self.backoff)
+                    last_cut = now
+                if retry_after:
+                    paused_until = max(paused_until, now + retry_after)
+                conn.execute(
+                    "UPDATE buckets SET rate=?, tokens=MIN(tokens, 0), paused_until=?, last_cut=?, "
+                    "throttled=throttled+1 WHERE host=?",
+                    (rate, paused_until, last_cut, host),
+                )
+            else:
+                if latency <= self.latency_target:
+                    rate = min(self.max_rate, rate + self.step / rate)
+                conn.execute("UPDATE buckets SET rate=?, ok=ok+1 WHERE host=?", (rate, host))
+
+        self._transact(update)
+
+    # =====================================================
+    # 조회 / 초기화
+    # =====================================================
+    def stats(self, host: Optional[str] = None) -> List[dict]:
+        with self._lock:
+            sql = "SELECT host, rate, ok, throttled, paused_until FROM buckets"
+            rows = self._db().execute(sql + (" WHERE host=?" if host else " ORDER BY host"),
+                                      (host,) if host else ()).fetchall()
+        return [{"host": h, "rate": round(r, 2), "ok": ok, "throttled": th,
+                 "paused": max(0.0, round(p - time.time(), 1))} for h, r, ok, th, p in rows]
+
+    def summary(self, host: str) -> str:
+        s = self.stats(host)
+        if not s:
+            return f"{host} (요청 없음)"
+        s = s[0]
+        return f"{host} rate={s['rate']}/s ok={s['ok']} throttled={s['throttled']} waited={self.waited:.1f}s"
+
+    def reset(self, host: Optional[str] = None) -> int:
+        with self._lock:
+            conn = self._db()
+            cur = conn.execute("DELETE FROM buckets WHERE host=?", (host,)) if host \
+                else conn.execute("DELETE FROM buckets")
+        return cur.rowcount
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# =====================================================
+# 프로세스 공용 인스턴스
+# =====================================================
+_DEFAULT: Optional[HostRateLimiter] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_limiter() -> Optional[HostRateLimiter]:
+    """
+    .env 설정으로 만든 프로세스 공용 limiter (RATE_LIMIT=false 면 None).
+    환경변수는 첫 호출 시점에 읽음 (각 단계 load_dotenv 이후).
+    """
+    global _DEFAULT
+    if os.getenv("RATE_LIMIT", "true").lower() not in ("1", "true", "yes"):
+        return None
+    with _DEFAULT_LOCK:
+        if _DEFAULT is None:
+            base_dir = Path(__file__).resolve().parents[2]
+            _DEFAULT = HostRateLimiter(
+                Path(os.getenv("RATE_LIMIT_PATH", base_dir / "cache" / "rate_limit.sqlite")),
+                rate=env_float("RATE_LIMIT_RATE", 10),
+                min_rate=env_float("RATE_LIMIT_MIN", 0.5),
+                max_rate=env_float("RATE_LIMIT_MAX", 50),
+                backoff=env_float("RATE_LIMIT_BACKOFF", 0.5),
+                step=env_float("RATE_LIMIT_STEP", 1.0),
+                latency_target=env_float("RATE_LIMIT_LATENCY", 2.0),
+            )
+        return _DEFAULT
+
+
+def main():
+    import argparse
+    import json
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    ap = argparse.ArgumentParser(description="호스트별 요청 속도 상태")
+    ap.add_argument("command", choices=["stats", "reset"])
+    ap.add_argument("--host", default=None)
+    args = ap.parse_args()
+
+    limiter = default_limiter()
+    if limiter is None:
+        print("RATE_LIMIT=false — 속도 제한 비활성")
+        return
+    if args.command == "stats":
+        for s in limiter.stats(args.host):
+            print(json.dumps(s, ensure_ascii=False))
+    else:
+        print(f"🧹 {limiter.reset(args.host)}개 호스트 초기화")
+    limiter.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+공통 실행 환경 유틸 (모든 파이프라인 스크립트에서 import)
+------------------------------------------------
+- 로깅/디렉토리 생성은 import 시점이 아니라 실행 시점에 호출
+- 같은 프로세스에서 여러 번 호출해도 핸들러 중복 등록 없음 (in-process 실행 대응)
+- 스냅샷 전용 단계(riseetf · bigfinance)의 날짜 검사: snapshot_date()
+ex) 스크립트 실행   : setup_logging("naver_news", LOG_DIR)            → root 로거
+    in-process 실행 : setup_logging("naver_news", LOG_DIR, module.log) → 모듈 로거만
+"""
+
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+
+
+class SnapshotOnlyError(RuntimeError):
+    """현재 시점 데이터만 제공하는 단계에 다른 날짜를 요청"""
+
+
+def ensure_dirs(*dirs: Path):
+    for d in dirs:
+        Path(d).mkdir(parents=True, exist_ok=True)
+
+
+def setup_logging(name: str, log_dir: Path, logger: Optional[logging.Logger] = None) -> logging.Logger:
+    """
+    logs/{name}_YYYYMMDD.log 파일 + stdout 핸들러 연결.
+    logger 미지정 시 root 로거 (기존 logging.basicConfig 와 동일한 동작).
+    """
+    logger = logger or logging.getLogger()
+    log_dir = Path(log_dir)
+    log_dir.mkdir(parents=True, exist_ok=True)
+    log_path = str((log_dir / f"{name}_{time.strftime('%Y%m%d')}.log").resolve())
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    if not any(getattr(h, "baseFilename", None) == log_path for h in logger.handlers):
+        fh = logging.FileHandler(log_path, encoding="utf-8")
+        fh.setFormatter(formatter)
+        logger.addHandler(fh)
+    if not any(type(h) is logging.StreamHandler and h.stream is sys.stdout for h in logger.handlers):
+        sh = logging.StreamHandler(sys.stdout)
+        sh.setFormatter(formatter)
+        logger.addHandler(sh)
+
+    logger.setLevel(logging.INFO)
+    if logger is not logging.getLogger():
+        # 모듈 로거는 자체 핸들러로만 출력 (root/Prefect 핸들러로 중복 출력 방지)
+        logger.propagate = False
+    return logger
+
+
+def snapshot_date(stage: str, target_date: Optional[str] = None) -> str:
+    """
+    스냅샷 전용 단계의 파일 날짜 (= 오늘).
+    원본 사이트가 과거 시점 조회를 지원하지 않으므로 오늘이 아닌 날짜는 SnapshotOnlyError.
+    """
+    today = time.strftime("%Y%m%d")
+    if target_date and target_date != today:
+        raise SnapshotOnlyError(
+            f"❌ {stage} 는 스냅샷 전용 (현재 시점만 수집 가능): {target_date} 요청, 오늘 {today}"
+        )
+    return today
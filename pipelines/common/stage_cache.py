@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+단계 결과 캐시 (Prefect run_stage · run_script 에서 사용)
+------------------------------------------------
+- 단계가 성공하면 cache/stages/<단계>_<날짜>.json 에 실행 조건(key)과 산출물 검증 정보를 기록
+  · key      : 코드 버전(단계 모듈 + 참조하는 pipelines.* 모듈 소스 해시) + 인자 + 기준일
+               + 입력 파일 내용 해시 (경로 인자 · 모듈의 cache_inputs(date))
+  · 산출물   : 모듈의 cache_artifacts(date) (없으면 find_output(date)) 마다 경로 · 크기 · 행 수 · sha256
+- 같은 key 로 다시 실행되면 산출물을 검증(존재 → 크기 → 행 수 → sha256)하고
+  모두 기록과 같으면 단계를 건너뛰고 기록된 결과를 반환 (flow 재시도 시 크롤링 재실행 방지)
+- key 가 다르거나 산출물이 바뀌었으면 다시 실행 후 기록 갱신, force=True 면 검증 없이 실행
+- .env STAGE_CACHE=false 로 전체 비활성
+ex) cache = StageCache.for_run(mod, args, kwargs)
+    record, reason = cache.lookup()
+    if record is None:
+        result = mod.run(*args, **kwargs)
+        cache.save(result)
+    python -m pipelines.common.stage_cache list [--stage naver_news] [--date 20251110]
+    python -m pipelines.common.stage_cache clear [--stage bigrise_pre]
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from types import ModuleType
+from typing import List, Optional, Tuple
+
+from pipelines.common.perf import write_json
+from pipelines.common.storage import count_rows
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+TABLE_SUFFIXES = (".csv", ".parquet")
+
+log = logging.getLogger(__name__)
+
+
+def cache_enabled() -> bool:
+    """환경변수는 호출 시점에 읽음 (각 단계 load_dotenv 이후)"""
+    return os.getenv("STAGE_CACHE", "true").lower() in ("1", "true", "yes")
+
+
+def cache_dir() -> Path:
+    return Path(os.getenv("STAGE_CACHE_DIR", BASE_DIR / "cache" / "stages"))
+
+
+# =====================================================
+# 해시
+# =====================================================
+def file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def code_version(mod: ModuleType) -> str:
+    """단계 모듈 + 모듈이 참조하는 pipelines.* 모듈(함수 · 클래스 · 모듈 import) 소스 해시"""
+    files = {Path(mod.__file__).resolve()}
+    for value in vars(mod).values():
+        dep = value if inspect.ismodule(value) else sys.modules.get(getattr(value, "__module__", None) or "")
+        if dep is not None and dep.__name__.startswith("pipelines.") and getattr(dep, "__file__", None):
+            files.add(Path(dep.__file__).resolve())
+    h = hashlib.sha256()
+    for f in sorted(files):
+        h.update(f.name.encode())
+        h.update(f.read_bytes())
+    return h.hexdigest()[:16]
+
+
+def describe_input(value):
+    """key 에 넣을 인자 값 (존재하는 파일 경로는 내용 해시 포함)"""
+    if isinstance(value, Path) or (isinstance(value, str) and value.endswith(TABLE_SUFFIXES)):
+        path = Path(value)
+        if path.is_file():
+            return {"path": str(path), "sha256": file_digest(path)}
+    return value if isinstance(value, (str, int, float, bool, type(None))) else str(value)
+
+
+def artifact_info(path: Path) -> dict:
+    path = Path(path)
+    return {
+        "path": str(path),
+        "bytes": path.stat().st_size,
+        "rows": count_rows(path) if path.suffix in TABLE_SUFFIXES else None,
+        "sha256": file_digest(path),
+    }
+
+
+def check_artifact(info: dict) -> Optional[str]:
+    """기록과 다르면 사유, 같으면 None (비싼 검사는 뒤로)"""
+    path = Path(info["path"])
+    if not path.is_file():
+        return f"산출물 없음: {path.name}"
+    if path.stat().st_size != info["bytes"]:
+        return f"크기 변경: {path.name}"
+    if info["rows"] is not None and count_rows(path) != info["rows"]:
+        return f"행 수 변경: {path.name}"
+    if file_digest(path) != info["sha256"]:
+        return f"checksum 불일치: {path.name}"
+    return None
+
+
+# =====================================================
+# 단계 캐시
+# =====================================================
+class StageCache:
+    """
+    mod    : 단계 모듈 (find_output(date), 선택: cache_artifacts(date) · cache_inputs(date))
+    date   : 산출물 날짜 (스냅샷 단계는 오늘)
+    params : 실행 인자 (key 에 포함)
+    """
+
+    def __init__(self, mod: ModuleType, date: str, params: dict):
+        self.mod = mod
+        self.stage = mod.__name__.rsplit(".", 1)[-1]
+        self.date = date
+        self.params = params
+        self.path = cache_dir() / f"{self.stage}_{date}.json"
+        self.key = self._key()
+
+    @classmethod
+    def for_run(cls, mod: ModuleType, args: tuple, kwargs: dict) -> "StageCache":
+        """in-process 실행 (mod.run(*args, **kwargs)), 기준일은 target_date 인자 (없으면 오늘)"""
+        bound = inspect.signature(mod.run).bind(*args, **kwargs)
+        bound.apply_defaults()
+        date = bound.arguments.get("target_date") or time.strftime("%Y%m%d")
+        return cls(mod, date, {"run": dict(bound.arguments)})
+
+    @classmethod
+    def for_script(cls, mod: ModuleType, argv: List[str]) -> "StageCache":
+        """subprocess 실행 (python3 <script> *argv), 기준일은 --date 값 (없으면 오늘)"""
+        argv = [str(a) for a in argv]
+        date = argv[argv.index("--date") + 1] if "--date" in argv[:-1] else time.strftime("%Y%m%d")
+        return cls(mod, date, {"argv": argv})
+
+    def _key(self) -> str:
+        inputs = [describe_input(p) for p in getattr(self.mod, "cache_inputs", lambda d: [])(self.date)]
+        params = {name: {k: describe_input(v) for k, v in values.items()} if isinstance(values, dict)
+                  else [describe_input(v) for v in values] for name, values in self.params.items()}
+        self.parts = {
+            "version": code_version(self.mod),
+            "date": self.date,
+            "params": params,
+            "inputs": inputs,
+        }
+        raw = json.dumps(self.parts, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+    def artifacts(self) -> List[Path]:
+        if hasattr(self.mod, "cache_artifacts"):
+            return [Path(p) for p in self.mod.cache_artifacts(self.date) if p is not None]
+        out = self.mod.find_output(self.date)
+        return [Path(out)] if out is not None else []
+
+    # -------------------------------------------------
+    def load(self) -> Optional[dict]:
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def lookup(self) -> Tuple[Optional[dict], str]:
+        """(유효한 기록, 사유) — 다시 실행해야 하면 기록 None"""
+        record = self.load()
+        if record is None:
+            return None, "기록 없음"
+        if record.get("key") != self.key:
+            return None, "실행 조건 변경 (코드 · 인자 · 입력)"
+        for info in record["artifacts"]:
+            reason = check_artifact(info)
+            if reason:
+                return None, reason
+        return record, "산출물 검증 완료"
+
+    def save(self, result) -> Optional[dict]:
+        """단계 성공 후 호출. 산출물을 찾지 못하면 기록하지 않음 (다음 실행에서 다시 실행)"""
+        paths = self.artifacts()
+        if not paths or not all(p.is_file() for p in paths):
+            log.warning(f"⚠️ 캐시 기록 생략 (산출물 없음): {self.stage} {self.date}")
+            self.path.unlink(missing_ok=True)
+            return None
+        record = {
+            "stage": self.stage,
+            "date": self.date,
+            "key": self.key,
+            **self.parts,
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "result": str(result) if result is not None else None,
+            "result_is_path": isinstance(result, Path),
+            "artifacts": [artifact_info(p) for p in paths],
+        }
+        write_json(self.path, record)
+        return record
+
+    @staticmethod
+    def result(record: dict):
+        """기록된 단계 반환값 (원래 Path 였으면 Path)"""
+        value = record.get("result")
+        return Path(value) if value is not None and record.get("result_is_path") else value
+
+
+# =====================================================
+# CLI
+# =====================================================
+def records(stage: Optional[str] = None, date: Optional[str] = None) -> List[Path]:
+    pattern = f"{stage or '*'}_{date or '*'}.json"
+    return sorted(cache_dir().glob(pattern))
+
+
+def main():
+    import argparse
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    ap = argparse.ArgumentParser(description="단계 결과 캐시 기록")
+    ap.add_argument("command", choices=["list", "clear"])
+    ap.add_argument("--stage", default=None)
+    ap.add_argument("--date", default=None)
+    args = ap.parse_args()
+
+    paths = records(args.stage, args.date)
+    if args.command == "clear":
+        for p in paths:
+            p.unlink()
+        print(f"🧹 {len(paths)}개 기록 삭제")
+        return
+    for p in paths:
+        record = json.loads(p.read_text(encoding="utf-8"))
+        bad = next((r for r in map(check_artifact, record["artifacts"]) if r), None)
+        print(f"{record['stage']:<12} {record['date']} {record['created_at']} key={record['key']} "
+              f"{'✅ 유효' if bad is None else '❌ ' + bad}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+공통 테이블 저장/로드 유틸 (모든 파이프라인 스크립트에서 import)
+------------------------------------------------
+- 출력 형식: .env OUTPUT_FORMAT = csv(기본) | parquet
+- csv     : 기존과 동일한 파일 (Excel 용 utf-8-sig 등 인코딩 유지)
+- parquet : 테이블별 타입 스키마 적용 + zstd 압축
+- 읽기: 확장자로 형식 판별, 필요한 컬럼만 로드
+- 스트리밍 저장: write_row_stream (행 이터레이터 → 임시 파일 → 교체)
+"""
+
+import csv
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+FORMATS = ("csv", "parquet")
+PARQUET_COMPRESSION = "zstd"
+
+
+# =====================================================
+# 테이블별 타입 스키마 (parquet 저장 시 적용)
+# =====================================================
+_RISE_HOLDINGS = {
+    "name": "string", "price": "string", "change": "string", "detail_url": "string",
+    "number": "Int64", "item_name": "string", "item_code": "string",
+    "base_price": "string", "ratio": "float64", "value": "string",
+}
+
+SCHEMAS: Dict[str, Dict[str, str]] = {
+    "rise_holdings": _RISE_HOLDINGS,
+    "industry_meta": {
+        "main_code": "Int64", "main_name": "string", "group_id": "Int64", "group_name": "string",
+        "sub_code": "Int64", "sub_name": "string", "update_date": "string", "data_type": "string",
+        "data_code": "Int64", "data_name": "string", "last_update": "string",
+        "frequency": "string", "source": "string", "updateDate": "string", "companies": "string",
+    },
+    "industry_companies": {
+        "main_code": "Int64", "sub_code": "Int64", "data_code": "Int64",
+        "company_code": "string", "company_name": "string",
+    },
+    "naver_news": {
+        "section_name": "string", "section_id3": "Int64", "office_id": "string",
+        "article_id": "string", "url": "string", "title": "string", "press": "string",
+        "wdate": "string", "source_file": "string", "contents": "string",
+    },
+    "bigrise": {
+        **_RISE_HOLDINGS,
+        "industry_info": "string", "industry_frequency": "string", "industry_source": "string",
+        "industry_update_date": "string", "industry_chart_path": "string",
+    },
+}
+
+
+# =====================================================
+# 형식 / 경로
+# =====================================================
+def output_format() -> str:
+    fmt = os.getenv("OUTPUT_FORMAT", "csv").strip().lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"❌ 지원하지 않는 OUTPUT_FORMAT: {fmt} (csv | parquet)")
+    return fmt
+
+
+def table_path(base: Path, fmt: Optional[str] = None) -> Path:
+    """확장자 없는 기준 경로에 출력 형식 확장자를 붙인다."""
+    return Path(f"{base}.{fmt or output_format()}")
+
+
+def find_table(base: Path) -> Optional[Path]:
+    """기준 경로로 저장된 테이블 검색 (설정된 형식 우선, 없으면 다른 형식)"""
+    preferred = output_format()
+    for fmt in [preferred, *[f for f in FORMATS if f != preferred]]:
+        p = table_path(base, fmt)
+        if p.exists():
+            return p
+    return None
+
+
+# =====================================================
+# 저장
+# =====================================================
+def apply_schema(df: pd.DataFrame, schema: Optional[str]) -> pd.DataFrame:
+    if not schema:
+        return df
+    df = df.copy()
+    for col, dtype in SCHEMAS[schema].items():
+        if col not in df.columns:
+            continue
+        if dtype == "string":
+            df[col] = df[col].astype("string")
+        else:
+            num = df[col]
+            if not pd.api.types.is_numeric_dtype(num):
+                num = pd.to_numeric(num.astype("string").str.replace(",", "", regex=False), errors="coerce")
+            df[col] = num.astype(dtype)
+    return df
+
+
+def write_table(df: pd.DataFrame, path: Path, schema: Optional[str] = None,
+                encoding: str = "utf-8-sig") -> Path:
+    """DataFrame 저장 (형식은 path 확장자 기준)"""
+    path = Path(path)
+    if path.suffix == ".parquet":
+        apply_schema(df, schema).to_parquet(path, engine="pyarrow",
+                                            compression=PARQUET_COMPRESSION, index=False)
+    else:
+        df.to_csv(path, index=False, encoding=encoding)
+    return path
+
+
+def write_rows(rows: List[dict], path: Path, fieldnames: Iterable[str],
+               schema: Optional[str] = None, encoding: str = "utf-8-sig") -> Path:
+    """dict 행 목록 저장 (csv 는 기존 csv.DictWriter 출력 그대로)"""
+    path = Path(path)
+    fieldnames = list(fieldnames)
+    if path.suffix == ".parquet":
+        return write_table(pd.DataFrame(rows, columns=fieldnames), path, schema=schema)
+
+    with open(path, "w", newline="", encoding=encoding) as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def write_row_stream(rows: Iterable[dict], path: Path, fieldnames: Iterable[str],
+                     schema: Optional[str] = None, encoding: str = "utf-8-sig",
+                     batch_size: int = 1000) -> Path:
+    """
+    dict 행 이터레이터를 메모리에 모으지 않고 저장 (parquet 은 batch_size 행마다 row group).
+    임시 파일에 쓴 뒤 os.replace 로 교체 → 중간에 죽어도 이전 파일은 그대로
+    """
+    path = Path(path)
+    fieldnames = list(fieldnames)
+    tmp = path.with_name(path.name + ".tmp")
+
+    if path.suffix == ".parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer, batch = None, []
+
+        def flush():
+            nonlocal writer
+            table = pa.Table.from_pandas(apply_schema(pd.DataFrame(batch, columns=fieldnames), schema),
+                                         preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp, table.schema, compression=PARQUET_COMPRESSION)
+            writer.write_table(table.cast(writer.schema))
+            batch.clear()
+
+        for r in rows:
+            batch.append(r)
+            if len(batch) >= batch_size:
+                flush()
+        if batch or writer is None:
+            flush()
+        writer.close()
+    else:
+        with open(tmp, "w", newline="", encoding=encoding) as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+
+    os.replace(tmp, path)
+    return path
+
+
+def append_rows(rows: List[dict], path: Path, fieldnames: Iterable[str],
+                schema: Optional[str] = None, encoding: str = "utf-8-sig") -> Path:
+    """기존 테이블 뒤에 행 추가 (파일이 없으면 새로 저장)"""
+    path = Path(path)
+    fieldnames = list(fieldnames)
+    if not path.exists():
+        return write_rows(rows, path, fieldnames, schema=schema, encoding=encoding)
+    if path.suffix == ".parquet":
+        df = pd.concat([pd.read_parquet(path), pd.DataFrame(rows, columns=fieldnames)], ignore_index=True)
+        return write_table(df, path, schema=schema)
+
+    # 헤더/BOM 은 이미 있으므로 BOM 없는 인코딩으로 이어쓰기
+    with open(path, "a", newline="", encoding="utf-8" if encoding == "utf-8-sig" else encoding) as f:
+        csv.DictWriter(f, fieldnames=fieldnames).writerows(rows)
+    return path
+
+
+# =====================================================
+# 로드
+# =====================================================
+def table_columns(path: Path) -> List[str]:
+    path = Path(path)
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+        return pq.read_schema(path).names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def read_table(path: Path, columns: Optional[Iterable[str]] = None, **csv_kwargs) -> pd.DataFrame:
+    """
+    테이블 로드. columns 를 주면 존재하는 컬럼만 읽는다.
+    csv_kwargs 는 csv 일 때만 pd.read_csv 로 전달 (dtype 등).
+    """
+    path = Path(path)
+    if columns is not None:
+        wanted = set(columns)
+        columns = [c for c in table_columns(path) if c in wanted]
+
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_csv(path, usecols=columns, **csv_kwargs)
+
+
+def count_rows(path: Path) -> int:
+    """테이블 행 수 (parquet 은 메타데이터만, csv 는 레코드 단위로 셈 — 본문 줄바꿈 포함)"""
+    path = Path(path)
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(path).metadata.num_rows
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return max(0, sum(1 for _ in csv.reader(f)) - 1)
@@ -4,17 +4,53 @@
 공통 Task 유틸리티 (모든 Prefect 파이프라인에서 import)
 """
 
+import importlib
+import os
 import subprocess
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Optional, List
 from prefect import task, get_run_logger
+from prefect.artifacts import create_markdown_artifact, create_table_artifact
+from prefect.cache_policies import NO_CACHE
 
+from pipelines.common.dag import critical_path_markdown
+from pipelines.common.perf import collect_run, report_markdown, report_rows, run_dir_scope
+from pipelines.common.runtime import setup_logging
+from pipelines.common.stage_cache import StageCache, cache_enabled
 
-@task(retries=1, retry_delay_seconds=60)
-def run_script(script_path: str, *args: str):
+BASE_DIR = Path(__file__).resolve().parents[2]
+
+
+def cached(stage: Optional[StageCache], force: bool, logger) -> Optional[dict]:
+    """검증을 통과한 캐시 기록 (캐시 미사용 · force · 무효면 None, 사유는 로그)"""
+    if stage is None:
+        return None
+    if force:
+        logger.info(f"🔄 force refresh → 캐시 무시: {stage.stage} ({stage.date})")
+        return None
+    record, reason = stage.lookup()
+    if record is None:
+        logger.info(f"🆕 캐시 미사용: {stage.stage} ({stage.date}) — {reason}")
+        return None
+    logger.info(f"♻️ 캐시 적중 → 실행 생략: {stage.stage} ({stage.date}, {record['created_at']}) — {reason}")
+    return record
+
+
+def save_cache(stage: Optional[StageCache], result, logger):
+    if stage is not None and stage.save(result) is not None:
+        logger.info(f"💾 캐시 기록: {stage.path.name} (key={stage.key})")
+
+
+# 결과 재사용은 산출물 검증이 가능한 stage_cache 가 담당 (Prefect 입력 해시 캐시는 끔)
+@task(retries=1, retry_delay_seconds=60, cache_policy=NO_CACHE)
+def run_script(script_path: str, *args: str, perf_dir: Optional[str] = None,
+               cache: bool = False, force: bool = False):
     """
     지정된 Python 스크립트를 subprocess로 실행.
     Prefect Task로 감싸져 있어 UI에서 개별 모니터링 가능.
+    perf_dir: 단계 성능 지표 JSON 저장 폴더 (PERF_RUN_DIR 환경변수로 전달)
+    cache: 같은 조건(코드 · 인자 · 기준일)의 유효한 산출물이 있으면 실행 생략, 산출물 경로 반환
+    force: cache=True 여도 항상 실행 (기록은 갱신)
     ex) run_script.submit("naver_news.py", "--date", "20251109")
     """
     logger = get_run_logger()
@@ -22,20 +58,102 @@ def run_script(script_path: str, *args: str):
     if not path.exists():
         raise FileNotFoundError(f"❌ 파일을 찾을 수 없습니다: {path}")
 
+    stage = None
+    if cache and cache_enabled():
+        module = ".".join(path.relative_to(BASE_DIR).with_suffix("").parts)
+        stage = StageCache.for_script(importlib.import_module(module), list(args))
+        record = cached(stage, force, logger)
+        if record is not None:
+            return record["artifacts"][0]["path"]
+
     cmd = ["python3", str(path), *args]
     logger.info(f"🚀 실행 명령어: {' '.join(cmd)}")
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    env = {**os.environ, "PERF_RUN_DIR": str(perf_dir)} if perf_dir else None
+    result = subprocess.run(cmd, capture_output=True, text=True, env=env)
     logger.info(result.stdout.strip())
 
     if result.returncode != 0:
         logger.error(result.stderr.strip())
         raise RuntimeError(f"❌ 실행 실패: {path.name}")
 
+    save_cache(stage, None, logger)
     logger.info(f"✅ 완료: {path.name}")
     return result.stdout.strip()
 
 
+@task(retries=1, retry_delay_seconds=60, cache_policy=NO_CACHE)
+def run_stage(module: str, log_name: str, *args, perf_dir: Optional[str] = None,
+              cache: bool = False, force: bool = False, **kwargs):
+    """
+    스크립트 모듈의 run() 을 현재 프로세스에서 실행 (in-process 모드).
+    인터프리터 기동 · pandas 등 재import 비용 없이 반환값(출력 경로 등)을 다음 Task 로 전달.
+    perf_dir: 단계 성능 지표 JSON 저장 폴더 (perf.StageMetrics.save 기본 경로)
+    cache: 같은 조건(코드 · 인자 · 기준일 · 입력 파일)의 유효한 산출물이 있으면 실행 생략, 기록된 반환값 반환
+    force: cache=True 여도 항상 실행 (기록은 갱신)
+    ex) run_stage.submit("pipelines.bigrise.naver_news", "naver_news", "20251109")
+    """
+    logger = get_run_logger()
+    mod = importlib.import_module(module)
+    setup_logging(log_name, mod.LOG_DIR, mod.log)
+
+    stage = StageCache.for_run(mod, args, kwargs) if cache and cache_enabled() else None
+    record = cached(stage, force, logger)
+    if record is not None:
+        return StageCache.result(record)
+
+    logger.info(f"🚀 in-process 실행: {module}.run")
+    with run_dir_scope(perf_dir):
+        result = mod.run(*args, **kwargs)
+    save_cache(stage, result, logger)
+    logger.info(f"✅ 완료: {module} → {result}")
+    return result
+
+
+@task
+def publish_perf_report(perf_dir: str, **extra) -> Optional[dict]:
+    """
+    perf_dir 의 단계별 성능 지표 JSON 을 run_report.json 으로 합치고
+    Prefect table · markdown artifact 로 게시 (단계가 하나도 기록하지 않았으면 None)
+    extra 에 critical_path(dag.critical_path 결과)가 있으면 별도 markdown artifact 도 게시
+    """
+    logger = get_run_logger()
+    # 모든 단계가 캐시로 생략돼도 critical path 는 게시
+    if not Path(perf_dir).exists() and not extra.get("critical_path"):
+        logger.warning(f"⚠️ 성능 지표 없음: {perf_dir}")
+        return None
+
+    report = collect_run(Path(perf_dir), **extra)
+    # artifact key 는 flow 종류별 (bigrise_20251110_060000 → bigrise-perf-*) 로 실행마다 버전 누적
+    key = Path(perf_dir).name.rsplit("_", 2)[0].replace("_", "-")
+    create_table_artifact(key=f"{key}-perf-table", table=report_rows(report),
+                          description=f"단계 × 구간 성능 지표 ({report['run']})")
+    create_markdown_artifact(key=f"{key}-perf-report", markdown=report_markdown(report),
+                             description="단계별 성능 리포트 (직전 실행 대비)")
+    if report.get("critical_path"):
+        create_markdown_artifact(key=f"{key}-critical-path",
+                                 markdown=critical_path_markdown(report["critical_path"], f"({report['run']})"),
+                                 description="단계 의존성 기준 critical path · 단계별 대기/여유")
+    logger.info(f"⏱️ 성능 리포트 → {Path(perf_dir) / 'run_report.json'}")
+    return report
+
+
+def task_run_times(futures: Dict[str, object]) -> Dict[str, tuple]:
+    """
+    {단계: Prefect future} → {단계: (시작, 종료) epoch 초}
+    Prefect 서버에 기록된 task run 시각 사용 (실행되지 않은 단계는 생략)
+    """
+    from prefect.client.orchestration import get_client
+
+    times = {}
+    with get_client(sync_client=True) as client:
+        for name, fut in futures.items():
+            run = client.read_task_run(fut.task_run_id)
+            if run.start_time and run.end_time:
+                times[name] = (run.start_time.timestamp(), run.end_time.timestamp())
+    return times
+
+
 @task
 def notify(message: str):
     """